@@ -399,7 +399,7 @@ class DetailedCleanerGUI:
             values = (
                 file_info.get("name", ""),
                 file_info.get("size_human", ""),
-                file_info.get("modified", "").strftime("%Y-%m-%d %H:%M")
+                datetime.fromtimestamp(file_info["modified"]).strftime("%Y-%m-%d %H:%M")
                 if file_info.get("modified")
                 else "",
                 safety.replace("_", " ").title(),
@@ -447,7 +447,7 @@ class DetailedCleanerGUI:
 
     def get_top_consumers(self):
         try:
-            top_files = self.analyzer.get_top_space_consumers(
+            top_files = self.analyzer.find_largest_files(
                 self.selected_directory, top_n=50
             )
             self.current_files = top_files # Update current_files for filtering/export
@@ -55,8 +55,15 @@ extras_require = {
     ],
     "notifications": [
         "pync>=1.8.0",
+        "pyobjc-framework-Cocoa>=9.0; sys_platform == 'darwin'",
         "requests>=2.31.0",
     ],
+    "speedups": [
+        "orjson>=3.8.0",
+        "pyahocorasick>=2.0.0",
+        "numpy>=1.24.0",
+        "numba>=0.58.0",
+    ],
     "test": [
         "pytest>=7.4.0",
         "pytest-cov>=4.1.0",
@@ -67,7 +74,12 @@ extras_require = {
         "py2app>=0.28.6",
         "apscheduler>=3.10.0",
         "pync>=1.8.0",
+        "pyobjc-framework-Cocoa>=9.0; sys_platform == 'darwin'",
         "requests>=2.31.0",
+        "orjson>=3.8.0",
+        "pyahocorasick>=2.0.0",
+        "numpy>=1.24.0",
+        "numba>=0.58.0",
         "gunicorn>=21.0.0",
         "flask-cors>=4.0.0",
     ]
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Bulk directory metadata on macOS through getattrlistbulk(2).
+
+One call returns the names and stat data of many directory entries, so a
+directory can be stat'ed without a syscall per file. Importing this module
+raises ImportError on other platforms or when libc lacks the call.
+
+Copyright (c) 2026 macOS Cleaner contributors
+Licensed under the MIT License
+"""
+
+import ctypes
+import ctypes.util
+import os
+import stat
+import struct
+import sys
+from typing import Dict, Optional, Tuple
+
+if sys.platform != "darwin":
+    raise ImportError("getattrlistbulk is only available on macOS")
+
+_libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+try:
+    _getattrlistbulk = _libc.getattrlistbulk
+except AttributeError as e:
+    raise ImportError("libc does not provide getattrlistbulk") from e
+
+
+class _AttrList(ctypes.Structure):
+    _fields_ = [
+        ("bitmapcount", ctypes.c_ushort),
+        ("reserved", ctypes.c_uint16),
+        ("commonattr", ctypes.c_uint32),
+        ("volattr", ctypes.c_uint32),
+        ("dirattr", ctypes.c_uint32),
+        ("fileattr", ctypes.c_uint32),
+        ("forkattr", ctypes.c_uint32),
+    ]
+
+
+_getattrlistbulk.argtypes = (ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint64)
+_getattrlistbulk.restype = ctypes.c_int
+
+# <sys/attr.h>; attributes are packed in the buffer in bit order
+ATTR_BIT_MAP_COUNT = 5
+ATTR_CMN_NAME = 0x00000001
+ATTR_CMN_DEVID = 0x00000002
+ATTR_CMN_OBJTYPE = 0x00000008
+ATTR_CMN_CRTIME = 0x00000200
+ATTR_CMN_MODTIME = 0x00000400
+ATTR_CMN_CHGTIME = 0x00000800
+ATTR_CMN_ACCTIME = 0x00001000
+ATTR_CMN_OWNERID = 0x00008000
+ATTR_CMN_GRPID = 0x00010000
+ATTR_CMN_ACCESSMASK = 0x00020000
+ATTR_CMN_FLAGS = 0x00040000
+ATTR_CMN_FILEID = 0x02000000
+ATTR_CMN_ERROR = 0x20000000
+ATTR_CMN_RETURNED_ATTRS = 0x80000000
+ATTR_FILE_LINKCOUNT = 0x00000001
+ATTR_FILE_DATALENGTH = 0x00000200
+
+_COMMON_ATTRS = (
+    ATTR_CMN_RETURNED_ATTRS
+    | ATTR_CMN_ERROR
+    | ATTR_CMN_NAME
+    | ATTR_CMN_DEVID
+    | ATTR_CMN_OBJTYPE
+    | ATTR_CMN_CRTIME
+    | ATTR_CMN_MODTIME
+    | ATTR_CMN_CHGTIME
+    | ATTR_CMN_ACCTIME
+    | ATTR_CMN_OWNERID
+    | ATTR_CMN_GRPID
+    | ATTR_CMN_ACCESSMASK
+    | ATTR_CMN_FLAGS
+    | ATTR_CMN_FILEID
+)
+# DATALENGTH is the logical size reported as st_size (TOTALSIZE would
+# include resource forks)
+_FILE_ATTRS = ATTR_FILE_LINKCOUNT | ATTR_FILE_DATALENGTH
+
+# vnode types from <sys/vnode.h>
+_OBJTYPE_MODES = {
+    1: stat.S_IFREG,
+    2: stat.S_IFDIR,
+    3: stat.S_IFBLK,
+    4: stat.S_IFCHR,
+    5: stat.S_IFLNK,
+    6: stat.S_IFSOCK,
+    7: stat.S_IFIFO,
+}
+
+_BUFFER_SIZE = 64 * 1024
+_TIMES = (ATTR_CMN_CRTIME, ATTR_CMN_MODTIME, ATTR_CMN_CHGTIME, ATTR_CMN_ACCTIME)
+
+_ATTR_LIST = _AttrList(bitmapcount=ATTR_BIT_MAP_COUNT, commonattr=_COMMON_ATTRS, fileattr=_FILE_ATTRS)
+
+
+def _parse_entry(buf, offset: int) -> Optional[Tuple[str, os.stat_result]]:
+    """Name and stat result of the entry packed at offset, None if it failed"""
+    pos = offset + 4
+    common, _vol, _dir, file_attrs, _fork = struct.unpack_from("=5I", buf, pos)
+    pos += 20
+
+    if common & ATTR_CMN_ERROR:
+        (error,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+        if error:
+            return None
+
+    if not common & ATTR_CMN_NAME:
+        return None
+    name_offset, name_length = struct.unpack_from("=iI", buf, pos)
+    name_start = pos + name_offset
+    name = os.fsdecode(buf[name_start:name_start + name_length - 1])
+    pos += 8
+
+    dev = objtype = uid = gid = mask = flags = fileid = size = 0
+    nlink = 1
+    if common & ATTR_CMN_DEVID:
+        (dev,) = struct.unpack_from("=i", buf, pos)
+        pos += 4
+    if common & ATTR_CMN_OBJTYPE:
+        (objtype,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+
+    times = {}
+    for attr in _TIMES:
+        if common & attr:
+            sec, nsec = struct.unpack_from("=qq", buf, pos)
+            times[attr] = sec * 1_000_000_000 + nsec
+            pos += 16
+
+    if common & ATTR_CMN_OWNERID:
+        (uid,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+    if common & ATTR_CMN_GRPID:
+        (gid,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+    if common & ATTR_CMN_ACCESSMASK:
+        (mask,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+    if common & ATTR_CMN_FLAGS:
+        (flags,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+    if common & ATTR_CMN_FILEID:
+        (fileid,) = struct.unpack_from("=Q", buf, pos)
+        pos += 8
+
+    if file_attrs & ATTR_FILE_LINKCOUNT:
+        (nlink,) = struct.unpack_from("=I", buf, pos)
+        pos += 4
+    if file_attrs & ATTR_FILE_DATALENGTH:
+        (size,) = struct.unpack_from("=q", buf, pos)
+        pos += 8
+
+    atime_ns = times.get(ATTR_CMN_ACCTIME, 0)
+    mtime_ns = times.get(ATTR_CMN_MODTIME, 0)
+    ctime_ns = times.get(ATTR_CMN_CHGTIME, 0)
+    mode = _OBJTYPE_MODES.get(objtype, 0) | (mask & 0o7777)
+    stat_info = os.stat_result(
+        (mode, fileid, dev, nlink, uid, gid, size, atime_ns // 10**9, mtime_ns // 10**9, ctime_ns // 10**9),
+        {
+            "st_atime": atime_ns / 1e9,
+            "st_mtime": mtime_ns / 1e9,
+            "st_ctime": ctime_ns / 1e9,
+            "st_atime_ns": atime_ns,
+            "st_mtime_ns": mtime_ns,
+            "st_ctime_ns": ctime_ns,
+            "st_birthtime": times.get(ATTR_CMN_CRTIME, 0) / 1e9,
+            "st_flags": flags,
+        },
+    )
+    return name, stat_info
+
+
+def dir_stats(path: str) -> Dict[str, os.stat_result]:
+    """lstat() results of every entry in a directory, keyed by name"""
+    results = {}
+    buf = ctypes.create_string_buffer(_BUFFER_SIZE)
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        while True:
+            count = _getattrlistbulk(fd, ctypes.byref(_ATTR_LIST), buf, _BUFFER_SIZE, 0)
+            if count == 0:
+                return results
+            if count < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), path)
+
+            offset = 0
+            for _ in range(count):
+                (length,) = struct.unpack_from("=I", buf, offset)
+                parsed = _parse_entry(buf, offset)
+                if parsed is not None:
+                    results[parsed[0]] = parsed[1]
+                offset += length
+    finally:
+        os.close(fd)
@@ -9,12 +9,337 @@ Licensed under the MIT License
 import sqlite3
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from itertools import islice
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from contextlib import contextmanager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Rows pulled per fetchmany() call when streaming large result sets
+_FETCH_BATCH_SIZE = 10_000
+
+# Tables whose row counts are maintained by triggers in the counters table
+_COUNTED_TABLES = ("scan_records", "file_records", "system_snapshots")
+
+# Secondary indexes on file_records, kept by name so bulk_load_context() can
+# drop them during large inserts and rebuild them afterwards. The composite
+# ones cover the analytics JOINs: the per-scan aggregations are answered from
+# the index b-tree without touching table rows.
+_FILE_RECORD_INDEXES = {
+    "idx_file_scan_id": "file_records(scan_id)",
+    "idx_file_path": "file_records(file_path)",
+    "idx_file_safety": "file_records(safety_level)",
+    "idx_file_scan_category": "file_records(scan_id, category, was_deleted, file_size)",
+    "idx_file_scan_safety": "file_records(scan_id, safety_level, was_deleted, file_size)",
+    # Walked largest first by get_top_space_consumers, which stops at its LIMIT
+    "idx_file_live_size": "file_records(was_deleted, file_size DESC)",
+}
+
+# Schema version stored in PRAGMA user_version; version 1 stores the
+# low-cardinality file_records columns as INTEGER codes into enum tables
+_SCHEMA_VERSION = 1
+
+# file_records columns stored as enum codes, mapped to their position in
+# FileRecord.to_row(); each has an enum_<column>(id, name) lookup table
+_ENUM_COLUMNS = {"file_type": 6, "safety_level": 7, "recommendation": 9, "category": 10}
+
+# Batches larger than this are inserted through json_each rather than
+# executemany, which saves per-row parameter binding
+_JSON_BULK_THRESHOLD = 5000
+
+# Rows per json_each payload, which bounds the size of a single JSON string
+_JSON_BULK_CHUNK_SIZE = 50_000
+
+# Applied to every connection. Connections are kept open per thread, so the
+# 64 MB page cache and the memory-mapped reads pay off across calls; with WAL,
+# synchronous = NORMAL can lose the last commits on a crash but never corrupts
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+# Units for _format_bytes, one per power of 1024
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+_STATEMENT_CACHE_SIZE = 256
+
+# SQL statements are module constants so the sqlite3 statement cache is hit
+# on every call instead of re-preparing freshly built strings
+_INSERT_SCAN_SQL = """
+    INSERT INTO scan_records (
+        timestamp, scan_type, total_files_scanned, total_size_scanned,
+        duration_seconds, categories_scanned, scan_summary,
+        space_freed, files_deleted, errors_count, success
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# {table} is filled in so the version 0 -> 1 migration can build the new
+# layout next to the old table before swapping them
+_CREATE_FILE_RECORDS_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        scan_id INTEGER NOT NULL,
+        file_path TEXT NOT NULL,
+        file_name TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        modified_time DATETIME NOT NULL,
+        created_time DATETIME NOT NULL,
+        file_type INTEGER NOT NULL REFERENCES enum_file_type (id),
+        safety_level INTEGER NOT NULL REFERENCES enum_safety_level (id),
+        importance_score INTEGER NOT NULL,
+        recommendation INTEGER NOT NULL REFERENCES enum_recommendation (id),
+        category INTEGER NOT NULL REFERENCES enum_category (id),
+        was_deleted BOOLEAN NOT NULL,
+        deletion_timestamp DATETIME,
+        FOREIGN KEY (scan_id) REFERENCES scan_records (id)
+    )
+"""
+
+_MIGRATE_FILE_RECORDS_SQL = """
+    INSERT INTO file_records_new
+    SELECT fr.id, fr.scan_id, fr.file_path, fr.file_name, fr.file_size,
+           fr.modified_time, fr.created_time, ft.id, sl.id,
+           fr.importance_score, rc.id, ct.id, fr.was_deleted, fr.deletion_timestamp
+    FROM file_records fr
+    JOIN enum_file_type ft ON ft.name = fr.file_type
+    JOIN enum_safety_level sl ON sl.name = fr.safety_level
+    JOIN enum_recommendation rc ON rc.name = fr.recommendation
+    JOIN enum_category ct ON ct.name = fr.category
+"""
+
+# Readers that need the enum names go through this view; aggregations group
+# on the codes and only join the (tiny) enum tables for the final rows
+_CREATE_FILE_RECORDS_VIEW_SQL = """
+    CREATE VIEW IF NOT EXISTS file_records_v AS
+    SELECT fr.id, fr.scan_id, fr.file_path, fr.file_name, fr.file_size,
+           fr.modified_time, fr.created_time, ft.name AS file_type,
+           sl.name AS safety_level, fr.importance_score,
+           rc.name AS recommendation, ct.name AS category,
+           fr.was_deleted, fr.deletion_timestamp
+    FROM file_records fr
+    JOIN enum_file_type ft ON ft.id = fr.file_type
+    JOIN enum_safety_level sl ON sl.id = fr.safety_level
+    JOIN enum_recommendation rc ON rc.id = fr.recommendation
+    JOIN enum_category ct ON ct.id = fr.category
+"""
+
+_INSERT_FILE_SQL = """
+    INSERT INTO file_records (
+        scan_id, file_path, file_name, file_size,
+        modified_time, created_time, file_type,
+        safety_level, importance_score, recommendation,
+        category, was_deleted, deletion_timestamp
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Same insert, but the rows arrive as one JSON array of arrays bound to a
+# single parameter and are unpacked by SQLite's json_each
+_INSERT_FILES_JSON_SQL = """
+    INSERT INTO file_records (
+        scan_id, file_path, file_name, file_size,
+        modified_time, created_time, file_type,
+        safety_level, importance_score, recommendation,
+        category, was_deleted, deletion_timestamp
+    )
+    SELECT
+        json_extract(value, '$[0]'), json_extract(value, '$[1]'),
+        json_extract(value, '$[2]'), json_extract(value, '$[3]'),
+        json_extract(value, '$[4]'), json_extract(value, '$[5]'),
+        json_extract(value, '$[6]'), json_extract(value, '$[7]'),
+        json_extract(value, '$[8]'), json_extract(value, '$[9]'),
+        json_extract(value, '$[10]'), json_extract(value, '$[11]'),
+        json_extract(value, '$[12]')
+    FROM json_each(?)
+"""
+
+_INSERT_SNAPSHOT_SQL = """
+    INSERT INTO system_snapshots (
+        timestamp, total_disk_space, used_space, free_space,
+        platform_info, memory_info, category_breakdown
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_SCAN_HISTORY_SQL = """
+    SELECT * FROM scan_records
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SELECT_SCAN_SQL = "SELECT * FROM scan_records WHERE id = ?"
+
+# Scores of previously analyzed files; a row is reused while the file's
+# mtime, size and the scoring configuration match and valid_until (when the
+# file's age moves into another scoring bracket) has not passed
+_CREATE_ANALYSIS_CACHE_SQL = """
+    CREATE TABLE IF NOT EXISTS analysis_cache (
+        path TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        config INTEGER NOT NULL,
+        valid_until REAL,
+        importance_score INTEGER NOT NULL,
+        safety_level TEXT NOT NULL,
+        recommendation TEXT NOT NULL
+    ) WITHOUT ROWID
+"""
+
+_SELECT_ANALYSIS_CACHE_SQL = """
+    SELECT path, mtime_ns, size, config, valid_until,
+           importance_score, safety_level, recommendation
+    FROM analysis_cache
+    WHERE path IN (SELECT value FROM json_each(?))
+"""
+
+_UPSERT_ANALYSIS_CACHE_SQL = """
+    INSERT OR REPLACE INTO analysis_cache (
+        path, mtime_ns, size, config, valid_until,
+        importance_score, safety_level, recommendation
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_SCAN_FILES_SQL = """
+    SELECT * FROM file_records_v WHERE scan_id = ?
+    ORDER BY file_size DESC
+"""
+
+_SELECT_SNAPSHOTS_SQL = """
+    SELECT * FROM system_snapshots
+    WHERE timestamp >= ?
+    ORDER BY timestamp DESC
+"""
+
+# The whole analytics summary in one statement: the cutoff is bound once in
+# the CTE and each section comes back as a JSON string in a single row. The
+# breakdowns are small result sets, so SQLite renders each one as a JSON
+# array; the ordered subqueries fix the element order.
+_ANALYTICS_SUMMARY_SQL = """
+    WITH recent AS (
+        SELECT id, timestamp, total_files_scanned, total_size_scanned,
+               space_freed, files_deleted, duration_seconds, success
+        FROM scan_records
+        WHERE timestamp >= ?
+    )
+    SELECT
+        (SELECT json_object(
+            'total_scans', COUNT(*),
+            'total_files', SUM(total_files_scanned),
+            'total_size', SUM(total_size_scanned),
+            'total_space_freed', SUM(space_freed),
+            'total_files_deleted', SUM(files_deleted),
+            'avg_duration', AVG(duration_seconds),
+            'successful_scans', COUNT(CASE WHEN success = 1 THEN 1 END)
+         ) FROM recent),
+        (SELECT json_group_array(
+            json_object('category', category, 'count', count, 'total_size', total_size)
+         ) FROM (
+            SELECT ct.name as category, g.count, g.total_size
+            FROM (
+                SELECT category, COUNT(*) as count, SUM(file_size) as total_size
+                FROM file_records
+                WHERE scan_id IN (SELECT id FROM recent)
+                GROUP BY category
+            ) g
+            JOIN enum_category ct ON ct.id = g.category
+            ORDER BY g.total_size DESC
+         )),
+        (SELECT json_group_array(
+            json_object('safety_level', safety_level, 'count', count, 'total_size', total_size)
+         ) FROM (
+            SELECT sl.name as safety_level, g.count, g.total_size
+            FROM (
+                SELECT safety_level, COUNT(*) as count, SUM(file_size) as total_size
+                FROM file_records
+                WHERE scan_id IN (SELECT id FROM recent)
+                GROUP BY safety_level
+            ) g
+            JOIN enum_safety_level sl ON sl.id = g.safety_level
+            ORDER BY g.count DESC
+         )),
+        (SELECT json_group_array(json_object('date', date, 'scans', scans))
+         FROM (
+            SELECT DATE(timestamp) as date, COUNT(*) as scans
+            FROM recent
+            GROUP BY DATE(timestamp)
+            ORDER BY date DESC
+         ))
+"""
+
+_TOP_CONSUMERS_SQL = """
+    SELECT DISTINCT file_path, file_name, file_size, safety_level,
+           category, recommendation, fr.modified_time
+    FROM file_records_v fr
+    JOIN scan_records sr ON fr.scan_id = sr.id
+    WHERE sr.timestamp >= ? AND fr.was_deleted = 0
+    ORDER BY fr.file_size DESC, file_path
+    LIMIT ? OFFSET ?
+"""
+
+_FILES_BY_SAFETY_SQL = """
+    SELECT file_path, file_name, file_size, ct.name as category,
+           rc.name as recommendation, fr.modified_time, sr.timestamp as scan_timestamp
+    FROM file_records fr
+    JOIN scan_records sr ON fr.scan_id = sr.id
+    JOIN enum_category ct ON ct.id = fr.category
+    JOIN enum_recommendation rc ON rc.id = fr.recommendation
+    WHERE sr.timestamp >= ? AND fr.was_deleted = 0
+      AND fr.safety_level = (SELECT id FROM enum_safety_level WHERE name = ?)
+    ORDER BY fr.file_size DESC
+"""
+
+_MARK_DELETED_SQL = """
+    UPDATE file_records
+    SET was_deleted = 1, deletion_timestamp = ?
+    WHERE file_path = ?
+"""
+
+_CREATE_STALE_SCANS_SQL = "CREATE TEMP TABLE IF NOT EXISTS stale_scan (id INTEGER PRIMARY KEY)"
+
+_COLLECT_STALE_SCANS_SQL = "INSERT INTO stale_scan SELECT id FROM scan_records WHERE timestamp < ?"
+
+_DELETE_STALE_FILES_SQL = "DELETE FROM file_records WHERE scan_id IN stale_scan"
+
+_DELETE_STALE_SCANS_SQL = "DELETE FROM scan_records WHERE id IN stale_scan"
+
+_DELETE_OLD_SNAPSHOTS_SQL = "DELETE FROM system_snapshots WHERE timestamp < ?"
+
+_SELECT_COUNTERS_SQL = "SELECT name, cnt FROM counters"
+
+_INSERT_ENUM_SQL = {
+    column: f"INSERT OR IGNORE INTO enum_{column} (name) VALUES (?)" for column in _ENUM_COLUMNS
+}
+
+_SELECT_ENUM_SQL = {column: f"SELECT id FROM enum_{column} WHERE name = ?" for column in _ENUM_COLUMNS}
+
+_EARLIEST_SCAN_SQL = "SELECT MIN(timestamp) FROM scan_records"
+
+_LATEST_SCAN_SQL = "SELECT MAX(timestamp) FROM scan_records"
+
+
+def _json_dumps(obj: Any) -> str:
+    """Encode a JSON column value, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(data: str) -> Any:
+    """Decode a JSON column value, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 @dataclass
 class ScanRecord:
@@ -58,12 +383,42 @@ class FileRecord:
     category: str = "unknown"
     was_deleted: bool = False
     deletion_timestamp: Optional[datetime] = None
+    # ISO strings of the three timestamps, for to_row(); set in __post_init__,
+    # so the timestamps are not meant to change afterwards
+    _ts: Tuple[str, str, Optional[str]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        if self.modified_time is None:
-            self.modified_time = datetime.now()
-        if self.created_time is None:
-            self.created_time = datetime.now()
+        if self.modified_time is None or self.created_time is None:
+            now = datetime.now()
+            if self.modified_time is None:
+                self.modified_time = now
+            if self.created_time is None:
+                self.created_time = now
+        
+        # Defaulted timestamps share one datetime, formatted only once
+        modified = self.modified_time.isoformat()
+        created = modified if self.created_time is self.modified_time else self.created_time.isoformat()
+        deleted = self.deletion_timestamp.isoformat() if self.deletion_timestamp else None
+        self._ts = (modified, created, deleted)
+    
+    def to_row(self) -> Tuple:
+        """Return the INSERT parameters, with the timestamps formatted in __post_init__"""
+        modified, created, deleted = self._ts
+        return (
+            self.scan_id,
+            self.file_path,
+            self.file_name,
+            self.file_size,
+            modified,
+            created,
+            self.file_type,
+            self.safety_level,
+            self.importance_score,
+            self.recommendation,
+            self.category,
+            self.was_deleted,
+            deleted
+        )
 
 
 @dataclass
@@ -101,27 +456,65 @@ class DatabaseManager:
         
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
+        # Each thread keeps its own connection: sqlite3 connections are
+        # bound to the thread that opened them, and separate connections let
+        # WAL readers run alongside each other and the writer
+        self._local = threading.local()
+        
         # Initialize database
         self._init_database()
     
     @contextmanager
-    def get_connection(self):
-        """Get database connection with proper error handling"""
-        conn = None
+    def get_connection(self, row_factory: Optional[Any] = sqlite3.Row):
+        """Get database connection with proper error handling
+        
+        Rows default to ``sqlite3.Row`` for dict-like access; pass
+        ``row_factory=None`` to get plain tuples on hot paths. The
+        connection is the calling thread's, reused across calls; a
+        transaction still open when the outermost use ends is rolled back,
+        as closing a fresh connection did.
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=_STATEMENT_CACHE_SIZE)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            local.conn = conn
+            local.depth = 0
+        
+        previous_factory = conn.row_factory
+        conn.row_factory = row_factory
+        local.depth += 1
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
             yield conn
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            local.depth -= 1
+            conn.row_factory = previous_factory
+            if local.depth == 0 and conn.in_transaction:
+                conn.rollback()
+    
+    def close(self) -> None:
+        """Refresh planner statistics and close the calling thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.depth == 0:
+            try:
+                # Analyzes the tables this connection's queries would benefit on
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                self.logger.warning(f"Could not optimize database: {e}")
+            conn.close()
+            self._local.conn = None
     
     def _init_database(self) -> None:
         """Initialize database tables"""
         with self.get_connection() as conn:
+            # WAL is persistent, so setting it once per database is enough
+            conn.execute("PRAGMA journal_mode = WAL")
+            
             # Scan records table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS scan_records (
@@ -140,26 +533,26 @@ class DatabaseManager:
                 )
             """)
             
+            # Lookup tables for the enum-coded file_records columns
+            for column in _ENUM_COLUMNS:
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS enum_{column} (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL UNIQUE
+                    )
+                """)
+            
             # File records table
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS file_records (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    scan_id INTEGER NOT NULL,
-                    file_path TEXT NOT NULL,
-                    file_name TEXT NOT NULL,
-                    file_size INTEGER NOT NULL,
-                    modified_time DATETIME NOT NULL,
-                    created_time DATETIME NOT NULL,
-                    file_type TEXT NOT NULL,
-                    safety_level TEXT NOT NULL,
-                    importance_score INTEGER NOT NULL,
-                    recommendation TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    was_deleted BOOLEAN NOT NULL,
-                    deletion_timestamp DATETIME,
-                    FOREIGN KEY (scan_id) REFERENCES scan_records (id)
-                )
-            """)
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            has_file_records = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'file_records'"
+            ).fetchone()
+            if has_file_records and schema_version < 1:
+                self._migrate_enum_columns(conn)
+            else:
+                conn.execute(_CREATE_FILE_RECORDS_SQL.format(table="file_records"))
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute(_CREATE_FILE_RECORDS_VIEW_SQL)
             
             # System snapshots table
             conn.execute("""
@@ -175,33 +568,126 @@ class DatabaseManager:
                 )
             """)
             
+            conn.execute(_CREATE_ANALYSIS_CACHE_SQL)
+            
             # Create indexes for better performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_timestamp ON scan_records(timestamp)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_file_scan_id ON file_records(scan_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON file_records(file_path)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_file_safety ON file_records(safety_level)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_timestamp ON system_snapshots(timestamp)")
             
+            # Covering index for the analytics timestamp filter on scan_records
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_records_timestamp_id ON scan_records(timestamp, id)")
+            self._create_file_record_indexes(conn)
+            
+            # Row counters kept current by triggers so stats never scan tables
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    cnt INTEGER NOT NULL
+                )
+            """)
+            seeded = {row[0] for row in conn.execute("SELECT name FROM counters")}
+            for table in _COUNTED_TABLES:
+                if table not in seeded:
+                    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    conn.execute("INSERT INTO counters (name, cnt) VALUES (?, ?)", (table, count))
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_count_insert
+                    AFTER INSERT ON {table} BEGIN
+                        UPDATE counters SET cnt = cnt + 1 WHERE name = '{table}';
+                    END
+                """)
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{table}_count_delete
+                    AFTER DELETE ON {table} BEGIN
+                        UPDATE counters SET cnt = cnt - 1 WHERE name = '{table}';
+                    END
+                """)
+            
+            self._load_enum_codes(conn)
+            
             conn.commit()
+            
+            # Refresh planner statistics that are missing or stale, so the
+            # composite indexes are chosen; cheap when nothing changed
+            conn.execute("PRAGMA optimize")
             self.logger.info("Database initialized successfully")
     
+    def _migrate_enum_columns(self, conn: sqlite3.Connection) -> None:
+        """Rewrite a version 0 file_records table with INTEGER enum codes
+        
+        Dropping the old table also drops its indexes and count triggers;
+        the rest of _init_database recreates them on the new table.
+        """
+        self.logger.info("Migrating file records to enum-coded columns")
+        for column in _ENUM_COLUMNS:
+            conn.execute(
+                f"INSERT OR IGNORE INTO enum_{column} (name) SELECT DISTINCT {column} FROM file_records"
+            )
+        conn.execute(_CREATE_FILE_RECORDS_SQL.format(table="file_records_new"))
+        conn.execute(_MIGRATE_FILE_RECORDS_SQL)
+        conn.execute("DROP TABLE file_records")
+        conn.execute("ALTER TABLE file_records_new RENAME TO file_records")
+    
+    def _load_enum_codes(self, conn: sqlite3.Connection) -> None:
+        """Cache the name -> code mapping of every enum table"""
+        self._enum_codes = {
+            column: dict(conn.execute(f"SELECT name, id FROM enum_{column}").fetchall())
+            for column in _ENUM_COLUMNS
+        }
+    
+    def _encode_row(self, conn: sqlite3.Connection, row: Tuple) -> List:
+        """Replace the enum column names of a FileRecord row with their codes"""
+        row = list(row)
+        for column, position in _ENUM_COLUMNS.items():
+            codes = self._enum_codes[column]
+            name = row[position]
+            code = codes.get(name)
+            if code is None:
+                conn.execute(_INSERT_ENUM_SQL[column], (name,))
+                code = conn.execute(_SELECT_ENUM_SQL[column], (name,)).fetchone()[0]
+                codes[name] = code
+            row[position] = code
+        return row
+    
+    @staticmethod
+    def _create_file_record_indexes(conn: sqlite3.Connection) -> None:
+        """Create the secondary indexes on file_records if they are missing"""
+        for name, target in _FILE_RECORD_INDEXES.items():
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    
+    @contextmanager
+    def bulk_load_context(self):
+        """Drop file_records indexes for the duration of a large insert
+        
+        Maintaining five b-trees row by row dominates the cost of loading a
+        full-disk scan; rebuilding each index once from sorted data at the end
+        is much cheaper. Statistics are refreshed after the rebuild.
+        """
+        with self.get_connection() as conn:
+            for name in _FILE_RECORD_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+            conn.commit()
+        
+        try:
+            yield self
+        finally:
+            with self.get_connection() as conn:
+                self._create_file_record_indexes(conn)
+                conn.execute("ANALYZE file_records")
+                conn.commit()
+                self.logger.info("Rebuilt file record indexes after bulk load")
+    
     def save_scan_record(self, scan_record: ScanRecord) -> int:
         """Save a scan record and return its ID"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO scan_records (
-                    timestamp, scan_type, total_files_scanned, total_size_scanned,
-                    duration_seconds, categories_scanned, scan_summary,
-                    space_freed, files_deleted, errors_count, success
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor = conn.execute(_INSERT_SCAN_SQL, (
                 scan_record.timestamp.isoformat(),
                 scan_record.scan_type,
                 scan_record.total_files_scanned,
                 scan_record.total_size_scanned,
                 scan_record.duration_seconds,
-                json.dumps(scan_record.categories_scanned),
-                json.dumps(scan_record.scan_summary),
+                _json_dumps(scan_record.categories_scanned),
+                _json_dumps(scan_record.scan_summary),
                 scan_record.space_freed,
                 scan_record.files_deleted,
                 scan_record.errors_count,
@@ -215,51 +701,82 @@ class DatabaseManager:
     
     def save_file_records(self, file_records: List[FileRecord], scan_id: int) -> None:
         """Save multiple file records for a scan"""
+        for file_record in file_records:
+            file_record.scan_id = scan_id
+        
         with self.get_connection() as conn:
-            for file_record in file_records:
-                file_record.scan_id = scan_id
-                conn.execute("""
-                    INSERT INTO file_records (
-                        scan_id, file_path, file_name, file_size,
-                        modified_time, created_time, file_type,
-                        safety_level, importance_score, recommendation,
-                        category, was_deleted, deletion_timestamp
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    file_record.scan_id,
-                    file_record.file_path,
-                    file_record.file_name,
-                    file_record.file_size,
-                    file_record.modified_time.isoformat(),
-                    file_record.created_time.isoformat(),
-                    file_record.file_type,
-                    file_record.safety_level,
-                    file_record.importance_score,
-                    file_record.recommendation,
-                    file_record.category,
-                    file_record.was_deleted,
-                    file_record.deletion_timestamp.isoformat() if file_record.deletion_timestamp else None
-                ))
+            rows = (self._encode_row(conn, file_record.to_row()) for file_record in file_records)
+            try:
+                if len(file_records) > _JSON_BULK_THRESHOLD:
+                    self._insert_file_rows_json(conn, rows)
+                else:
+                    conn.executemany(_INSERT_FILE_SQL, rows)
+            except Exception:
+                self._discard_enum_codes(conn)
+                raise
             
             conn.commit()
             self.logger.info(f"Saved {len(file_records)} file records for scan {scan_id}")
     
+    def save_file_records_bulk(self, file_records: Iterable[FileRecord], scan_id: int) -> int:
+        """Stream file records for a scan into the database and return the count
+        
+        Intended for very large scans: the records are consumed lazily and
+        written in bounded json_each chunks inside one transaction, so the
+        full record set never has to exist as a list.
+        """
+        def rows() -> Iterator[Tuple]:
+            for file_record in file_records:
+                file_record.scan_id = scan_id
+                yield file_record.to_row()
+        
+        return self.save_file_rows(rows(), scan_id)
+    
+    def save_file_rows(self, rows: Iterable[Tuple], scan_id: int) -> int:
+        """Stream raw file rows for a scan into the database and return the count
+        
+        Each row has the layout of FileRecord.to_row(), so callers holding
+        plain scan results can skip building FileRecord objects. All rows are
+        written in one transaction.
+        """
+        with self.get_connection() as conn:
+            encoded = (self._encode_row(conn, row) for row in rows)
+            try:
+                saved = self._insert_file_rows_json(conn, encoded)
+            except Exception:
+                self._discard_enum_codes(conn)
+                raise
+            conn.commit()
+            self.logger.info(f"Saved {saved} file records for scan {scan_id}")
+            return saved
+    
+    def _discard_enum_codes(self, conn: sqlite3.Connection) -> None:
+        """Roll back a failed insert and reload the enum codes it may have cached"""
+        conn.rollback()
+        self._load_enum_codes(conn)
+    
+    @staticmethod
+    def _insert_file_rows_json(conn: sqlite3.Connection, rows: Iterator[List]) -> int:
+        """Insert file rows in json_each chunks and return the row count"""
+        saved = 0
+        while True:
+            chunk = list(islice(rows, _JSON_BULK_CHUNK_SIZE))
+            if not chunk:
+                return saved
+            conn.execute(_INSERT_FILES_JSON_SQL, (_json_dumps(chunk),))
+            saved += len(chunk)
+    
     def save_system_snapshot(self, snapshot: SystemSnapshot) -> int:
         """Save a system snapshot and return its ID"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO system_snapshots (
-                    timestamp, total_disk_space, used_space, free_space,
-                    platform_info, memory_info, category_breakdown
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+            cursor = conn.execute(_INSERT_SNAPSHOT_SQL, (
                 snapshot.timestamp.isoformat(),
                 snapshot.total_disk_space,
                 snapshot.used_space,
                 snapshot.free_space,
-                json.dumps(snapshot.platform_info),
-                json.dumps(snapshot.memory_info),
-                json.dumps(snapshot.category_breakdown)
+                _json_dumps(snapshot.platform_info),
+                _json_dumps(snapshot.memory_info),
+                _json_dumps(snapshot.category_breakdown)
             ))
             
             snapshot_id = cursor.lastrowid
@@ -270,178 +787,177 @@ class DatabaseManager:
     def get_scan_history(self, limit: int = 50) -> List[Dict]:
         """Get scan history"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM scan_records 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (limit,))
-            
-            records = []
-            for row in cursor.fetchall():
-                record = dict(row)
-                record['categories_scanned'] = json.loads(record['categories_scanned'])
-                record['scan_summary'] = json.loads(record['scan_summary'])
-                records.append(record)
-            
-            return records
+            return self._scan_history(conn, limit)
     
-    def get_scan_details(self, scan_id: int) -> Dict:
-        """Get detailed information about a specific scan"""
+    @staticmethod
+    def _scan_history(conn: sqlite3.Connection, limit: int) -> List[Dict]:
+        """get_scan_history on an open connection"""
+        cursor = conn.execute(_SELECT_SCAN_HISTORY_SQL, (limit,))
+        
+        records = []
+        for row in cursor.fetchall():
+            record = dict(row)
+            record['categories_scanned'] = _json_loads(record['categories_scanned'])
+            record['scan_summary'] = _json_loads(record['scan_summary'])
+            records.append(record)
+        
+        return records
+    
+    def get_scan_details(self, scan_id: int, stream: bool = False) -> Dict:
+        """Get detailed information about a specific scan
+        
+        With ``stream=True`` the ``file_records`` entry is a lazy iterator of
+        dicts instead of a list, so very large scans are never fully loaded
+        into memory.
+        """
         with self.get_connection() as conn:
             # Get scan record
-            cursor = conn.execute("""
-                SELECT * FROM scan_records WHERE id = ?
-            """, (scan_id,))
+            cursor = conn.execute(_SELECT_SCAN_SQL, (scan_id,))
             
             scan_record = cursor.fetchone()
             if not scan_record:
                 return {"error": "Scan record not found"}
             
             scan_data = dict(scan_record)
-            scan_data['categories_scanned'] = json.loads(scan_data['categories_scanned'])
-            scan_data['scan_summary'] = json.loads(scan_data['scan_summary'])
-            
-            # Get file records for this scan
-            cursor = conn.execute("""
-                SELECT * FROM file_records WHERE scan_id = ?
-                ORDER BY file_size DESC
-            """, (scan_id,))
-            
-            file_records = []
-            for row in cursor.fetchall():
-                file_data = dict(row)
-                file_records.append(file_data)
+            scan_data['categories_scanned'] = _json_loads(scan_data['categories_scanned'])
+            scan_data['scan_summary'] = _json_loads(scan_data['scan_summary'])
+        
+        # Get file records for this scan
+        file_records = self.iter_file_records(scan_id)
+        scan_data['file_records'] = file_records if stream else list(file_records)
+        return scan_data
+    
+    def iter_file_records(self, scan_id: int) -> Iterator[Dict]:
+        """Yield the file records of a scan, largest first, in fetchmany batches"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(_SELECT_SCAN_FILES_SQL, (scan_id,))
             
-            scan_data['file_records'] = file_records
-            return scan_data
+            while True:
+                rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
     
     def get_system_snapshots(self, days: int = 30) -> List[Dict]:
         """Get system snapshots for the last N days"""
+        with self.get_connection() as conn:
+            return self._system_snapshots(conn, days)
+    
+    @staticmethod
+    def _system_snapshots(conn: sqlite3.Connection, days: int) -> List[Dict]:
+        """get_system_snapshots on an open connection"""
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cursor = conn.execute(_SELECT_SNAPSHOTS_SQL, (cutoff_date,))
         
-        with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT * FROM system_snapshots 
-                WHERE timestamp >= ?
-                ORDER BY timestamp DESC
-            """, (cutoff_date,))
-            
-            snapshots = []
-            for row in cursor.fetchall():
-                snapshot = dict(row)
-                snapshot['platform_info'] = json.loads(snapshot['platform_info'])
-                snapshot['memory_info'] = json.loads(snapshot['memory_info'])
-                snapshot['category_breakdown'] = json.loads(snapshot['category_breakdown'])
-                snapshots.append(snapshot)
-            
-            return snapshots
+        snapshots = []
+        for row in cursor.fetchall():
+            snapshot = dict(row)
+            snapshot['platform_info'] = _json_loads(snapshot['platform_info'])
+            snapshot['memory_info'] = _json_loads(snapshot['memory_info'])
+            snapshot['category_breakdown'] = _json_loads(snapshot['category_breakdown'])
+            snapshots.append(snapshot)
+        
+        return snapshots
     
     def get_analytics_summary(self, days: int = 30) -> Dict:
         """Get analytics summary for the last N days"""
+        with self.get_connection(row_factory=None) as conn:
+            return self._analytics_summary(conn, days)
+    
+    @staticmethod
+    def _analytics_summary(conn: sqlite3.Connection, days: int) -> Dict:
+        """get_analytics_summary on an open connection"""
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        row = conn.execute(_ANALYTICS_SUMMARY_SQL, (cutoff_date,)).fetchone()
+        scan_stats, category_stats, safety_stats, daily_scans = map(_json_loads, row)
         
-        with self.get_connection() as conn:
-            # Scan statistics
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_scans,
-                    SUM(total_files_scanned) as total_files,
-                    SUM(total_size_scanned) as total_size,
-                    SUM(space_freed) as total_space_freed,
-                    SUM(files_deleted) as total_files_deleted,
-                    AVG(duration_seconds) as avg_duration,
-                    COUNT(CASE WHEN success = 1 THEN 1 END) as successful_scans
-                FROM scan_records 
-                WHERE timestamp >= ?
-            """, (cutoff_date,))
-            
-            scan_stats = dict(cursor.fetchone())
-            
-            # Category breakdown
-            cursor = conn.execute("""
-                SELECT category, COUNT(*) as count, SUM(file_size) as total_size
-                FROM file_records fr
-                JOIN scan_records sr ON fr.scan_id = sr.id
-                WHERE sr.timestamp >= ?
-                GROUP BY category
-                ORDER BY total_size DESC
-            """, (cutoff_date,))
-            
-            category_stats = [dict(row) for row in cursor.fetchall()]
-            
-            # Safety level breakdown
-            cursor = conn.execute("""
-                SELECT safety_level, COUNT(*) as count, SUM(file_size) as total_size
-                FROM file_records fr
-                JOIN scan_records sr ON fr.scan_id = sr.id
-                WHERE sr.timestamp >= ?
-                GROUP BY safety_level
-                ORDER BY count DESC
-            """, (cutoff_date,))
-            
-            safety_stats = [dict(row) for row in cursor.fetchall()]
-            
-            # Daily scan counts
-            cursor = conn.execute("""
-                SELECT DATE(timestamp) as date, COUNT(*) as scans
-                FROM scan_records
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY date DESC
-            """, (cutoff_date,))
-            
-            daily_scans = [dict(row) for row in cursor.fetchall()]
-            
-            return {
-                "period_days": days,
-                "scan_statistics": scan_stats,
-                "category_breakdown": category_stats,
-                "safety_breakdown": safety_stats,
-                "daily_scans": daily_scans
-            }
+        return {
+            "period_days": days,
+            "scan_statistics": scan_stats,
+            "category_breakdown": category_stats,
+            "safety_breakdown": safety_stats,
+            "daily_scans": daily_scans
+        }
+    
+    def get_top_space_consumers(self, days: int = 30, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Get top space consuming files from recent scans
+        
+        offset skips the largest files, to fetch the list a page at a time.
+        """
+        with self.get_connection(row_factory=None) as conn:
+            return self._top_space_consumers(conn, days, limit, offset)
     
-    def get_top_space_consumers(self, days: int = 30, limit: int = 20) -> List[Dict]:
-        """Get top space consuming files from recent scans"""
+    def _top_space_consumers(self, conn: sqlite3.Connection, days: int, limit: int, offset: int = 0) -> List[Dict]:
+        """get_top_space_consumers on an open connection"""
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        cursor = conn.execute(_TOP_CONSUMERS_SQL, (cutoff_date, limit, offset))
+        
+        return self._rows_to_dicts(cursor)
+    
+    def get_dashboard_bundle(
+        self,
+        history_limit: int = 50,
+        activity_limit: int = 10,
+        snapshot_days: int = 7,
+        analytics_days: int = 30,
+        consumers_days: int = 30,
+        consumers_limit: int = 20,
+    ) -> Dict:
+        """Everything the analytics dashboard shows, read in one transaction
         
+        One connection serves all the queries, and the transaction gives
+        them a consistent snapshot. Recent activity is the head of the
+        scan history.
+        """
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT DISTINCT file_path, file_name, file_size, safety_level, 
-                       category, recommendation, fr.modified_time
-                FROM file_records fr
-                JOIN scan_records sr ON fr.scan_id = sr.id
-                WHERE sr.timestamp >= ? AND fr.was_deleted = 0
-                ORDER BY fr.file_size DESC
-                LIMIT ?
-            """, (cutoff_date, limit))
-            
-            return [dict(row) for row in cursor.fetchall()]
+            conn.execute("BEGIN")
+            try:
+                history = self._scan_history(conn, max(history_limit, activity_limit))
+                return {
+                    "stats": self._database_stats(conn),
+                    "activity": history[:activity_limit],
+                    "history": history[:history_limit],
+                    "snapshots": self._system_snapshots(conn, snapshot_days),
+                    "analytics": self._analytics_summary(conn, analytics_days),
+                    "consumers": self._top_space_consumers(conn, consumers_days, consumers_limit),
+                }
+            finally:
+                conn.commit()
     
     def get_files_by_safety_level(self, safety_level: str, days: int = 30) -> List[Dict]:
         """Get files by safety level from recent scans"""
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
         
-        with self.get_connection() as conn:
-            cursor = conn.execute("""
-                SELECT file_path, file_name, file_size, category, recommendation,
-                       fr.modified_time, sr.timestamp as scan_timestamp
-                FROM file_records fr
-                JOIN scan_records sr ON fr.scan_id = sr.id
-                WHERE sr.timestamp >= ? AND fr.safety_level = ? AND fr.was_deleted = 0
-                ORDER BY fr.file_size DESC
-            """, (cutoff_date, safety_level))
+        with self.get_connection(row_factory=None) as conn:
+            cursor = conn.execute(_FILES_BY_SAFETY_SQL, (cutoff_date, safety_level))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return self._rows_to_dicts(cursor)
+    
+    def get_cached_analyses(self, paths: List[str]) -> Dict[str, Tuple]:
+        """Cached analysis rows for the given paths, keyed by path
+        
+        Each row is (path, mtime_ns, size, config, valid_until,
+        importance_score, safety_level, recommendation); callers decide
+        whether it is still valid.
+        """
+        with self.get_connection(row_factory=None) as conn:
+            rows = conn.execute(_SELECT_ANALYSIS_CACHE_SQL, (_json_dumps(paths),)).fetchall()
+        return {row[0]: row for row in rows}
+    
+    def save_cached_analyses(self, rows: Iterable[Tuple]) -> None:
+        """Insert or replace analysis cache rows in one transaction"""
+        with self.get_connection(row_factory=None) as conn:
+            conn.executemany(_UPSERT_ANALYSIS_CACHE_SQL, rows)
+            conn.commit()
     
     def mark_files_deleted(self, file_paths: List[str]) -> None:
         """Mark files as deleted in the database"""
+        deletion_timestamp = datetime.now().isoformat()
         with self.get_connection() as conn:
-            for file_path in file_paths:
-                conn.execute("""
-                    UPDATE file_records 
-                    SET was_deleted = 1, deletion_timestamp = ?
-                    WHERE file_path = ?
-                """, (datetime.now().isoformat(), file_path))
+            conn.executemany(
+                _MARK_DELETED_SQL, ((deletion_timestamp, file_path) for file_path in file_paths)
+            )
             
             conn.commit()
             self.logger.info(f"Marked {len(file_paths)} files as deleted")
@@ -451,73 +967,74 @@ class DatabaseManager:
         cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
         
         with self.get_connection() as conn:
-            # Delete old file records
-            cursor = conn.execute("""
-                DELETE FROM file_records 
-                WHERE scan_id IN (
-                    SELECT id FROM scan_records WHERE timestamp < ?
-                )
-            """, (cutoff_date,))
+            # One write transaction for all three deletes (single commit)
+            conn.execute("BEGIN IMMEDIATE")
+            
+            # Resolve the stale scan ids once instead of re-running the subquery
+            conn.execute(_CREATE_STALE_SCANS_SQL)
+            conn.execute(_COLLECT_STALE_SCANS_SQL, (cutoff_date,))
             
+            # Delete old file records
+            cursor = conn.execute(_DELETE_STALE_FILES_SQL)
             files_deleted = cursor.rowcount
             
             # Delete old scan records
-            cursor = conn.execute("""
-                DELETE FROM scan_records WHERE timestamp < ?
-            """, (cutoff_date,))
-            
+            cursor = conn.execute(_DELETE_STALE_SCANS_SQL)
             scans_deleted = cursor.rowcount
             
             # Delete old system snapshots
-            cursor = conn.execute("""
-                DELETE FROM system_snapshots WHERE timestamp < ?
-            """, (cutoff_date,))
+            cursor = conn.execute(_DELETE_OLD_SNAPSHOTS_SQL, (cutoff_date,))
             
             snapshots_deleted = cursor.rowcount
             
+            conn.execute("DROP TABLE stale_scan")
             conn.commit()
             self.logger.info(f"Cleaned up old records: {scans_deleted} scans, {files_deleted} files, {snapshots_deleted} snapshots")
     
     def get_database_stats(self) -> Dict:
         """Get database statistics"""
         with self.get_connection() as conn:
-            # Table counts
-            cursor = conn.execute("SELECT COUNT(*) FROM scan_records")
-            scan_count = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM file_records")
-            file_count = cursor.fetchone()[0]
-            
-            cursor = conn.execute("SELECT COUNT(*) FROM system_snapshots")
-            snapshot_count = cursor.fetchone()[0]
-            
-            # Database size
-            db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
-            
-            # Date range
-            cursor = conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM scan_records")
-            date_range = cursor.fetchone()
-            
-            return {
-                "database_path": str(self.db_path),
-                "database_size_bytes": db_size,
-                "database_size_human": self._format_bytes(db_size),
-                "scan_records": scan_count,
-                "file_records": file_count,
-                "system_snapshots": snapshot_count,
-                "date_range": {
-                    "earliest": date_range[0],
-                    "latest": date_range[1]
-                }
+            return self._database_stats(conn)
+    
+    def _database_stats(self, conn: sqlite3.Connection) -> Dict:
+        """get_database_stats on an open connection"""
+        # Table counts (maintained by triggers)
+        counts = dict(conn.execute(_SELECT_COUNTERS_SQL).fetchall())
+        
+        # Database size
+        db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+        
+        # Date range (separate queries: SQLite only turns a lone MIN or MAX
+        # into a single index probe, MIN and MAX together scan the index)
+        earliest = conn.execute(_EARLIEST_SCAN_SQL).fetchone()[0]
+        latest = conn.execute(_LATEST_SCAN_SQL).fetchone()[0]
+        
+        return {
+            "database_path": str(self.db_path),
+            "database_size_bytes": db_size,
+            "database_size_human": self._format_bytes(db_size),
+            "scan_records": counts.get("scan_records", 0),
+            "file_records": counts.get("file_records", 0),
+            "system_snapshots": counts.get("system_snapshots", 0),
+            "date_range": {
+                "earliest": earliest,
+                "latest": latest
             }
+        }
+    
+    @staticmethod
+    def _rows_to_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+        """Convert plain tuple rows to dicts, resolving column names once"""
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
     
     def _format_bytes(self, bytes_count: int) -> str:
         """Format bytes into human readable string"""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if bytes_count < 1024.0:
-                return f"{bytes_count:.1f} {unit}"
-            bytes_count /= 1024.0
-        return f"{bytes_count:.1f} PB"
+        if bytes_count < 1024:
+            return f"{bytes_count:.1f} B"
+        # Each unit is 2**10 of the previous one, so the bit length picks it directly
+        unit_index = min((int(bytes_count).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_count / (1 << (10 * unit_index)):.1f} {_BYTE_UNITS[unit_index]}"
 
 
 __all__ = ["DatabaseManager", "ScanRecord", "FileRecord", "SystemSnapshot"]
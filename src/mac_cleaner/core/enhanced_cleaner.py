@@ -7,11 +7,15 @@ Licensed under the MIT License
 """
 
 import logging
+import os
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from ..interfaces import (
     CleanerInterface, 
+    CleanerPlugin,
     PluginManager, 
     ConfigInterface, 
     OperationMode,
@@ -35,6 +39,14 @@ class EnhancedCleaner(CleanerInterface):
         # Discover additional plugins if enabled
         if self.config.get('plugins.auto_discover', True):
             self.plugin_manager.discover_plugins()
+        
+        # Protected prefixes as a tuple so str.startswith checks them in one call
+        self._protected_paths = tuple(sorted(self.config.get('security.protected_paths', [])))
+        
+        # Per-path plugin dispatch cache; cleared once the plugin manager's
+        # version shows its plugins changed
+        self._find_plugin = lru_cache(maxsize=8192)(self._lookup_plugin)
+        self._plugins_version = self.plugin_manager.version
     
     def analyze(self, paths: Optional[List[str]] = None) -> Dict[str, Any]:
         """Analyze what can be cleaned using all plugins."""
@@ -105,14 +117,25 @@ class EnhancedCleaner(CleanerInterface):
     
     def get_safety_info(self, path: str) -> SafetyLevel:
         """Get safety level for a specific path."""
-        # Find plugins that can handle this path
-        for plugin in self.plugin_manager.get_enabled_plugins():
-            if plugin.can_handle_path(path):
-                return plugin.get_safety_level(path)
+        version = self.plugin_manager.version
+        if version != self._plugins_version:
+            self._find_plugin.cache_clear()
+            self._plugins_version = version
+        
+        plugin = self._find_plugin(path)
+        if plugin is not None:
+            return plugin.get_safety_level(path)
         
         # Default to safe if no plugin handles it
         return SafetyLevel.SAFE
     
+    def _lookup_plugin(self, path: str) -> Optional[CleanerPlugin]:
+        """Find the first enabled plugin that can handle a path."""
+        for plugin in self.plugin_manager.get_enabled_plugins():
+            if plugin.can_handle_path(path):
+                return plugin
+        return None
+    
     def validate_operation(self, operation: OperationMode, paths: List[str]) -> bool:
         """Validate if operation can be performed."""
         try:
@@ -123,9 +146,8 @@ class EnhancedCleaner(CleanerInterface):
                     return False
             
             # Check if paths are protected
-            protected_paths = self.config.get('security.protected_paths', [])
             for path in paths:
-                if any(path.startswith(protected) for protected in protected_paths):
+                if path.startswith(self._protected_paths):
                     self.logger.warning(f"Path is protected: {path}")
                     return False
             
@@ -161,16 +183,13 @@ class EnhancedCleaner(CleanerInterface):
     
     def _get_safety_breakdown(self, results: Dict[str, Any]) -> Dict[str, int]:
         """Get breakdown of files by safety level."""
-        breakdown = {level.value: 0 for level in SafetyLevel}
-        
-        for plugin_name, plugin_results in results.get('plugins', {}).items():
-            if 'paths' in plugin_results:
-                for path_info in plugin_results['paths']:
-                    safety_level = path_info.get('safety_level', 'safe')
-                    if safety_level in breakdown:
-                        breakdown[safety_level] += 1
+        counts = Counter(
+            path_info.get('safety_level', 'safe')
+            for plugin_results in results.get('plugins', {}).values()
+            for path_info in plugin_results.get('paths', ())
+        )
         
-        return breakdown
+        return {level.value: counts[level.value] for level in SafetyLevel}
     
     def _get_recommendations(self, results: Dict[str, Any]) -> List[str]:
         """Get cleaning recommendations based on analysis."""
@@ -7,13 +7,27 @@ Licensed under the MIT License
 """
 
 import logging
+import os
 import subprocess
+import sys
 import json
-from datetime import datetime
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
-from enum import Enum
+from typing import Callable, Deque, Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+
+try:
+    from Foundation import NSUserNotification, NSUserNotificationCenter
+    PYOBJC_AVAILABLE = True
+except ImportError:
+    PYOBJC_AVAILABLE = False
 
 try:
     import pync
@@ -21,8 +35,16 @@ try:
 except ImportError:
     PYNC_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -30,6 +52,77 @@ except ImportError:
 from .scheduler import TaskExecutionResult
 
 
+# Write buffer of the notification log; buffered entries are flushed at
+# most this many seconds after they were written
+_LOG_BUFFER_SIZE = 64 * 1024
+_LOG_FLUSH_INTERVAL = 1.0
+
+# Keep-alive pool for webhook requests
+_HTTP_POOL_CONNECTIONS = 4
+_HTTP_POOL_MAXSIZE = 8
+
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Units for _format_bytes, one per power of 1024
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Notifications remembered by SmartNotificationManager
+_HISTORY_LIMIT = 1000
+
+# Data keys of debounced notifications merged into one: counters are
+# summed and names joined; any other key keeps its latest value
+_SUMMED_DATA_KEYS = frozenset({"size_freed", "paths_processed", "duration_seconds"})
+_JOINED_DATA_KEYS = frozenset({"task_id", "task_name", "error_message", "change_description"})
+
+# Rate limit window and stats "recent" window, in seconds of time.monotonic()
+_RATE_LIMIT_WINDOW = 3600.0
+_RECENT_STATS_WINDOW = 86400.0
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values JSON has no type for (datetimes, enums, paths, ...)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(obj: Any, newline: bool = False) -> bytes:
+    """Encode a notification payload, using orjson when it is installed
+    
+    orjson writes datetimes natively (same ISO format as isoformat()), so
+    payloads can carry them without converting first.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE if newline else 0
+        )
+    data = json.dumps(obj, default=_json_default)
+    return (data + "\n" if newline else data).encode()
+
+
+class _LazyStr:
+    """Message body rendered on first use
+    
+    Notifications that are filtered out (disabled channel, quiet hours,
+    rate limit) never pay for building their text.
+    """
+    
+    __slots__ = ("_fn", "_value")
+    
+    def __init__(self, fn: Callable[[], str]):
+        self._fn = fn
+        self._value: Optional[str] = None
+    
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = self._fn()
+        return self._value
+    
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
 class NotificationType(Enum):
     """Types of notifications"""
     TASK_COMPLETED = "task_completed"
@@ -40,6 +133,50 @@ class NotificationType(Enum):
     ERROR = "error"
 
 
+# Enum values as a plain dict: cheaper than the .value descriptor on the
+# per-notification paths
+_TYPE_VALUES = {notification_type: notification_type.value for notification_type in NotificationType}
+_TYPE_LABELS = {notification_type: notification_type.value.upper() for notification_type in NotificationType}
+
+
+class Priority(IntEnum):
+    """Notification priorities, ordered so thresholds are integer compares"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    CRITICAL = 3
+    
+    @classmethod
+    def coerce(cls, value: Union["Priority", str], default: Optional["Priority"] = None) -> "Priority":
+        """Accept a Priority or its name ("low", "normal", ...)"""
+        if isinstance(value, cls):
+            return value
+        return cls.__members__.get(str(value).upper(), default if default is not None else cls.NORMAL)
+    
+    @property
+    def label(self) -> str:
+        """Lower-case name used in logs, payloads and stats"""
+        return self.name.lower()
+
+
+# System notification sounds that override the configured one
+_SOUND_BY_PRIORITY = {Priority.CRITICAL: "Basso", Priority.HIGH: "Sosumi"}
+
+# Console prefix and log level for each priority
+_CONSOLE_PREFIX = {
+    Priority.CRITICAL: "🚨 ",
+    Priority.HIGH: "⚠️ ",
+    Priority.NORMAL: "ℹ️ ",
+    Priority.LOW: "💡 ",
+}
+_CONSOLE_LEVEL = {
+    Priority.CRITICAL: logging.ERROR,
+    Priority.HIGH: logging.ERROR,
+    Priority.NORMAL: logging.WARNING,
+    Priority.LOW: logging.INFO,
+}
+
+
 class NotificationChannel(Enum):
     """Notification channels"""
     SYSTEM = "system"          # macOS notifications
@@ -49,23 +186,24 @@ class NotificationChannel(Enum):
     CONSOLE = "console"       # Console output
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class NotificationMessage:
     """Notification message"""
     title: str
-    message: str
+    message: Union[str, _LazyStr]  # rendered with str() when delivered
     notification_type: NotificationType
     channels: List[NotificationChannel]
-    priority: str = "normal"  # low, normal, high, critical
+    priority: Priority = Priority.NORMAL  # names ("high", ...) are accepted too
     data: Optional[Dict[str, Any]] = None
     timestamp: datetime = None
     
     def __post_init__(self):
+        self.priority = Priority.coerce(self.priority)
         if self.timestamp is None:
             self.timestamp = datetime.now()
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class NotificationConfig:
     """Configuration for notification channels"""
     enabled_channels: List[NotificationChannel]
@@ -76,6 +214,147 @@ class NotificationConfig:
     min_priority_for_system: str = "normal"
     min_priority_for_email: str = "high"
     min_priority_for_webhook: str = "normal"
+    # Additional webhook targets, posted to in parallel with webhook_url
+    webhook_urls: List[str] = field(default_factory=list)
+    # (settings key, thresholds) last resolved by _resolve_thresholds()
+    _thresholds_cache: Optional[Tuple[Tuple[Any, ...], "_ChannelThresholds"]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def priority_thresholds(self) -> Dict[NotificationChannel, Priority]:
+        """Per-channel thresholds from the min_priority_* settings"""
+        return self._resolve_thresholds().by_channel
+    
+    def _resolve_thresholds(self) -> "_ChannelThresholds":
+        """Thresholds for the current settings, re-resolved only when they change"""
+        key = (
+            tuple(self.enabled_channels),
+            self.min_priority_for_system,
+            self.min_priority_for_email,
+            self.min_priority_for_webhook,
+        )
+        cache = self._thresholds_cache
+        if cache is None or cache[0] != key:
+            cache = self._thresholds_cache = (key, _ChannelThresholds.resolve(self))
+        return cache[1]
+
+
+class _ChannelThresholds:
+    """Priority thresholds resolved from a NotificationConfig"""
+    __slots__ = ("by_channel", "enabled", "min_enabled")
+    
+    def __init__(self, by_channel: Dict[NotificationChannel, Priority],
+                 enabled_channels: List[NotificationChannel]):
+        self.by_channel = by_channel
+        # Threshold of every enabled channel, and the lowest of them: a message
+        # below that cannot reach any channel
+        self.enabled = {channel: by_channel.get(channel, Priority.LOW) for channel in enabled_channels}
+        self.min_enabled: Optional[Priority] = min(self.enabled.values(), default=None)
+    
+    @classmethod
+    def resolve(cls, config: NotificationConfig) -> "_ChannelThresholds":
+        return cls(
+            {
+                NotificationChannel.SYSTEM: Priority.coerce(config.min_priority_for_system, Priority.NORMAL),
+                NotificationChannel.EMAIL: Priority.coerce(config.min_priority_for_email, Priority.HIGH),
+                NotificationChannel.WEBHOOK: Priority.coerce(config.min_priority_for_webhook, Priority.NORMAL),
+            },
+            config.enabled_channels,
+        )
+
+
+@dataclass
+class _HistoryRecord:
+    """A tracked notification; slotted since up to _HISTORY_LIMIT are kept"""
+    __slots__ = ("timestamp", "title", "type", "priority", "success", "count", "last_updated")
+    timestamp: datetime
+    title: str
+    type: str
+    priority: Priority
+    success: bool
+    count: int
+    last_updated: Optional[datetime]
+
+
+class _LogSink:
+    """Append-only JSON-lines log file with coalesced writes
+    
+    Lines collect in a _LOG_BUFFER_SIZE buffer, so a burst of notifications
+    costs one write() per buffer instead of an open/write/close per entry.
+    The first line buffered after a flush arms a timer that flushes the
+    buffer _LOG_FLUSH_INTERVAL later; close() flushes and fsyncs it.
+    """
+    
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = open(path, 'ab', buffering=_LOG_BUFFER_SIZE)
+        self._lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+    
+    def write(self, line: bytes) -> None:
+        """Append one encoded line; raises ValueError once closed"""
+        with self._lock:
+            self._fh.write(line)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(_LOG_FLUSH_INTERVAL, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _timed_flush(self) -> None:
+        """Write out the lines buffered since the timer was armed"""
+        with self._lock:
+            self._flush_timer = None
+            if not self._fh.closed:
+                self._fh.flush()
+    
+    def close(self) -> None:
+        """Flush buffered lines to disk and close the file"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._fh.closed:
+                return
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+
+
+class _MacNotifier:
+    """Delivers macOS notifications in-process through NSUserNotificationCenter
+    
+    pync runs the terminal-notifier binary for every notification; talking
+    to the notification center directly avoids that fork/exec.
+    """
+    
+    _instance: Optional["_MacNotifier"] = None
+    _lock = threading.Lock()
+    
+    def __init__(self, center: Any):
+        self._center = center
+    
+    @classmethod
+    def get(cls) -> Optional["_MacNotifier"]:
+        """Return the shared notifier, or None when PyObjC cannot deliver"""
+        if not PYOBJC_AVAILABLE:
+            return None
+        with cls._lock:
+            if cls._instance is None:
+                # The default center is None outside an application bundle
+                center = NSUserNotificationCenter.defaultUserNotificationCenter()
+                if center is None:
+                    return None
+                cls._instance = cls(center)
+            return cls._instance
+    
+    def notify(self, title: str, text: str, sound: str) -> None:
+        """Deliver a single notification"""
+        notification = NSUserNotification.alloc().init()
+        notification.setTitle_(title)
+        notification.setInformativeText_(text)
+        notification.setSoundName_(sound)
+        self._center.deliverNotification_(notification)
 
 
 class NotificationManager:
@@ -85,53 +364,145 @@ class NotificationManager:
         self.config = config or self._get_default_config()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
-        # Ensure log directory exists if log channel is enabled
+        # Keep the log file open for the lifetime of the manager
+        self._log_sink: Optional[_LogSink] = None
         if NotificationChannel.LOG in self.config.enabled_channels and self.config.log_file:
-            log_path = Path(self.config.log_file)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_sink = _LogSink(Path(os.path.expanduser(self.config.log_file)))
+        
+        # Reuse one HTTP session so webhook calls keep their TCP/TLS connection
+        self._http = None
+        if (REQUESTS_AVAILABLE and self._webhook_targets()
+                and NotificationChannel.WEBHOOK in self.config.enabled_channels):
+            self._http = self._create_http_session()
+        
+        # Sender for each channel, bound once instead of an if/elif per message
+        self._dispatch_table: Dict[NotificationChannel, Callable[[NotificationMessage], bool]] = {
+            NotificationChannel.SYSTEM: self._send_system_notification,
+            NotificationChannel.EMAIL: self._send_email_notification,
+            NotificationChannel.WEBHOOK: self._send_webhook_notification,
+            NotificationChannel.LOG: self._send_log_notification,
+            NotificationChannel.CONSOLE: self._send_console_notification,
+        }
+        
+        # Worker threads for dispatching to several channels at once, and
+        # for posting to several webhook targets at once
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._webhook_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        
+        # Flush the log and close the HTTP session at exit, or once the manager
+        # is collected; idle pool workers exit along with their pool
+        self._finalizer = weakref.finalize(self, self._release, self._log_sink, self._http)
     
     def send_notification(self, message: NotificationMessage) -> bool:
-        """Send notification through configured channels"""
-        success = True
+        """Send notification through configured channels
         
-        for channel in message.channels:
-            if channel not in self.config.enabled_channels:
-                continue
-            
-            # Check priority threshold
-            if not self._check_priority_threshold(channel, message.priority):
-                continue
-            
-            try:
-                if channel == NotificationChannel.SYSTEM:
-                    success &= self._send_system_notification(message)
-                elif channel == NotificationChannel.EMAIL:
-                    success &= self._send_email_notification(message)
-                elif channel == NotificationChannel.WEBHOOK:
-                    success &= self._send_webhook_notification(message)
-                elif channel == NotificationChannel.LOG:
-                    success &= self._send_log_notification(message)
-                elif channel == NotificationChannel.CONSOLE:
-                    success &= self._send_console_notification(message)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to send notification via {channel.value}: {e}")
-                success = False
+        When more than one channel is selected they are dispatched
+        concurrently, so a slow channel (webhook, email) does not hold up
+        the others and the total latency is that of the slowest channel.
+        """
+        priority = message.priority
+        resolved = self.config._resolve_thresholds()
+        if resolved.min_enabled is None or priority < resolved.min_enabled:
+            return True  # Nothing to deliver
         
-        return success
+        thresholds = resolved.enabled
+        channels = [
+            channel for channel in message.channels
+            if channel in thresholds and priority >= thresholds[channel]
+        ]
+        
+        if len(channels) <= 1:
+            return all([self._dispatch(channel, message) for channel in channels])
+        
+        results = self._get_executor().map(lambda channel: self._dispatch(channel, message), channels)
+        return all(list(results))
+    
+    def close(self) -> None:
+        """Release the channel dispatch threads and flush the log file"""
+        with self._executor_lock:
+            executors, self._executor, self._webhook_executor = (
+                (self._executor, self._webhook_executor), None, None
+            )
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+        
+        self._http = None
+        self._finalizer()
+    
+    @staticmethod
+    def _release(log_sink: Optional[_LogSink], http: Optional["requests.Session"]) -> None:
+        """Close the resources opened in __init__; must not reference the manager"""
+        if http is not None:
+            http.close()
+        if log_sink is not None:
+            log_sink.close()
+    
+    @staticmethod
+    def _create_http_session() -> "requests.Session":
+        """Create the pooled session used for webhook requests"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=_HTTP_POOL_MAXSIZE,
+            max_retries=Retry(total=1, backoff_factor=0.1),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Content-Type": "application/json", "User-Agent": "mac-cleaner/1"})
+        return session
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the channel dispatch pool on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(NotificationChannel), thread_name_prefix="notification"
+                )
+            return self._executor
+    
+    def _get_webhook_executor(self) -> ThreadPoolExecutor:
+        """Create the webhook fan-out pool on first use
+        
+        Kept apart from the channel pool, whose workers wait on these posts.
+        """
+        with self._executor_lock:
+            if self._webhook_executor is None:
+                self._webhook_executor = ThreadPoolExecutor(
+                    max_workers=_HTTP_POOL_MAXSIZE, thread_name_prefix="webhook"
+                )
+            return self._webhook_executor
+    
+    def _webhook_targets(self) -> List[str]:
+        """Configured webhook URLs, without duplicates"""
+        return list(dict.fromkeys(filter(None, [self.config.webhook_url, *self.config.webhook_urls])))
+    
+    def _dispatch(self, channel: NotificationChannel, message: NotificationMessage) -> bool:
+        """Send a message through a single channel"""
+        send = self._dispatch_table.get(channel)
+        if send is None:
+            return True
+        
+        try:
+            return send(message)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to send notification via {channel.value}: {e}")
+            return False
     
     def notify_task_completion(self, result: TaskExecutionResult) -> bool:
         """Send notification for task completion"""
         if result.success:
             message = NotificationMessage(
                 title="macOS Cleaner - Task Completed",
-                message=f"Task '{result.task_name}' completed successfully.\n"
-                       f"Processed {result.paths_processed} paths, "
-                       f"freed {self._format_bytes(result.size_freed)}.\n"
-                       f"Duration: {result.duration_seconds:.1f} seconds.",
+                message=_LazyStr(lambda: f"Task '{result.task_name}' completed successfully.\n"
+                                        f"Processed {result.paths_processed} paths, "
+                                        f"freed {self._format_bytes(result.size_freed)}.\n"
+                                        f"Duration: {result.duration_seconds:.1f} seconds."),
                 notification_type=NotificationType.TASK_COMPLETED,
                 channels=[NotificationChannel.SYSTEM, NotificationChannel.LOG],
-                priority="normal",
+                priority=Priority.NORMAL,
                 data={
                     "task_id": result.task_id,
                     "task_name": result.task_name,
@@ -143,12 +514,12 @@ class NotificationManager:
         else:
             message = NotificationMessage(
                 title="macOS Cleaner - Task Failed",
-                message=f"Task '{result.task_name}' failed.\n"
-                       f"Error: {result.error_message}\n"
-                       f"Duration: {result.duration_seconds:.1f} seconds.",
+                message=_LazyStr(lambda: f"Task '{result.task_name}' failed.\n"
+                                        f"Error: {result.error_message}\n"
+                                        f"Duration: {result.duration_seconds:.1f} seconds."),
                 notification_type=NotificationType.TASK_FAILED,
                 channels=[NotificationChannel.SYSTEM, NotificationChannel.LOG],
-                priority="high",
+                priority=Priority.HIGH,
                 data={
                     "task_id": result.task_id,
                     "task_name": result.task_name,
@@ -163,12 +534,12 @@ class NotificationManager:
         """Send notification for low disk space"""
         message = NotificationMessage(
             title="macOS Cleaner - Disk Space Warning",
-            message=f"Disk space is running low.\n"
-                   f"Free space: {free_space_gb:.1f} GB ({usage_percent:.1f}% used)\n"
-                   f"Consider running a cleaning operation.",
+            message=_LazyStr(lambda: f"Disk space is running low.\n"
+                                    f"Free space: {free_space_gb:.1f} GB ({usage_percent:.1f}% used)\n"
+                                    f"Consider running a cleaning operation."),
             notification_type=NotificationType.SPACE_LOW,
             channels=[NotificationChannel.SYSTEM, NotificationChannel.EMAIL],
-            priority="high" if usage_percent > 90 else "normal",
+            priority=Priority.HIGH if usage_percent > 90 else Priority.NORMAL,
             data={
                 "free_space_gb": free_space_gb,
                 "usage_percent": usage_percent
@@ -181,10 +552,10 @@ class NotificationManager:
         """Send notification for system errors"""
         message = NotificationMessage(
             title="macOS Cleaner - System Error",
-            message=f"A system error occurred:\n{error_message}",
+            message=_LazyStr(lambda: f"A system error occurred:\n{error_message}"),
             notification_type=NotificationType.ERROR,
             channels=[NotificationChannel.SYSTEM, NotificationChannel.LOG],
-            priority="critical",
+            priority=Priority.CRITICAL,
             data=context or {}
         )
         
@@ -194,11 +565,11 @@ class NotificationManager:
         """Send notification for schedule changes"""
         message = NotificationMessage(
             title="macOS Cleaner - Schedule Updated",
-            message=f"Schedule for task '{task_name}' has been updated.\n"
-                   f"Change: {change_description}",
+            message=_LazyStr(lambda: f"Schedule for task '{task_name}' has been updated.\n"
+                                    f"Change: {change_description}"),
             notification_type=NotificationType.SCHEDULE_CHANGED,
             channels=[NotificationChannel.LOG],
-            priority="low",
+            priority=Priority.LOW,
             data={
                 "task_name": task_name,
                 "change_description": change_description
@@ -208,24 +579,27 @@ class NotificationManager:
         return self.send_notification(message)
     
     def _send_system_notification(self, message: NotificationMessage) -> bool:
-        """Send macOS system notification"""
-        if not PYNC_AVAILABLE:
+        """Send macOS system notification
+        
+        Uses the in-process notifier when PyObjC is available and falls back
+        to pync otherwise.
+        """
+        notifier = _MacNotifier.get()
+        if notifier is None and not PYNC_AVAILABLE:
             self.logger.warning("pync not available, cannot send system notification")
             return False
         
+        sound = _SOUND_BY_PRIORITY.get(message.priority, self.config.system_sound)
         try:
-            # Determine sound based on priority
-            sound = self.config.system_sound
-            if message.priority == "critical":
-                sound = "Basso"
-            elif message.priority == "high":
-                sound = "Sosumi"
+            if notifier is not None:
+                notifier.notify(message.title, str(message.message), sound)
+                return True
             
             pync.notify(
-                message.message,
+                str(message.message),
                 title=message.title,
                 sound=sound,
-                timeout=10 if message.priority in ["high", "critical"] else 5
+                timeout=10 if message.priority >= Priority.HIGH else 5
             )
             
             return True
@@ -254,7 +628,7 @@ class NotificationManager:
             ---
             Timestamp: {message.timestamp.isoformat()}
             Type: {message.notification_type.value}
-            Priority: {message.priority}
+            Priority: {message.priority.label}
             """
             
             # Log email would be sent (placeholder)
@@ -270,59 +644,74 @@ class NotificationManager:
             return False
     
     def _send_webhook_notification(self, message: NotificationMessage) -> bool:
-        """Send webhook notification"""
+        """Send webhook notification to every configured target
+        
+        The payload is encoded once; with several targets the posts run in
+        parallel, so the channel takes about one round trip in total.
+        """
         if not REQUESTS_AVAILABLE:
             self.logger.warning("requests not available, cannot send webhook")
             return False
         
-        if not self.config.webhook_url:
+        targets = self._webhook_targets()
+        if not targets or self._http is None:
             self.logger.warning("Webhook URL not configured")
             return False
         
         try:
             payload = {
                 "title": message.title,
-                "message": message.message,
-                "type": message.notification_type.value,
-                "priority": message.priority,
-                "timestamp": message.timestamp.isoformat(),
+                "message": str(message.message),
+                "type": _TYPE_VALUES[message.notification_type],
+                "priority": message.priority.label,
+                "timestamp": message.timestamp,
                 "data": message.data or {}
             }
             
-            response = requests.post(
-                self.config.webhook_url,
-                json=payload,
-                timeout=10,
-                headers={"Content-Type": "application/json"}
-            )
+            body = _dumps(payload)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to send webhook notification: {e}")
+            return False
+        
+        if len(targets) == 1:
+            return self._post_webhook(targets[0], body)
+        
+        results = self._get_webhook_executor().map(lambda url: self._post_webhook(url, body), targets)
+        return all(list(results))
+    
+    def _post_webhook(self, url: str, body: bytes) -> bool:
+        """POST an encoded webhook payload to a single target"""
+        try:
+            # Content-Type is set on the session
+            response = self._http.post(url, data=body, timeout=10)
             
             response.raise_for_status()
             
-            self.logger.info(f"Webhook notification sent successfully to {self.config.webhook_url}")
+            self.logger.info(f"Webhook notification sent successfully to {url}")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send webhook notification: {e}")
+            self.logger.error(f"Failed to send webhook notification to {url}: {e}")
             return False
     
     def _send_log_notification(self, message: NotificationMessage) -> bool:
         """Send notification to log file"""
-        if not self.config.log_file:
+        if self._log_sink is None:
             self.logger.warning("Log file not configured")
             return False
         
         try:
             log_entry = {
-                "timestamp": message.timestamp.isoformat(),
+                "timestamp": message.timestamp,
                 "title": message.title,
-                "message": message.message,
-                "type": message.notification_type.value,
-                "priority": message.priority,
+                "message": str(message.message),
+                "type": _TYPE_VALUES[message.notification_type],
+                "priority": message.priority.label,
                 "data": message.data
             }
             
-            with open(self.config.log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            self._log_sink.write(_dumps(log_entry, newline=True))
             
             return True
             
@@ -333,25 +722,16 @@ class NotificationManager:
     def _send_console_notification(self, message: NotificationMessage) -> bool:
         """Send notification to console"""
         try:
-            # Format based on priority
-            prefix = ""
-            if message.priority == "critical":
-                prefix = "🚨 "
-            elif message.priority == "high":
-                prefix = "⚠️ "
-            elif message.priority == "normal":
-                prefix = "ℹ️ "
-            else:
-                prefix = "💡 "
-            
-            console_message = f"{prefix}[{message.notification_type.value.upper()}] {message.title}: {message.message}"
-            
-            if message.priority in ["high", "critical"]:
-                self.logger.error(console_message)
-            elif message.priority == "normal":
-                self.logger.warning(console_message)
-            else:
-                self.logger.info(console_message)
+            # %-style arguments: the line is only built if the level is enabled
+            priority = message.priority
+            self.logger.log(
+                _CONSOLE_LEVEL[priority],
+                "%s[%s] %s: %s",
+                _CONSOLE_PREFIX[priority],
+                _TYPE_LABELS[message.notification_type],
+                message.title,
+                message.message,
+            )
             
             return True
             
@@ -359,21 +739,10 @@ class NotificationManager:
             self.logger.error(f"Failed to send console notification: {e}")
             return False
     
-    def _check_priority_threshold(self, channel: NotificationChannel, priority: str) -> bool:
+    def _check_priority_threshold(self, channel: NotificationChannel, priority: Priority) -> bool:
         """Check if message priority meets channel threshold"""
-        priority_levels = {"low": 0, "normal": 1, "high": 2, "critical": 3}
-        message_level = priority_levels.get(priority, 1)
-        
-        if channel == NotificationChannel.SYSTEM:
-            threshold_level = priority_levels.get(self.config.min_priority_for_system, 1)
-        elif channel == NotificationChannel.EMAIL:
-            threshold_level = priority_levels.get(self.config.min_priority_for_email, 2)
-        elif channel == NotificationChannel.WEBHOOK:
-            threshold_level = priority_levels.get(self.config.min_priority_for_webhook, 1)
-        else:
-            return True  # No threshold for other channels
-        
-        return message_level >= threshold_level
+        # Channels without a threshold accept everything
+        return priority >= self.config.priority_thresholds.get(channel, Priority.LOW)
     
     def _get_default_config(self) -> NotificationConfig:
         """Get default notification configuration"""
@@ -390,13 +759,14 @@ class NotificationManager:
             min_priority_for_webhook="normal"
         )
     
-    def _format_bytes(self, bytes_count: int) -> str:
+    @staticmethod
+    def _format_bytes(bytes_count: int) -> str:
         """Format bytes into human readable string"""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if bytes_count < 1024.0:
-                return f"{bytes_count:.1f} {unit}"
-            bytes_count /= 1024.0
-        return f"{bytes_count:.1f} PB"
+        if bytes_count < 1024:
+            return f"{bytes_count:.1f} B"
+        # Each unit is 2**10 of the previous one, so the bit length picks it directly
+        unit_index = min((int(bytes_count).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_count / (1 << (10 * unit_index)):.1f} {_BYTE_UNITS[unit_index]}"
 
 
 class SmartNotificationManager:
@@ -407,168 +777,298 @@ class SmartNotificationManager:
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
         # Notification history and user preferences
-        self.notification_history: List[Dict[str, Any]] = []
+        self.notification_history: Deque[_HistoryRecord] = deque(maxlen=_HISTORY_LIMIT)
         self.user_preferences: Dict[str, Any] = {
             "quiet_hours": {"start": 22, "end": 8},  # 10 PM to 8 AM
             "max_notifications_per_hour": 5,
             "consolidate_similar": True,
-            "learning_enabled": True
+            "learning_enabled": True,
+            # Bursts of one notification type within this many seconds are
+            # delivered as a single message; 0 sends immediately
+            "debounce_seconds": 0
         }
         
-        # Rate limiting
-        self.recent_notifications: List[datetime] = []
+        # Rate limiting; time.monotonic() send times in chronological order
+        self.recent_notifications: Deque[float] = deque()
+        
+        # Latest history record per (type, title), for consolidation
+        self._recent_index: Dict[Tuple[str, str], _HistoryRecord] = {}
+        
+        # Serialises access to the history, rate-limit and stats state for
+        # callers on several threads; the guarded sections are short
+        self._lock = threading.Lock()
+        
+        # Stats over notification_history, kept current as records come and go
+        self._type_counts: Counter = Counter()
+        self._priority_counts: Counter = Counter()
+        self._recent_stats: Deque[float] = deque(maxlen=_HISTORY_LIMIT)
+        
+        # Debounced notifications waiting for the flush timer, per type
+        self._pending: Dict[NotificationType, List[NotificationMessage]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
     
     def send_smart_notification(self, message: NotificationMessage) -> bool:
         """Send notification with smart filtering"""
+        # Read the clocks once; every check below works from these values
+        now = datetime.now()
+        now_mono = time.monotonic()
+        
         # Check if we should send this notification
-        if not self._should_send_notification(message):
+        if not self._should_send_notification(message, now):
             return True  # Consider it successful (filtered)
         
         # Check quiet hours
-        if self._is_quiet_hours() and message.priority not in ["high", "critical"]:
+        if self._is_quiet_hours(now) and message.priority < Priority.HIGH:
             self.logger.info("Notification suppressed due to quiet hours")
             return True
         
         # Check rate limiting
-        if self._is_rate_limited():
+        if self._is_rate_limited(now_mono):
             self.logger.info("Notification suppressed due to rate limiting")
             return True
         
         # Try to consolidate with recent similar notifications
         if self.user_preferences["consolidate_similar"]:
-            consolidated = self._try_consolidate(message)
+            consolidated = self._try_consolidate(message, now)
             if consolidated:
                 return True
         
+        # Hold non-critical notifications briefly so bursts go out together
+        delay = self.user_preferences["debounce_seconds"]
+        if delay > 0 and message.priority < Priority.CRITICAL:
+            self._defer(message, delay)
+            return True
+        
+        return self._deliver(message, now, now_mono)
+    
+    def flush(self) -> bool:
+        """Deliver pending debounced notifications now, one per type"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        
+        now = datetime.now()
+        now_mono = time.monotonic()
+        success = True
+        for messages in pending.values():
+            success &= self._deliver(self._merge(messages), now, now_mono)
+        return success
+    
+    def _deliver(self, message: NotificationMessage, now: datetime, now_mono: float) -> bool:
+        """Send a notification through the base manager and track it"""
         # Send the notification
         success = self.base_manager.send_notification(message)
         
         # Track the notification
-        self._track_notification(message, success)
+        self._track_notification(message, success, now, now_mono)
         
         return success
     
-    def _should_send_notification(self, message: NotificationMessage) -> bool:
-        """Determine if notification should be sent based on learning"""
-        if not self.user_preferences["learning_enabled"]:
-            return True
+    def _defer(self, message: NotificationMessage, delay: float) -> None:
+        """Queue a notification until the flush timer fires
         
-        # Simple learning: if similar notifications were recently ignored, reduce priority
-        recent_similar = [
-            n for n in self.notification_history[-20:]  # Last 20 notifications
-            if n["type"] == message.notification_type.value
-            and n["timestamp"] > datetime.now() - timedelta(hours=1)
-        ]
+        The timer starts with the first pending notification and is not
+        pushed back by later ones, so a steady stream is still delivered
+        every ``delay`` seconds.
+        """
+        with self._lock:
+            self._pending.setdefault(message.notification_type, []).append(message)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(delay, self._timed_flush)
+                self._flush_timer.start()
+    
+    def _timed_flush(self) -> None:
+        """Flush from the debounce timer, logging what the caller cannot see"""
+        try:
+            if not self.flush():
+                self.logger.warning("Failed to deliver debounced notifications")
+        except Exception as e:
+            self.logger.error(f"Error delivering debounced notifications: {e}")
+    
+    @staticmethod
+    def _merge(messages: List[NotificationMessage]) -> NotificationMessage:
+        """Combine notifications of one type into a single message"""
+        if len(messages) == 1:
+            return messages[0]
         
-        if len(recent_similar) > 3:
-            # Too many similar notifications recently, suppress
-            return False
+        first = messages[0]
+        title = first.title
+        if any(message.title != title for message in messages):
+            title = f"{title} (+{len(messages) - 1} more)"
         
-        return True
+        return NotificationMessage(
+            title=title,
+            message=_LazyStr(lambda: "\n\n".join(str(message.message) for message in messages)),
+            notification_type=first.notification_type,
+            channels=list(dict.fromkeys(c for message in messages for c in message.channels)),
+            priority=max(message.priority for message in messages),
+            data=SmartNotificationManager._merge_data(messages),
+            timestamp=first.timestamp
+        )
+    
+    @staticmethod
+    def _merge_data(messages: List[NotificationMessage]) -> Dict[str, Any]:
+        """Combine the data of merged notifications under the same keys, plus a count"""
+        data: Dict[str, Any] = {}
+        joined: Dict[str, List[str]] = {}
+        for message in messages:
+            for key, value in (message.data or {}).items():
+                if key in _JOINED_DATA_KEYS:
+                    data.setdefault(key, None)
+                    if value is not None:
+                        joined.setdefault(key, []).append(str(value))
+                elif key in _SUMMED_DATA_KEYS and data.get(key) is not None and value is not None:
+                    data[key] += value
+                else:
+                    data[key] = value
+        
+        for key, values in joined.items():
+            data[key] = ", ".join(dict.fromkeys(values))
+        data["count"] = len(messages)
+        return data
     
-    def _is_quiet_hours(self) -> bool:
+    def _should_send_notification(self, message: NotificationMessage, now: datetime) -> bool:
+        """Determine if notification should be sent based on learning"""
+        with self._lock:
+            if not self.user_preferences["learning_enabled"]:
+                return True
+            
+            # Simple learning: if similar notifications were recently ignored, reduce priority
+            one_hour_ago = now - timedelta(hours=1)
+            notification_type = _TYPE_VALUES[message.notification_type]
+            recent_similar = [
+                n for n in islice(reversed(self.notification_history), 20)  # Last 20 notifications
+                if n.type == notification_type
+                and n.timestamp > one_hour_ago
+            ]
+            
+            if len(recent_similar) > 3:
+                # Too many similar notifications recently, suppress
+                return False
+            
+            return True
+    
+    def _is_quiet_hours(self, now: datetime) -> bool:
         """Check if current time is during quiet hours"""
-        now = datetime.now().hour
+        hour = now.hour
         quiet_start = self.user_preferences["quiet_hours"]["start"]
         quiet_end = self.user_preferences["quiet_hours"]["end"]
         
         if quiet_start > quiet_end:
             # Overnight quiet hours (e.g., 22:00 to 08:00)
-            return now >= quiet_start or now < quiet_end
+            return hour >= quiet_start or hour < quiet_end
         else:
             # Same day quiet hours
-            return quiet_start <= now < quiet_end
+            return quiet_start <= hour < quiet_end
     
-    def _is_rate_limited(self) -> bool:
+    def _is_rate_limited(self, now_mono: float) -> bool:
         """Check if we're rate limited"""
-        now = datetime.now()
-        one_hour_ago = now - timedelta(hours=1)
-        
-        # Clean old notifications
-        self.recent_notifications = [
-            n for n in self.recent_notifications if n > one_hour_ago
-        ]
-        
-        # Check limit
-        max_per_hour = self.user_preferences["max_notifications_per_hour"]
-        return len(self.recent_notifications) >= max_per_hour
+        with self._lock:
+            # Monotonic time is immune to wall-clock changes and needs no timedelta
+            one_hour_ago = now_mono - _RATE_LIMIT_WINDOW
+            
+            # Clean old notifications; they are all at the left end
+            recent = self.recent_notifications
+            while recent and recent[0] <= one_hour_ago:
+                recent.popleft()
+            
+            # Check limit
+            max_per_hour = self.user_preferences["max_notifications_per_hour"]
+            return len(self.recent_notifications) >= max_per_hour
     
-    def _try_consolidate(self, message: NotificationMessage) -> bool:
+    def _try_consolidate(self, message: NotificationMessage, now: datetime) -> bool:
         """Try to consolidate with recent similar notifications"""
-        # Look for similar notifications in the last 5 minutes
-        five_minutes_ago = datetime.now() - timedelta(minutes=5)
-        
-        for notification in reversed(self.notification_history):
-            if (notification["timestamp"] > five_minutes_ago and
-                notification["type"] == message.notification_type.value and
-                notification["title"] == message.title):
-                
-                # Found similar notification, update it instead of sending new one
-                notification["count"] = notification.get("count", 1) + 1
-                notification["last_updated"] = datetime.now()
-                
-                self.logger.info(f"Consolidated notification: {message.title} (count: {notification['count']})")
-                return True
-        
-        return False
+        with self._lock:
+            # Look for similar notifications in the last 5 minutes
+            five_minutes_ago = now - timedelta(minutes=5)
+            
+            # Only the latest record of a (type, title) pair can be recent enough
+            key = (_TYPE_VALUES[message.notification_type], message.title)
+            notification = self._recent_index.get(key)
+            if notification is None:
+                return False
+            
+            if notification.timestamp <= five_minutes_ago:
+                del self._recent_index[key]
+                return False
+            
+            # Found similar notification, update it instead of sending new one
+            notification.count += 1
+            notification.last_updated = now
+            
+            self.logger.info(f"Consolidated notification: {message.title} (count: {notification.count})")
+            return True
     
-    def _track_notification(self, message: NotificationMessage, success: bool) -> bool:
+    def _track_notification(self, message: NotificationMessage, success: bool,
+                            now: datetime, now_mono: float) -> bool:
         """Track notification for learning"""
-        self.recent_notifications.append(datetime.now())
-        
-        notification_record = {
-            "timestamp": datetime.now(),
-            "title": message.title,
-            "type": message.notification_type.value,
-            "priority": message.priority,
-            "channels": [c.value for c in message.channels],
-            "success": success,
-            "count": 1
-        }
-        
-        self.notification_history.append(notification_record)
-        
-        # Keep only last 1000 notifications
-        if len(self.notification_history) > 1000:
-            self.notification_history = self.notification_history[-1000:]
-        
-        return success
+        with self._lock:
+            self.recent_notifications.append(now_mono)
+            
+            notification_record = _HistoryRecord(
+                timestamp=now,
+                title=message.title,
+                type=_TYPE_VALUES[message.notification_type],
+                priority=message.priority,
+                success=success,
+                count=1,
+                last_updated=None
+            )
+            
+            # The deque drops the oldest record once _HISTORY_LIMIT is reached
+            if len(self.notification_history) == _HISTORY_LIMIT:
+                self._forget_stats(self.notification_history[0])
+            self.notification_history.append(notification_record)
+            self._type_counts[notification_record.type] += 1
+            self._priority_counts[notification_record.priority.label] += 1
+            self._recent_stats.append(now_mono)
+            
+            self._recent_index[(notification_record.type, notification_record.title)] = notification_record
+            if len(self._recent_index) > _HISTORY_LIMIT:
+                # Forget pairs that can no longer be consolidated
+                five_minutes_ago = now - timedelta(minutes=5)
+                self._recent_index = {
+                    key: record for key, record in self._recent_index.items()
+                    if record.timestamp > five_minutes_ago
+                }
+            
+            return success
+    
+    def _forget_stats(self, record: _HistoryRecord) -> None:
+        """Remove a record that is leaving the history from the stats counters"""
+        for counts, key in ((self._type_counts, record.type),
+                            (self._priority_counts, record.priority.label)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
     
     def update_preferences(self, preferences: Dict[str, Any]) -> None:
         """Update user preferences"""
-        self.user_preferences.update(preferences)
-        self.logger.info(f"Updated notification preferences: {preferences}")
+        with self._lock:
+            self.user_preferences.update(preferences)
+            self.logger.info(f"Updated notification preferences: {preferences}")
     
     def get_notification_stats(self) -> Dict[str, Any]:
         """Get notification statistics"""
-        total_notifications = len(self.notification_history)
-        
-        if total_notifications == 0:
-            return {"total": 0}
-        
-        # Stats by type
-        type_counts = {}
-        for notification in self.notification_history:
-            notification_type = notification["type"]
-            type_counts[notification_type] = type_counts.get(notification_type, 0) + 1
-        
-        # Stats by priority
-        priority_counts = {}
-        for notification in self.notification_history:
-            priority = notification["priority"]
-            priority_counts[priority] = priority_counts.get(priority, 0) + 1
-        
-        # Recent activity (last 24 hours)
-        one_day_ago = datetime.now() - timedelta(days=1)
-        recent_count = sum(
-            1 for n in self.notification_history 
-            if n["timestamp"] > one_day_ago
-        )
-        
-        return {
-            "total": total_notifications,
-            "recent_24h": recent_count,
-            "by_type": type_counts,
-            "by_priority": priority_counts,
-            "preferences": self.user_preferences
-        }
+        with self._lock:
+            total_notifications = len(self.notification_history)
+            
+            if total_notifications == 0:
+                return {"total": 0}
+            
+            # Recent activity (last 24 hours); the send times share the history's
+            # maxlen, so they cover exactly the records still in the history
+            one_day_ago = time.monotonic() - _RECENT_STATS_WINDOW
+            recent = self._recent_stats
+            while recent and recent[0] <= one_day_ago:
+                recent.popleft()
+            
+            return {
+                "total": total_notifications,
+                "recent_24h": len(recent),
+                "by_type": dict(self._type_counts),
+                "by_priority": dict(self._priority_counts),
+                "preferences": self.user_preferences
+            }
@@ -7,28 +7,180 @@ Licensed under the MIT License
 """
 
 import asyncio
+import atexit
+import heapq
 import logging
+import os
+import re
+import sys
 import threading
-from datetime import datetime, timedelta, time as dt_time
-from typing import Dict, List, Any, Optional, Callable
-from dataclasses import dataclass, field
+import time
+import weakref
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, time as dt_time
+from itertools import islice
+from typing import Deque, Dict, List, Any, Optional, Callable, Tuple
+from dataclasses import dataclass, field, fields
 from enum import Enum
+from functools import lru_cache
 import json
 from pathlib import Path
 
 try:
-    from apscheduler.schedulers.background import BackgroundScheduler
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
     from apscheduler.triggers.cron import CronTrigger
     from apscheduler.triggers.interval import IntervalTrigger
     from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+    from apscheduler.jobstores.base import JobLookupError
     APSCHEDULER_AVAILABLE = True
 except ImportError:
     APSCHEDULER_AVAILABLE = False
 
 from ..interfaces import ConfigInterface
-from .analytics import UsageAnalytics, UsageEvent
+from .analytics import UsageAnalytics, UsageEvent, SpaceUsageSnapshot
 from .async_plugin_manager import AsyncPluginExecutor, SmartPluginScheduler
 
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Minimum seconds between two writes of the task/history files
+_SAVE_INTERVAL = 1.0
+
+# Schedulers whose pending saves are written when the interpreter exits
+_LIVE_SCHEDULERS: "weakref.WeakSet[SmartScheduler]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_schedulers() -> None:
+    """Write saves still waiting on a coalescing timer before exit"""
+    for scheduler in list(_LIVE_SCHEDULERS):
+        scheduler.flush()
+
+
+# Execution results kept in memory; the history log is compacted back to
+# this many lines once it grows to twice the size
+_HISTORY_LIMIT = 1000
+
+# Window for the recent execution statistics in get_scheduler_status, seconds
+_RECENT_WINDOW = 7 * 86400.0
+
+# Seconds stop() waits for runs in progress before cancelling them, and
+# then for the cancelled runs to unwind
+_STOP_TIMEOUT = 30.0
+_CANCEL_GRACE = 1.0
+
+# Threads running task callbacks, so a slow callback does not hold up runs
+_CALLBACK_WORKERS = 4
+
+# Task runs finishing within this many seconds of the last disk space
+# snapshot reuse it instead of recording another one
+_SNAPSHOT_TTL = 5.0
+
+# Naive ISO timestamps as written by isoformat()/orjson
+_ISO_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?$')
+
+
+@lru_cache(maxsize=4096)
+def _iso(value: Any) -> str:
+    """isoformat() of a datetime or time, cached
+    
+    Tasks keep the same created_at/last_run/specific_time across saves and
+    compaction rewrites the same results, so most timestamps are formatted
+    once. Only the stdlib json path needs this; orjson formats them itself.
+    """
+    return value.isoformat()
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode values JSON has no type for (datetimes, enums, dataclasses, ...)"""
+    if isinstance(obj, (datetime, dt_time)):
+        return _iso(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, "__dataclass_fields__"):
+        return {name: getattr(obj, name) for name in obj.__dataclass_fields__}
+    return str(obj)
+
+
+def _dumps(obj: Any, line: bool = False) -> bytes:
+    """Encode scheduler state as indented JSON, using orjson when it is installed
+    
+    With line=True the object is encoded compactly on one newline-terminated
+    line, for the JSON-Lines history log. orjson serializes dataclasses,
+    enums, datetimes and times natively in the same ISO format as
+    isoformat(), so tasks and results are passed as-is.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_APPEND_NEWLINE if line else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_json_default, option=option)
+    if line:
+        return (json.dumps(obj, default=_json_default) + "\n").encode()
+    return json.dumps(obj, default=_json_default, indent=2).encode()
+
+
+@lru_cache(maxsize=256)
+def _cron_trigger(**fields: Any) -> "CronTrigger":
+    """CronTrigger for the given fields, shared between tasks with the same schedule
+    
+    Triggers are not mutated once built, so tasks on the default daily or
+    weekly schedule reuse a single parsed trigger.
+    """
+    return CronTrigger(**fields)
+
+
+def _fast_iso(value: str) -> datetime:
+    """Parse a stored timestamp, skipping fromisoformat for the common shape"""
+    m = _ISO_RE.match(value)
+    if not m:
+        return datetime.fromisoformat(value)
+    
+    year, month, day, hour, minute, second, fraction = m.groups()
+    return datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        int(fraction.ljust(6, '0')) if fraction else 0
+    )
+
+
+@lru_cache(maxsize=1024)
+def _parse_time(value: str) -> dt_time:
+    """Parse a stored time of day; tasks mostly share a handful of them"""
+    return dt_time.fromisoformat(value)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace path with data so readers see either the old or the new file
+    
+    The bytes go to a temp file in the same directory, are fsynced, then
+    renamed over the target.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _loads(data: bytes) -> Any:
+    """Decode scheduler state, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class ScheduleType(Enum):
     """Types of scheduling"""
@@ -40,7 +192,7 @@ class ScheduleType(Enum):
     SMART = "smart"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ScheduledTask:
     """Represents a scheduled cleaning task"""
     id: str
@@ -72,7 +224,7 @@ class ScheduledTask:
     target_disk_usage_percent: float = 80.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class TaskExecutionResult:
     """Result of a scheduled task execution"""
     task_id: str
@@ -86,6 +238,16 @@ class TaskExecutionResult:
     details: Optional[Dict[str, Any]] = None
 
 
+# Stored schedule_type strings to enum members, a plain dict lookup
+# instead of going through ScheduleType(value)
+_SCHEDULE_TYPES = {st.value: st for st in ScheduleType}
+
+# Field names accepted by the constructors; keys written by other versions
+# of the scheduler are dropped on load instead of failing the whole file
+_TASK_FIELDS = frozenset(f.name for f in fields(ScheduledTask))
+_RESULT_FIELDS = frozenset(f.name for f in fields(TaskExecutionResult))
+
+
 class SmartScheduler:
     """Smart scheduler for automated cleaning operations"""
     
@@ -101,29 +263,63 @@ class SmartScheduler:
         self.async_executor = AsyncPluginExecutor()
         self.smart_plugin_scheduler = SmartPluginScheduler(self.async_executor)
         
-        # Scheduler setup
-        if APSCHEDULER_AVAILABLE:
-            self.scheduler = BackgroundScheduler()
-            self.scheduler.add_listener(self._job_executed, EVENT_JOB_EXECUTED)
-            self.scheduler.add_listener(self._job_error, EVENT_JOB_ERROR)
-        else:
-            self.scheduler = None
+        # Scheduler setup; the AsyncIOScheduler is created by start() on the
+        # event loop it runs jobs on, owned by a daemon thread
+        self.scheduler = None
+        if not APSCHEDULER_AVAILABLE:
             self.logger.warning("APScheduler not available, limited scheduling functionality")
         
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        
+        # Monotonic time of the last disk space snapshot
+        self._last_snapshot: Optional[float] = None
+        
         # Task management
         self.tasks: Dict[str, ScheduledTask] = {}
-        self.execution_history: List[TaskExecutionResult] = []
+        # Execution history is read from disk on first use, see execution_history
+        self._execution_history: Deque[TaskExecutionResult] = deque(maxlen=_HISTORY_LIMIT)
+        self._history_loaded = False
+        self._history_load_lock = threading.Lock()
+        
+        # Running counters so status polling does not rescan tasks/history;
+        # _recent_expiry holds (expiry epoch, success) per recent result and
+        # _evicted_expiry the entries already uncounted when the history
+        # deque dropped their result
+        self._enabled_count = 0
+        self._recent_expiry: List[Tuple[float, bool]] = []
+        self._evicted_expiry: Counter = Counter()
+        self._recent_total = 0
+        self._recent_success = 0
+        self._stats_lock = threading.Lock()
+        
+        # (next run time, task id) per scheduled job, for next_task_eta();
+        # entries whose job moved or went away are dropped when reached
+        self._next_run_heap: List[Tuple[datetime, str]] = []
         
         # Data files
         self.tasks_file = self.data_dir / "scheduled_tasks.json"
-        self.history_file = self.data_dir / "execution_history.json"
+        self.history_file = self.data_dir / "execution_history.jsonl"
+        self._legacy_history_file = self.data_dir / "execution_history.json"
+        
+        # Coalesced saves: mutations mark state dirty, flush() does the I/O
+        self._tasks_dirty = False
+        self._history_dirty = False
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._last_flush = 0.0
+        self._pending_history: List[bytes] = []
+        self._last_tasks_data: Optional[bytes] = None
+        self._history_lines = 0
+        _LIVE_SCHEDULERS.add(self)
         
         # Event callbacks
         self.task_callbacks: List[Callable[[TaskExecutionResult], None]] = []
+        self._callback_lock = threading.Lock()
+        self._callback_pool: Optional[ThreadPoolExecutor] = None
         
         # Load existing data
         self._load_tasks()
-        self._load_history()
         
         # Status
         self.running = False
@@ -139,6 +335,10 @@ class SmartScheduler:
             return False
         
         try:
+            self._start_loop()
+            self.scheduler = AsyncIOScheduler(event_loop=self._loop)
+            self.scheduler.add_listener(self._job_executed, EVENT_JOB_EXECUTED)
+            self.scheduler.add_listener(self._job_error, EVENT_JOB_ERROR)
             self.scheduler.start()
             self.running = True
             
@@ -147,22 +347,35 @@ class SmartScheduler:
                 if task.enabled:
                     self._schedule_task(task)
             
+            # Warm the next-run lookahead from the jobs just added
+            next_runs = [(job.next_run_time, job.id) for job in self.scheduler.get_jobs()
+                         if job.next_run_time is not None]
+            heapq.heapify(next_runs)
+            with self._stats_lock:
+                self._next_run_heap = next_runs
+            
             self.logger.info("Smart scheduler started successfully")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to start scheduler: {e}")
+            self.scheduler = None
+            self._stop_loop()
             return False
     
     def stop(self) -> bool:
         """Stop the scheduler"""
         if not self.running:
             self.logger.warning("Scheduler is not running")
+            self._close_callback_pool()
+            self.flush()
             return True
         
         try:
             if self.scheduler:
-                self.scheduler.shutdown(wait=True)
+                self.scheduler.shutdown(wait=False)
+                self.scheduler = None
+            self._stop_loop()
             self.running = False
             self.logger.info("Smart scheduler stopped")
             return True
@@ -170,6 +383,27 @@ class SmartScheduler:
         except Exception as e:
             self.logger.error(f"Failed to stop scheduler: {e}")
             return False
+        
+        finally:
+            self._close_callback_pool()
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write pending task and history changes to disk"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            tasks_dirty, self._tasks_dirty = self._tasks_dirty, False
+            history_dirty, self._history_dirty = self._history_dirty, False
+            self._last_flush = time.monotonic()
+            
+            # A failed write leaves the state dirty for the next flush
+            if tasks_dirty and not self._flush_tasks():
+                self._tasks_dirty = True
+            if history_dirty and not self._flush_history():
+                self._history_dirty = True
     
     def add_task(self, task: ScheduledTask) -> bool:
         """Add a new scheduled task"""
@@ -179,6 +413,8 @@ class SmartScheduler:
                 return False
             
             # Add to tasks
+            previous = self.tasks.get(task.id)
+            self._enabled_count += task.enabled - (previous.enabled if previous else 0)
             self.tasks[task.id] = task
             
             # Schedule if enabled and scheduler is running
@@ -203,12 +439,11 @@ class SmartScheduler:
         
         try:
             # Remove from scheduler
-            if self.scheduler:
-                self.scheduler.remove_job(task_id)
+            self._unschedule_task(task_id)
             
             # Remove from tasks
             task_name = self.tasks[task_id].name
-            del self.tasks[task_id]
+            self._enabled_count -= self.tasks.pop(task_id).enabled
             
             # Save
             self._save_tasks()
@@ -226,6 +461,7 @@ class SmartScheduler:
             return False
         
         task = self.tasks[task_id]
+        self._enabled_count += not task.enabled
         task.enabled = True
         
         if self.running:
@@ -240,13 +476,10 @@ class SmartScheduler:
             return False
         
         task = self.tasks[task_id]
+        self._enabled_count -= task.enabled
         task.enabled = False
         
-        if self.scheduler:
-            try:
-                self.scheduler.remove_job(task_id)
-            except:
-                pass  # Job might not exist
+        self._unschedule_task(task_id)
         
         self._save_tasks()
         return True
@@ -259,9 +492,15 @@ class SmartScheduler:
         """Get a specific task"""
         return self.tasks.get(task_id)
     
+    @property
+    def execution_history(self) -> Deque[TaskExecutionResult]:
+        """Recent execution results, oldest first, loaded on first access"""
+        self._ensure_history_loaded()
+        return self._execution_history
+    
     def get_execution_history(self, limit: int = 100) -> List[TaskExecutionResult]:
         """Get execution history"""
-        return self.execution_history[-limit:]
+        return list(islice(reversed(self.execution_history), limit))[::-1]
     
     async def run_task_now(self, task_id: str) -> TaskExecutionResult:
         """Run a task immediately"""
@@ -288,116 +527,119 @@ class SmartScheduler:
                 paths=task.paths,
                 dry_run=task.dry_run
             )
-            
-            # Create execution result
-            execution_result = TaskExecutionResult(
-                task_id=task.id,
-                task_name=task.name,
-                execution_time=start_time,
-                success=True,
-                duration_seconds=result["summary"]["overall_duration_ms"] / 1000.0,
-                paths_processed=result["summary"]["total_paths_processed"],
-                size_freed=result["summary"]["total_size_processed"],
-                details=result
-            )
-            
-            # Update task statistics
-            task.last_run = start_time
-            task.run_count += 1
-            task.success_count += 1
-            
-            # Record usage event
-            usage_event = UsageEvent(
-                timestamp=start_time,
-                operation_type="scheduled_clean",
-                paths_processed=execution_result.paths_processed,
-                size_processed=execution_result.size_freed,
-                duration_seconds=execution_result.duration_seconds,
-                categories=task.categories,
-                success=True
-            )
-            self.analytics.record_event(usage_event)
-            
-            # Record space snapshot
-            await self._record_space_snapshot()
-            
-            # Auto-adjust smart tasks
-            if task.schedule_type == ScheduleType.SMART and task.auto_adjust:
-                await self._auto_adjust_smart_task(task)
-            
-            # Save and notify
-            self._save_tasks()
-            self._save_history()
-            self._notify_callbacks(execution_result)
-            
-            self.logger.info(f"Task completed successfully: {task.name}")
-            return execution_result
+            summary = result["summary"]
+            duration_seconds = summary["overall_duration_ms"] / 1000.0
+            paths_processed = summary["total_paths_processed"]
+            size_freed = summary["total_size_processed"]
             
         except Exception as e:
-            # Create error result
-            execution_result = TaskExecutionResult(
-                task_id=task.id,
-                task_name=task.name,
-                execution_time=start_time,
-                success=False,
-                duration_seconds=(datetime.now() - start_time).total_seconds(),
-                paths_processed=0,
-                size_freed=0,
-                error_message=str(e)
-            )
-            
-            # Update task statistics
-            task.last_run = start_time
-            task.run_count += 1
-            task.error_count += 1
-            task.last_error = str(e)
-            
-            # Record usage event
-            usage_event = UsageEvent(
-                timestamp=start_time,
-                operation_type="scheduled_clean",
-                paths_processed=0,
-                size_processed=0,
-                duration_seconds=execution_result.duration_seconds,
-                categories=task.categories,
-                success=False,
-                error_message=str(e)
-            )
-            self.analytics.record_event(usage_event)
-            
-            # Save and notify
-            self._save_tasks()
-            self._save_history()
-            self._notify_callbacks(execution_result)
-            
+            duration_seconds = (datetime.now() - start_time).total_seconds()
+            execution_result = self._finalize(task, start_time, duration_seconds, error=e)
             self.logger.error(f"Task failed: {task.name} - {e}")
             return execution_result
+        
+        # Record space snapshot
+        await self._record_space_snapshot()
+        
+        # Auto-adjust smart tasks
+        if task.schedule_type == ScheduleType.SMART and task.auto_adjust:
+            await self._auto_adjust_smart_task(task)
+        
+        execution_result = self._finalize(
+            task, start_time, duration_seconds, paths_processed, size_freed, details=result
+        )
+        self.logger.info(f"Task completed successfully: {task.name}")
+        return execution_result
+    
+    def _finalize(self, task: ScheduledTask, start_time: datetime, duration_seconds: float,
+                  paths_processed: int = 0, size_freed: int = 0,
+                  details: Optional[Dict[str, Any]] = None,
+                  error: Optional[Exception] = None) -> TaskExecutionResult:
+        """Record the outcome of a task run: result, task statistics, usage event"""
+        success = error is None
+        error_message = None if success else str(error)
+        
+        execution_result = TaskExecutionResult(
+            task_id=task.id,
+            task_name=task.name,
+            execution_time=start_time,
+            success=success,
+            duration_seconds=duration_seconds,
+            paths_processed=paths_processed,
+            size_freed=size_freed,
+            error_message=error_message,
+            details=details
+        )
+        
+        # Update task statistics
+        task.last_run = start_time
+        task.run_count += 1
+        if success:
+            task.success_count += 1
+        else:
+            task.error_count += 1
+            task.last_error = error_message
+        
+        # Record usage event
+        usage_event = UsageEvent(
+            timestamp=start_time,
+            operation_type="scheduled_clean",
+            paths_processed=paths_processed,
+            size_processed=size_freed,
+            duration_seconds=duration_seconds,
+            categories=task.categories,
+            success=success,
+            error_message=error_message
+        )
+        self.analytics.record_event(usage_event)
+        
+        # Save and notify
+        self._save_tasks()
+        self._record_result(execution_result)
+        self._notify_callbacks(execution_result)
+        return execution_result
     
     def add_task_callback(self, callback: Callable[[TaskExecutionResult], None]) -> None:
         """Add a callback for task execution results"""
-        self.task_callbacks.append(callback)
+        with self._callback_lock:
+            self.task_callbacks.append(callback)
     
     def remove_task_callback(self, callback: Callable[[TaskExecutionResult], None]) -> None:
         """Remove a task callback"""
-        if callback in self.task_callbacks:
-            self.task_callbacks.remove(callback)
+        with self._callback_lock:
+            if callback in self.task_callbacks:
+                self.task_callbacks.remove(callback)
     
     def get_scheduler_status(self) -> Dict[str, Any]:
         """Get scheduler status and statistics"""
+        self._ensure_history_loaded()
         total_tasks = len(self.tasks)
-        enabled_tasks = sum(1 for t in self.tasks.values() if t.enabled)
+        enabled_tasks = self._enabled_count
         
-        # Recent execution statistics
-        recent_history = [h for h in self.execution_history 
-                         if h.execution_time > datetime.now() - timedelta(days=7)]
+        # Recent execution statistics: drop results that left the window
+        now = time.time()
+        with self._stats_lock:
+            expiry = self._recent_expiry
+            while expiry and expiry[0][0] <= now:
+                entry = heapq.heappop(expiry)
+                if self._evicted_expiry[entry]:
+                    self._evicted_expiry[entry] -= 1
+                    continue
+                self._recent_total -= 1
+                self._recent_success -= entry[1]
+            recent_total = self._recent_total
+            recent_success = self._recent_success
         
         recent_success_rate = 0
-        if recent_history:
-            recent_success_rate = sum(1 for h in recent_history if h.success) / len(recent_history)
+        if recent_total:
+            recent_success_rate = recent_success / recent_total
+        
+        next_run = self.next_task_eta()
         
         return {
             "running": self.running,
             "scheduler_available": APSCHEDULER_AVAILABLE,
+            "next_run": {"task_id": next_run[0], "time": next_run[1].isoformat()} if next_run else None,
             "tasks": {
                 "total": total_tasks,
                 "enabled": enabled_tasks,
@@ -405,7 +647,7 @@ class SmartScheduler:
             },
             "executions": {
                 "total": len(self.execution_history),
-                "last_week": len(recent_history),
+                "last_week": recent_total,
                 "recent_success_rate": recent_success_rate
             },
             "analytics": {
@@ -420,18 +662,12 @@ class SmartScheduler:
             return False
         
         try:
-            # Remove existing job if any
-            try:
-                self.scheduler.remove_job(task.id)
-            except:
-                pass
-            
             # Create trigger based on schedule type
             trigger = None
             
             if task.schedule_type == ScheduleType.ONCE:
                 if task.next_run:
-                    trigger = CronTrigger(
+                    trigger = _cron_trigger(
                         year=task.next_run.year,
                         month=task.next_run.month,
                         day=task.next_run.day,
@@ -441,22 +677,22 @@ class SmartScheduler:
             
             elif task.schedule_type == ScheduleType.DAILY:
                 if task.specific_time:
-                    trigger = CronTrigger(
+                    trigger = _cron_trigger(
                         hour=task.specific_time.hour,
                         minute=task.specific_time.minute
                     )
                 else:
-                    trigger = CronTrigger(hour=2, minute=0)  # Default 2 AM
+                    trigger = _cron_trigger(hour=2, minute=0)  # Default 2 AM
             
             elif task.schedule_type == ScheduleType.WEEKLY:
                 if task.specific_time and task.days_of_week:
-                    trigger = CronTrigger(
+                    trigger = _cron_trigger(
                         day_of_week=','.join(str(d) for d in task.days_of_week),
                         hour=task.specific_time.hour,
                         minute=task.specific_time.minute
                     )
                 else:
-                    trigger = CronTrigger(day_of_week=0, hour=2, minute=0)  # Monday 2 AM
+                    trigger = _cron_trigger(day_of_week=0, hour=2, minute=0)  # Monday 2 AM
             
             elif task.schedule_type == ScheduleType.INTERVAL:
                 if task.interval_hours:
@@ -466,31 +702,87 @@ class SmartScheduler:
             
             elif task.schedule_type == ScheduleType.SMART:
                 # Smart scheduling - start with daily and adjust
-                trigger = CronTrigger(hour=2, minute=0)
+                trigger = _cron_trigger(hour=2, minute=0)
             
             if trigger:
-                self.scheduler.add_job(
-                    func=self._execute_scheduled_task,
+                job = self.scheduler.add_job(
+                    func=self.run_task_now,
                     trigger=trigger,
                     args=[task.id],
                     id=task.id,
                     name=task.name,
                     replace_existing=True
                 )
+                self._track_next_run(job)
                 
                 self.logger.info(f"Scheduled task: {task.name} ({task.id})")
                 return True
             
+            # No trigger to replace the existing job with, drop it
+            self._unschedule_task(task.id)
             return False
             
         except Exception as e:
             self.logger.error(f"Failed to schedule task {task.name}: {e}")
             return False
     
-    def _execute_scheduled_task(self, task_id: str) -> None:
-        """Execute a scheduled task (called by scheduler)"""
-        # Run in async context
-        asyncio.create_task(self.run_task_now(task_id))
+    def _unschedule_task(self, task_id: str) -> None:
+        """Remove a task's job from the scheduler if it has one"""
+        if self.scheduler:
+            try:
+                self.scheduler.remove_job(task_id)
+            except JobLookupError:
+                pass  # Disabled or never scheduled
+    
+    def _start_loop(self) -> None:
+        """Start the event loop thread the scheduler runs tasks on"""
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._run_loop, args=(self._loop,), name="SmartSchedulerLoop", daemon=True
+        )
+        self._loop_thread.start()
+    
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """Run the event loop until stopped, then close it"""
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+    
+    def _stop_loop(self) -> None:
+        """Wait for runs in progress, then stop the event loop
+        
+        Runs still going after _STOP_TIMEOUT are cancelled. Called from the
+        loop thread itself (a run or callback stopping the scheduler), the
+        shutdown is only scheduled, as waiting would block the loop it needs.
+        """
+        loop, self._loop = self._loop, None
+        thread, self._loop_thread = self._loop_thread, None
+        if loop is None:
+            return
+        
+        async def shutdown() -> None:
+            current = asyncio.current_task()
+            pending = [t for t in asyncio.all_tasks() if t is not current]
+            if pending:
+                _, unfinished = await asyncio.wait(pending, timeout=_STOP_TIMEOUT)
+                if unfinished:
+                    self.logger.warning(f"Cancelling {len(unfinished)} runs still in progress")
+                    for task in unfinished:
+                        task.cancel()
+                    await asyncio.wait(unfinished, timeout=_CANCEL_GRACE)
+        
+        if threading.current_thread() is thread:
+            loop.create_task(shutdown()).add_done_callback(lambda _: loop.stop())
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(_STOP_TIMEOUT + _CANCEL_GRACE)
+        except FutureTimeoutError:
+            self.logger.warning("Event loop did not drain in time, stopping it")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(_CANCEL_GRACE)
     
     async def _auto_adjust_smart_task(self, task: ScheduledTask) -> None:
         """Auto-adjust smart task based on analytics"""
@@ -526,6 +818,11 @@ class SmartScheduler:
     
     async def _record_space_snapshot(self) -> None:
         """Record current disk space snapshot"""
+        now = time.monotonic()
+        if self._last_snapshot is not None and now - self._last_snapshot < _SNAPSHOT_TTL:
+            # Back-to-back runs: disk usage was just recorded
+            return
+        
         try:
             import psutil
             
@@ -535,16 +832,18 @@ class SmartScheduler:
             # Get category breakdown (simplified)
             category_breakdown = {}
             
-            snapshot = {
-                "timestamp": datetime.now().isoformat(),
-                "total_disk_space": disk_usage.total,
-                "used_space": disk_usage.used,
-                "free_space": disk_usage.free,
-                "category_breakdown": category_breakdown
-            }
+            snapshot = SpaceUsageSnapshot(
+                timestamp=datetime.now(),
+                total_disk_space=disk_usage.total,
+                used_space=disk_usage.used,
+                free_space=disk_usage.free,
+                category_breakdown=category_breakdown
+            )
             
             # This would be enhanced with actual category breakdown
             # For now, just record basic disk usage
+            self.analytics.record_space_snapshot(snapshot)
+            self._last_snapshot = now
             
         except ImportError:
             self.logger.warning("psutil not available, cannot record space snapshot")
@@ -572,42 +871,99 @@ class SmartScheduler:
     def _job_executed(self, event) -> None:
         """Handle successful job execution"""
         self.logger.debug(f"Job executed successfully: {event.job_id}")
+        self._refresh_next_run(event.job_id)
     
     def _job_error(self, event) -> None:
         """Handle job execution error"""
         self.logger.error(f"Job execution error: {event.job_id} - {event.exception}")
+        self._refresh_next_run(event.job_id)
+    
+    def _refresh_next_run(self, job_id: str) -> None:
+        """Track the next run of a job that just ran"""
+        if self.scheduler:
+            self._track_next_run(self.scheduler.get_job(job_id))
+    
+    def _track_next_run(self, job) -> None:
+        """Add a job's next run time to the lookahead heap"""
+        # Jobs added before the scheduler starts have no next_run_time yet
+        next_run_time = getattr(job, "next_run_time", None)
+        if next_run_time is not None:
+            with self._stats_lock:
+                heapq.heappush(self._next_run_heap, (next_run_time, job.id))
+    
+    def next_task_eta(self) -> Optional[Tuple[str, datetime]]:
+        """Task id and time of the next scheduled run, or None"""
+        if not self.scheduler:
+            return None
+        
+        with self._stats_lock:
+            heap = self._next_run_heap
+            while heap:
+                next_run_time, task_id = heap[0]
+                job = self.scheduler.get_job(task_id)
+                if job is not None and job.next_run_time == next_run_time:
+                    return task_id, next_run_time
+                heapq.heappop(heap)
+        
+        return None
     
     def _notify_callbacks(self, result: TaskExecutionResult) -> None:
-        """Notify all registered callbacks"""
-        for callback in self.task_callbacks:
-            try:
-                callback(result)
-            except Exception as e:
-                self.logger.error(f"Error in task callback: {e}")
+        """Notify all registered callbacks on the callback threads"""
+        with self._callback_lock:
+            callbacks = list(self.task_callbacks)
+            if not callbacks:
+                return
+            if self._callback_pool is None:
+                self._callback_pool = ThreadPoolExecutor(
+                    max_workers=_CALLBACK_WORKERS, thread_name_prefix="sched-cb"
+                )
+            pool = self._callback_pool
+        
+        for callback in callbacks:
+            pool.submit(self._run_callback, callback, result)
+    
+    def _run_callback(self, callback: Callable[[TaskExecutionResult], None],
+                      result: TaskExecutionResult) -> None:
+        """Run one task callback, logging its errors"""
+        try:
+            callback(result)
+        except Exception as e:
+            self.logger.error(f"Error in task callback: {e}")
+    
+    def _close_callback_pool(self) -> None:
+        """Wait for queued callbacks and release the callback threads"""
+        with self._callback_lock:
+            pool, self._callback_pool = self._callback_pool, None
+        
+        if pool is not None:
+            pool.shutdown(wait=True)
     
     def _load_tasks(self) -> None:
         """Load tasks from file"""
         try:
             if self.tasks_file.exists():
-                with open(self.tasks_file, 'r') as f:
-                    tasks_data = json.load(f)
+                with open(self.tasks_file, 'rb') as f:
+                    self._last_tasks_data = f.read()
+                tasks_data = _loads(self._last_tasks_data)
                     
                 for task_data in tasks_data:
+                    task_data = {k: v for k, v in task_data.items() if k in _TASK_FIELDS}
+                    
                     # Convert string enums back to enums
-                    task_data["schedule_type"] = ScheduleType(task_data["schedule_type"])
+                    task_data["schedule_type"] = _SCHEDULE_TYPES[task_data["schedule_type"]]
                     
                     # Convert datetime strings back to datetime objects
                     for field in ["last_run", "next_run", "created_at"]:
                         if task_data.get(field):
-                            task_data[field] = datetime.fromisoformat(task_data[field])
+                            task_data[field] = _fast_iso(task_data[field])
                     
                     # Convert time string back to time object
                     if task_data.get("specific_time"):
-                        time_str = task_data["specific_time"]
-                        task_data["specific_time"] = dt_time.fromisoformat(time_str)
+                        task_data["specific_time"] = _parse_time(task_data["specific_time"])
                     
                     task = ScheduledTask(**task_data)
                     self.tasks[task.id] = task
+                    self._enabled_count += task.enabled
                     
                 self.logger.info(f"Loaded {len(self.tasks)} scheduled tasks")
                 
@@ -615,70 +971,161 @@ class SmartScheduler:
             self.logger.error(f"Error loading tasks: {e}")
     
     def _save_tasks(self) -> None:
-        """Save tasks to file"""
+        """Mark tasks for saving"""
+        self._tasks_dirty = True
+        self._schedule_flush()
+    
+    def _record_result(self, result: TaskExecutionResult) -> None:
+        """Add an execution result to the history and queue it for appending"""
+        self._ensure_history_loaded()
+        with self._flush_lock:
+            history = self._execution_history
+            if len(history) == history.maxlen:
+                self._uncount_recent(history[0])
+            history.append(result)
+            self._pending_history.append(_dumps(result, line=True))
+            self._history_dirty = True
+        
+        self._count_recent(result)
+        self._schedule_flush()
+    
+    def _count_recent(self, result: TaskExecutionResult) -> None:
+        """Add a result to the recent execution counters"""
+        with self._stats_lock:
+            heapq.heappush(self._recent_expiry, self._recent_entry(result))
+            self._recent_total += 1
+            self._recent_success += result.success
+    
+    @staticmethod
+    def _recent_entry(result: TaskExecutionResult) -> Tuple[float, bool]:
+        """Heap entry for a result: when it leaves the recent window, as an epoch"""
+        return result.execution_time.timestamp() + _RECENT_WINDOW, result.success
+    
+    def _uncount_recent(self, result: TaskExecutionResult) -> None:
+        """Remove a result evicted from the history from the recent counters"""
+        entry = self._recent_entry(result)
+        with self._stats_lock:
+            if entry[0] > time.time():
+                self._evicted_expiry[entry] += 1
+                self._recent_total -= 1
+                self._recent_success -= result.success
+    
+    def _schedule_flush(self) -> None:
+        """Flush now, or arm a timer if the last write was under _SAVE_INTERVAL ago
+        
+        The first save after a quiet period is written immediately; saves that
+        follow in quick succession are coalesced into one write.
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                return
+            
+            delay = self._last_flush + _SAVE_INTERVAL - time.monotonic()
+            if delay > 0:
+                self._flush_timer = threading.Timer(delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+                return
+        
+        self.flush()
+    
+    def _flush_tasks(self) -> bool:
+        """Save tasks to file, unless they are unchanged since the last write"""
         try:
-            tasks_data = []
-            for task in self.tasks.values():
-                task_dict = task.__dict__.copy()
-                
-                # Convert enums to strings
-                task_dict["schedule_type"] = task.schedule_type.value
-                
-                # Convert datetime objects to strings
-                for field in ["last_run", "next_run", "created_at"]:
-                    if task_dict.get(field):
-                        task_dict[field] = task_dict[field].isoformat()
-                
-                # Convert time object to string
-                if task_dict.get("specific_time"):
-                    task_dict["specific_time"] = task_dict["specific_time"].isoformat()
-                
-                tasks_data.append(task_dict)
+            data = _dumps(list(self.tasks.values()))
+            if data == self._last_tasks_data:
+                return True
             
-            with open(self.tasks_file, 'w') as f:
-                json.dump(tasks_data, f, indent=2)
+            _atomic_write_bytes(self.tasks_file, data)
+            self._last_tasks_data = data
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error saving tasks: {e}")
+            return False
+    
+    def _ensure_history_loaded(self) -> None:
+        """Load the execution history the first time it is needed"""
+        if self._history_loaded:
+            return
+        
+        with self._history_load_lock:
+            if not self._history_loaded:
+                self._load_history()
+                self._history_loaded = True
     
     def _load_history(self) -> None:
         """Load execution history from file"""
         try:
             if self.history_file.exists():
-                with open(self.history_file, 'r') as f:
-                    history_data = json.load(f)
-                    
-                for result_data in history_data:
-                    # Convert datetime string back to datetime object
-                    result_data["execution_time"] = datetime.fromisoformat(result_data["execution_time"])
-                    
-                    result = TaskExecutionResult(**result_data)
-                    self.execution_history.append(result)
-                    
-                self.logger.info(f"Loaded {len(self.execution_history)} execution records")
+                with open(self.history_file, 'rb') as f:
+                    lines = f.read().splitlines()
+                
+                # Only the tail is kept in memory, so only the tail is parsed
+                self._history_lines = len(lines)
+                history_data = []
+                for line in lines[-_HISTORY_LIMIT:]:
+                    try:
+                        history_data.append(_loads(line))
+                    except ValueError:
+                        # Torn last line from an interrupted append
+                        self.logger.warning("Skipping unreadable execution history line")
+            
+            elif self._legacy_history_file.exists():
+                with open(self._legacy_history_file, 'rb') as f:
+                    history_data = _loads(f.read())
+            
+            else:
+                return
+            
+            for result_data in history_data[-_HISTORY_LIMIT:]:
+                result_data = {k: v for k, v in result_data.items() if k in _RESULT_FIELDS}
+                
+                # Convert datetime string back to datetime object
+                result_data["execution_time"] = _fast_iso(result_data["execution_time"])
                 
+                result = TaskExecutionResult(**result_data)
+                self._execution_history.append(result)
+                self._count_recent(result)
+            
+            if not self.history_file.exists():
+                # Convert the old single-document history to the JSON-Lines log
+                self._compact_history()
+                self._legacy_history_file.unlink()
+            
+            self.logger.info(f"Loaded {len(self._execution_history)} execution records")
+            
         except Exception as e:
             self.logger.error(f"Error loading execution history: {e}")
     
-    def _save_history(self) -> None:
-        """Save execution history to file"""
+    def _flush_history(self) -> bool:
+        """Append pending execution results to the history log"""
+        lines, self._pending_history = self._pending_history, []
+        
         try:
-            # Keep only last 1000 records
-            history_to_save = self.execution_history[-1000:]
-            
-            history_data = []
-            for result in history_to_save:
-                result_dict = result.__dict__.copy()
-                result_dict["execution_time"] = result.execution_time.isoformat()
-                history_data.append(result_dict)
-            
-            with open(self.history_file, 'w') as f:
-                json.dump(history_data, f, indent=2)
+            if self._history_lines + len(lines) > 2 * _HISTORY_LIMIT:
+                self._compact_history()
+            else:
+                with open(self.history_file, 'ab') as f:
+                    f.write(b"".join(lines))
+                self._history_lines += len(lines)
+            return True
                 
         except Exception as e:
             self.logger.error(f"Error saving execution history: {e}")
+            # Keep the lines, ahead of any results recorded meanwhile
+            self._pending_history[:0] = lines
+            return False
+    
+    def _compact_history(self) -> None:
+        """Rewrite the history log with only the results kept in memory"""
+        data = b"".join(_dumps(result, line=True) for result in self._execution_history)
+        _atomic_write_bytes(self.history_file, data)
+        self._history_lines = len(self._execution_history)
     
     def __del__(self):
         """Cleanup on deletion"""
         if self.running:
             self.stop()
+        else:
+            self.flush()
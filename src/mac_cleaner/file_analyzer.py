@@ -7,24 +7,369 @@ Licensed under the MIT License
 """
 
 import os
-import subprocess
+import sys
+import heapq
 import json
-import shutil
-import platform
-import psutil
+import importlib.util
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Optional
-import mimetypes
+from datetime import datetime
+from typing import List, Dict, Tuple, Optional, Iterable, Iterator, Union, Callable
+import re
 import stat
+import time
+import zlib
 import logging
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
-from .core.database import DatabaseManager, ScanRecord, FileRecord, SystemSnapshot
+from .core.database import DatabaseManager, ScanRecord, SystemSnapshot
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# NumPy and Numba are only imported by the first vectorized scoring pass;
+# loading Numba alone takes longer than importing the rest of this module
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+# Replaced by numba.prange when _score_kernel is compiled
+prange = range
+
+try:
+    from ._darwin_bulk import dir_stats as _bulk_dir_stats
+
+    BULK_STAT_AVAILABLE = True
+except ImportError:
+    BULK_STAT_AVAILABLE = False
+
+# dataclass(slots=True) needs Python 3.10; older versions keep a __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Effective user and groups, so is_readable/is_writable can be derived from
+# st_mode instead of two os.access() calls per file
+_EUID = os.geteuid() if hasattr(os, "geteuid") else None
+_GROUPS = frozenset(os.getgroups()) | {os.getegid()} if hasattr(os, "getgroups") else frozenset()
+# Files are stat'ed in batches of _STAT_BATCH_SIZE; batches of at least
+# _PARALLEL_STAT_MIN files are spread over _STAT_WORKERS threads, since
+# os.stat releases the GIL and slow (network, cold) volumes overlap well
+_STAT_BATCH_SIZE = 256
+_PARALLEL_STAT_MIN = 64
+_STAT_WORKERS = 8
+# Top-level subdirectories of a scan are walked concurrently
+_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+# Batches with at least this many files are scored with NumPy
+_VECTOR_SCORE_MIN = 32
+
+# Extension bits passed to the scoring kernel
+_EXT_IMPORTANT = 1
+_EXT_SAFE = 2
+
+# Score thresholds, from the lowest, and the safety levels they separate
+_SAFETY_THRESHOLDS = (20, 40, 60, 80)
+_SAFETY_LEVELS = ("very_safe", "safe", "moderate", "important", "critical")
+_RECOMMENDATIONS = ("review", "keep", "delete")
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+# File info fields holding epoch seconds, turned into datetimes on export
+_TIME_FIELDS = ("modified", "created", "accessed")
+
+_READ_BITS = (stat.S_IRUSR, stat.S_IRGRP, stat.S_IROTH)
+_WRITE_BITS = (stat.S_IWUSR, stat.S_IWGRP, stat.S_IWOTH)
+
+
+# Path fragments checked while scoring, matched case-sensitively
+_PATH_SYSTEM = 1 << 0
+_PATH_USER = 1 << 1
+_PATH_CACHE = 1 << 2
+_SCORE_FRAGMENTS = {
+    _PATH_SYSTEM: ("/Library/", "/System/", "/usr/"),
+    _PATH_USER: ("/Documents/", "/Desktop/", "/Downloads/"),
+    _PATH_CACHE: ("/Caches/", "/cache/", "/tmp/"),
+}
+
+# Category fragments, matched against the lowercased path; when several
+# match, the category with the lowest bit wins
+_CATEGORY_FRAGMENTS = {
+    "cache": ("/cache/", "/caches/", "/tmp/"),
+    "logs": ("/log/", "/logs/"),
+    "trash": ("/trash/", ".trash"),
+    "browser": ("/chrome/", "/firefox/", "/safari/"),
+    "development": ("/node_modules/", "/.git/", "/build/", "/dist/"),
+    "media": ("/movies/", "/music/", "/pictures/", "/photos/"),
+    "documents": ("/documents/", "/desktop/", "/downloads/"),
+    "system": ("/library/", "/system/", "/usr/"),
+}
+_CATEGORY_BITS = {1 << i: category for i, category in enumerate(_CATEGORY_FRAGMENTS)}
+
+
+class _PathMatcher:
+    """Bitmask of the fragment groups found in a path, in a single pass"""
+
+    def __init__(self, groups: Dict[int, Iterable[str]]):
+        bits: Dict[str, int] = {}
+        for bit, fragments in groups.items():
+            for fragment in fragments:
+                bits[fragment] = bits.get(fragment, 0) | bit
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for fragment, bit in bits.items():
+                self._automaton.add_word(fragment, bit)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            # A lookahead matches at every position, so overlapping fragments
+            # are all seen as long as none is a prefix of another
+            alternatives = "|".join(map(re.escape, sorted(bits, key=len, reverse=True)))
+            self._pattern = re.compile(f"(?=({alternatives}))")
+        self._bits = bits
+
+    def mask(self, path: str) -> int:
+        mask = 0
+        if self._automaton is not None:
+            for _, bit in self._automaton.iter(path):
+                mask |= bit
+        else:
+            bits = self._bits
+            for fragment in self._pattern.findall(path):
+                mask |= bits[fragment]
+        return mask
+
+
+_SCORE_MATCHER = _PathMatcher(_SCORE_FRAGMENTS)
+_CATEGORY_MATCHER = _PathMatcher({bit: _CATEGORY_FRAGMENTS[c] for bit, c in _CATEGORY_BITS.items()})
+
+
+def _score_kernel(ext_bits, mtimes, sizes, hidden, path_flags, now, old_days, large_size, scores, levels, recommendations):
+    """Per-file scoring loop over arrays, compiled with Numba when available
+
+    Writes importance scores, indexes into _SAFETY_LEVELS and indexes into
+    _RECOMMENDATIONS to the three output arrays.
+    """
+    for i in prange(scores.shape[0]):
+        score = 50
+        if ext_bits[i] & _EXT_IMPORTANT:
+            score += 30
+        elif ext_bits[i] & _EXT_SAFE:
+            score -= 20
+
+        days_old = (now - mtimes[i]) // 86400.0
+        if days_old > old_days:
+            score -= 15
+        elif days_old < 7:
+            score += 10
+
+        if sizes[i] > large_size:
+            score += 5
+        elif sizes[i] < 1024:
+            score -= 10
+
+        if hidden[i]:
+            score -= 5
+        if path_flags[i] & _PATH_SYSTEM:
+            score += 20
+        if path_flags[i] & _PATH_USER:
+            score += 15
+        score = min(100, max(0, score))
+
+        level = (score >= 20) + (score >= 40) + (score >= 60) + (score >= 80)
+        if level >= 3:
+            recommendation = 1
+        elif level == 2:
+            recommendation = 0
+        elif ext_bits[i] & _EXT_SAFE or path_flags[i] & _PATH_CACHE:
+            recommendation = 2
+        else:
+            recommendation = 0
+
+        scores[i] = score
+        levels[i] = level
+        recommendations[i] = recommendation
+
+
+@lru_cache(maxsize=None)
+def _compiled_score_kernel() -> Optional[Callable]:
+    """_score_kernel compiled with Numba, or None if Numba fails to load"""
+    global prange
+    try:
+        import numba
+    except ImportError:
+        return None
+    prange = numba.prange
+    return numba.njit(parallel=True, cache=True)(_score_kernel)
+
+
+def _stat_access(stat_info: os.stat_result, bits: Tuple[int, int, int]) -> bool:
+    """Permission check from st_mode, like os.access() without ACLs or file flags"""
+    if _EUID is None or _EUID == 0:
+        return True
+    if stat_info.st_uid == _EUID:
+        return bool(stat_info.st_mode & bits[0])
+    if stat_info.st_gid in _GROUPS:
+        return bool(stat_info.st_mode & bits[1])
+    return bool(stat_info.st_mode & bits[2])
+
+
+def _lstat_entry(entry: os.DirEntry) -> Union[os.stat_result, OSError]:
+    """Stat result of a directory entry, or the error fetching it"""
+    try:
+        return entry.stat(follow_symlinks=False)
+    except OSError as e:
+        return e
+
+
+def _bulk_stat_entries(batch: List[os.DirEntry], current: Dict) -> List[Union[os.stat_result, OSError]]:
+    """Stat a batch with one getattrlistbulk() pass per directory
+
+    current caches the stats of the directory last listed, so a directory
+    spanning several batches is only listed once. Entries missing from the
+    bulk results fall back to lstat().
+    """
+    results = []
+    for entry in batch:
+        parent = os.path.dirname(entry.path)
+        if current.get("path") != parent:
+            try:
+                current["stats"] = _bulk_dir_stats(parent)
+            except OSError:
+                current["stats"] = {}
+            current["path"] = parent
+
+        stat_info = current["stats"].get(entry.name)
+        results.append(stat_info if stat_info is not None else _lstat_entry(entry))
+    return results
+
+
+@lru_cache(maxsize=1024)
+def _mime_for_suffix(suffix: str) -> Optional[str]:
+    import mimetypes
+
+    return mimetypes.guess_type("x" + suffix)[0]
+
+
+def _guess_mime(name: str) -> Optional[str]:
+    """mimetypes.guess_type(name)[0], cached per suffix
+
+    Compression suffixes keep the suffix before them, so .tar.gz still maps
+    to the tar type.
+    """
+    import mimetypes
+
+    root, suffix = os.path.splitext(name)
+    if suffix in mimetypes.encodings_map:
+        suffix = os.path.splitext(root)[1] + suffix
+    return _mime_for_suffix(suffix)
+
+
+def _as_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    """Local datetime for an epoch timestamp from a file info dict"""
+    return None if timestamp is None else datetime.fromtimestamp(timestamp)
+
+
+def _export_row(file_info: Mapping) -> Dict:
+    """JSON-ready copy of a file info, with its timestamps as datetime strings"""
+    row = dict(file_info)
+    for key in _TIME_FIELDS:
+        if key in row:
+            row[key] = str(_as_datetime(row[key]))
+    return row
+
+
+def _dumps(obj, line: bool = False) -> bytes:
+    """Encode export data as indented JSON, using orjson when it is installed
+
+    With line=True the object is encoded compactly on one newline-terminated
+    line, for NDJSON exports.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_APPEND_NEWLINE if line else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=str, option=option)
+    if line:
+        return (json.dumps(obj, default=str) + "\n").encode()
+    return json.dumps(obj, default=str, indent=2).encode()
+
+
+def _isoformat(timestamp: Optional[float], default: str) -> str:
+    """ISO string of an epoch timestamp, as stored in file_records"""
+    return default if timestamp is None else datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _entry_is_dir(entry: os.DirEntry) -> bool:
+    """Whether os.walk would list the entry as a directory"""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class FileInfo(Mapping):
+    """Analysis of a single file
+
+    Slotted to keep large scans compact, but read like the dict it replaced:
+    info["size"], info.get("size") and dict(info) all work. Item assignment
+    is limited to the existing fields.
+    """
+    path: str
+    name: str
+    size: int
+    size_human: str
+    modified: float
+    created: float
+    accessed: float
+    is_file: bool
+    is_directory: bool
+    is_readable: bool
+    is_writable: bool
+    is_hidden: bool
+    extension: str
+    mime_type: Optional[str]
+    category: str
+    importance_score: int = 0
+    safety_level: str = "unknown"
+    recommendation: str = "unknown"
+
+    def __getitem__(self, key: str):
+        if key in _FILE_INFO_KEY_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key not in _FILE_INFO_KEY_SET:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in _FILE_INFO_KEY_SET
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FILE_INFO_KEYS)
+
+    def __len__(self) -> int:
+        return len(_FILE_INFO_KEYS)
+
+
+_FILE_INFO_KEYS = tuple(field.name for field in fields(FileInfo))
+_FILE_INFO_KEY_SET = frozenset(_FILE_INFO_KEYS)
 
 
 class FileAnalyzer:
-    def __init__(self, enable_db_logging: bool = True):
-        self.safe_extensions = {
+    def __init__(self, enable_db_logging: bool = True, cache_analysis: bool = False):
+        safe_extensions = {
             ".tmp",
             ".temp",
             ".cache",
@@ -43,7 +388,7 @@ class FileAnalyzer:
             ".torrent",
         }
 
-        self.important_extensions = {
+        important_extensions = {
             ".app",
             ".kext",
             ".driver",
@@ -63,60 +408,324 @@ class FileAnalyzer:
             ".numbers",
             ".keynote",
         }
+        # Extensions are compared lowercased
+        self.safe_extensions = frozenset(ext.lower() for ext in safe_extensions)
+        self.important_extensions = frozenset(ext.lower() for ext in important_extensions)
 
         self.large_file_threshold = 100 * 1024 * 1024
         self.old_file_threshold = 30
+        # Scans with more files than this are saved with indexes deferred
+        self.bulk_load_threshold = 100_000
         
         # Initialize database manager
         self.db_manager = DatabaseManager() if enable_db_logging else None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
+        # Reuse scores of unchanged files from earlier scans (needs the database)
+        self.cache_analysis = cache_analysis
+        
         # Current scan tracking
         self.current_scan_id = None
         self.scan_start_time = None
+        
+        # Threads for batched stat calls, created on the first large batch
+        self._stat_pool: Optional[ThreadPoolExecutor] = None
+        # Threads walking subdirectories, created on the first scan that has several
+        self._walk_pool: Optional[ThreadPoolExecutor] = None
 
     def analyze_file(self, file_path: str) -> Dict:
         """Analyze a single file and return detailed information"""
         try:
             stat_info = os.stat(file_path)
+        except (OSError, PermissionError) as e:
+            return self._error_info(file_path, e)
 
-            file_info = {
-                "path": file_path,
-                "name": os.path.basename(file_path),
-                "size": stat_info.st_size,
-                "size_human": self.format_bytes(stat_info.st_size),
-                "modified": datetime.fromtimestamp(stat_info.st_mtime),
-                "created": datetime.fromtimestamp(stat_info.st_ctime),
-                "accessed": datetime.fromtimestamp(stat_info.st_atime),
-                "is_file": os.path.isfile(file_path),
-                "is_directory": os.path.isdir(file_path),
-                "is_readable": os.access(file_path, os.R_OK),
-                "is_writable": os.access(file_path, os.W_OK),
-                "is_hidden": file_path.startswith("."),
-                "extension": os.path.splitext(file_path)[1].lower(),
-                "mime_type": mimetypes.guess_type(file_path)[0],
-                "importance_score": 0,
-                "safety_level": "unknown",
-                "recommendation": "unknown",
-            }
+        return self._build_file_info(file_path, os.path.basename(file_path), stat_info)
+
+    def _analyze_entries(
+        self,
+        entries: Iterable[os.DirEntry],
+        stat_filter: Optional[Callable[[os.stat_result], bool]] = None,
+        want_mime: bool = False,
+    ) -> Iterator[Dict]:
+        """Analyze files found by _scandir_walk, fetching their metadata in batches
+
+        With a stat_filter, only files whose stat result passes it are
+        analyzed, and unreadable files are skipped. MIME types are only
+        looked up with want_mime.
+        """
+        entries = iter(entries)
+        bulk_dir: Dict = {}
+        now = time.time()
+        use_cache = self.cache_analysis and self.db_manager is not None
+        config = self._score_config() if use_cache else 0
+        while True:
+            batch = list(islice(entries, _STAT_BATCH_SIZE))
+            if not batch:
+                return
+
+            if BULK_STAT_AVAILABLE:
+                stats = _bulk_stat_entries(batch, bulk_dir)
+            else:
+                stats = self._stat_entries(batch)
+            vectorize = NUMPY_AVAILABLE and len(batch) >= _VECTOR_SCORE_MIN
+            cached = self._load_cached_scores(batch, stats, now, config) if use_cache else {}
+            results = []
+            scored = []
+            for entry, stat_info in zip(batch, stats):
+                if stat_filter is not None and (isinstance(stat_info, OSError) or not stat_filter(stat_info)):
+                    continue
+                if isinstance(stat_info, OSError):
+                    results.append(self._error_info(entry.path, stat_info))
+                    continue
+
+                hit = cached.get(entry.path)
+                file_info = self._build_file_info(
+                    entry.path, entry.name, stat_info, score=not vectorize and hit is None, now=now, want_mime=want_mime
+                )
+                results.append(file_info)
+                if hit is not None:
+                    file_info.importance_score, file_info.safety_level, file_info.recommendation = hit
+                else:
+                    scored.append((file_info, stat_info))
+
+            if vectorize and scored:
+                self._score_batch([file_info for file_info, _ in scored], now)
+            if use_cache and scored:
+                self._save_cached_scores(scored, now, config)
+            yield from results
+
+    def _score_config(self) -> int:
+        """Fingerprint of the settings scores depend on, for the analysis cache"""
+        settings = (
+            sorted(self.safe_extensions),
+            sorted(self.important_extensions),
+            self.large_file_threshold,
+            self.old_file_threshold,
+        )
+        return zlib.crc32(repr(settings).encode())
+
+    def _score_valid_until(self, mtime: float, now: float) -> Optional[float]:
+        """When a file's age next moves into another scoring bracket, None if never"""
+        days_old = (now - mtime) // 86400
+        for boundary in sorted((7, self.old_file_threshold + 1)):
+            if days_old < boundary:
+                return mtime + boundary * 86400
+        return None
+
+    def _load_cached_scores(
+        self, batch: List[os.DirEntry], stats: List, now: float, config: int
+    ) -> Dict[str, Tuple[int, str, str]]:
+        """Still valid (score, safety level, recommendation) of cached files in a batch"""
+        stat_results = {
+            entry.path: stat_info for entry, stat_info in zip(batch, stats) if not isinstance(stat_info, OSError)
+        }
+        if not stat_results:
+            return {}
+        try:
+            rows = self.db_manager.get_cached_analyses(list(stat_results))
+        except Exception as e:
+            self.logger.warning(f"Could not read the analysis cache: {e}")
+            return {}
+
+        hits = {}
+        for path, mtime_ns, size, row_config, valid_until, *scores in rows.values():
+            stat_info = stat_results[path]
+            if (
+                mtime_ns == stat_info.st_mtime_ns
+                and size == stat_info.st_size
+                and row_config == config
+                and (valid_until is None or now < valid_until)
+            ):
+                hits[path] = tuple(scores)
+        return hits
 
-            file_info["importance_score"] = self.calculate_importance_score(file_info)
-            file_info["safety_level"] = self.determine_safety_level(file_info)
-            file_info["recommendation"] = self.get_recommendation(file_info)
+    def _save_cached_scores(self, scored: List[Tuple[FileInfo, os.stat_result]], now: float, config: int) -> None:
+        """Store freshly computed scores in the analysis cache"""
+        rows = (
+            (
+                file_info.path,
+                stat_info.st_mtime_ns,
+                stat_info.st_size,
+                config,
+                self._score_valid_until(stat_info.st_mtime, now),
+                file_info.importance_score,
+                file_info.safety_level,
+                file_info.recommendation,
+            )
+            for file_info, stat_info in scored
+        )
+        try:
+            self.db_manager.save_cached_analyses(rows)
+        except Exception as e:
+            self.logger.warning(f"Could not update the analysis cache: {e}")
+
+    def _stat_entries(self, batch: List[os.DirEntry]) -> List[Union[os.stat_result, OSError]]:
+        """Stat a batch of entries, overlapping the calls when the batch is large"""
+        if len(batch) < _PARALLEL_STAT_MIN:
+            return [_lstat_entry(entry) for entry in batch]
+
+        if self._stat_pool is None:
+            self._stat_pool = ThreadPoolExecutor(max_workers=_STAT_WORKERS, thread_name_prefix="stat")
+        return list(self._stat_pool.map(_lstat_entry, batch))
 
+    def _build_file_info(
+        self,
+        file_path: str,
+        name: str,
+        stat_info: os.stat_result,
+        score: bool = True,
+        now: Optional[float] = None,
+        want_mime: bool = True,
+    ) -> FileInfo:
+        """File information and scoring from an already fetched stat result
+
+        With score=False the scoring fields keep their placeholder values,
+        for batches scored together by _score_batch. now is the reference
+        time for file ages, shared by all files of a scan. Without want_mime
+        mime_type is left as None.
+        """
+        mode = stat_info.st_mode
+        file_info = FileInfo(
+            path=file_path,
+            name=name,
+            size=stat_info.st_size,
+            size_human=self.format_bytes(stat_info.st_size),
+            modified=stat_info.st_mtime,
+            created=stat_info.st_ctime,
+            accessed=stat_info.st_atime,
+            is_file=stat.S_ISREG(mode),
+            is_directory=stat.S_ISDIR(mode),
+            is_readable=_stat_access(stat_info, _READ_BITS),
+            is_writable=_stat_access(stat_info, _WRITE_BITS),
+            is_hidden=file_path.startswith("."),
+            extension=os.path.splitext(file_path)[1].lower(),
+            mime_type=_guess_mime(name) if want_mime else None,
+            category=self._categorize_file(file_path),
+        )
+        if not score:
             return file_info
 
-        except (OSError, PermissionError) as e:
-            return {
-                "path": file_path,
-                "error": str(e),
-                "importance_score": 0,
-                "safety_level": "error",
-                "recommendation": "skip",
-            }
+        path_flags = _SCORE_MATCHER.mask(file_path)
+        file_info.importance_score = self.calculate_importance_score(file_info, path_flags, now)
+        file_info.safety_level = self.determine_safety_level(file_info)
+        file_info.recommendation = self.get_recommendation(file_info, path_flags)
+
+        return file_info
+
+    def _score_batch(self, infos: List[FileInfo], now: float) -> None:
+        """Fill in the scoring fields of a batch of file infos with NumPy
+
+        Vectorized calculate_importance_score, determine_safety_level and
+        get_recommendation, run through _score_kernel when Numba is installed.
+        """
+        import numpy as np
+
+        count = len(infos)
+        extensions = [file_info.extension for file_info in infos]
+        paths = [file_info.path for file_info in infos]
+
+        sizes = np.fromiter((file_info.size for file_info in infos), dtype=np.int64, count=count)
+        mtimes = np.fromiter((file_info.modified for file_info in infos), dtype=np.float64, count=count)
+        ext_bits = np.fromiter(
+            (
+                (ext in self.important_extensions) * _EXT_IMPORTANT | (ext in self.safe_extensions) * _EXT_SAFE
+                for ext in extensions
+            ),
+            dtype=np.uint8,
+            count=count,
+        )
+        hidden = np.fromiter((file_info.is_hidden for file_info in infos), dtype=bool, count=count)
+        flags = np.fromiter(map(_SCORE_MATCHER.mask, paths), dtype=np.int64, count=count)
+
+        kernel = _compiled_score_kernel() if NUMBA_AVAILABLE else None
+        if kernel is not None:
+            score = np.empty(count, dtype=np.int8)
+            levels = np.empty(count, dtype=np.int8)
+            recommendations = np.empty(count, dtype=np.int8)
+            kernel(
+                ext_bits, mtimes, sizes, hidden, flags, now,
+                self.old_file_threshold, self.large_file_threshold,
+                score, levels, recommendations,
+            )
+            self._store_scores(infos, score, levels, recommendations)
+            return
+
+        important = (ext_bits & _EXT_IMPORTANT) != 0
+        safe_ext = (ext_bits & _EXT_SAFE) != 0
+        days_old = np.floor_divide(now - mtimes, 86400)
+
+        score = 50 + np.where(important, 30, np.where(safe_ext, -20, 0))
+        score += np.where(days_old > self.old_file_threshold, -15, np.where(days_old < 7, 10, 0))
+        score += np.where(sizes > self.large_file_threshold, 5, np.where(sizes < 1024, -10, 0))
+        score -= np.where(hidden, 5, 0)
+        score += np.where(flags & _PATH_SYSTEM, 20, 0)
+        score += np.where(flags & _PATH_USER, 15, 0)
+        score = np.clip(score, 0, 100)
 
-    def calculate_importance_score(self, file_info: Dict) -> int:
-        """Calculate importance score (0-100, higher = more important)"""
+        levels = np.digitize(score, _SAFETY_THRESHOLDS)
+        # Indexes into _RECOMMENDATIONS: keep important files, review
+        # moderate ones, and delete the rest when they look disposable
+        recommendations = np.select(
+            [levels >= 3, levels == 2, safe_ext | ((flags & _PATH_CACHE) != 0)],
+            [1, 0, 2],
+            default=0,
+        )
+        self._store_scores(infos, score, levels, recommendations)
+
+    @staticmethod
+    def _store_scores(infos: List[FileInfo], scores, levels, recommendations) -> None:
+        """Copy scoring arrays from _score_batch into the file dicts"""
+        for file_info, file_score, level, recommendation in zip(
+            infos, scores.tolist(), levels.tolist(), recommendations.tolist()
+        ):
+            file_info.importance_score = file_score
+            file_info.safety_level = _SAFETY_LEVELS[level]
+            file_info.recommendation = _RECOMMENDATIONS[recommendation]
+
+    @staticmethod
+    def _error_info(file_path: str, error: Exception) -> Dict:
+        """Placeholder analysis for a file that could not be read"""
+        return {
+            "path": file_path,
+            "error": str(error),
+            "importance_score": 0,
+            "safety_level": "error",
+            "recommendation": "skip",
+        }
+
+    def _scandir_walk(self, directory: str, max_depth: Optional[int] = None) -> Iterator[os.DirEntry]:
+        """Yield every entry below directory, top-down like os.walk
+
+        Each directory's entries come before those of its subdirectories,
+        which are entered up to max_depth levels below directory. Symlinked
+        directories are listed but not followed, and unreadable directories
+        are skipped.
+        """
+        stack = [(directory, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                yield entry
+                if (max_depth is None or depth < max_depth) and _entry_is_dir(entry) and not entry.is_symlink():
+                    subdirs.append((entry.path, depth + 1))
+            stack.extend(reversed(subdirs))
+
+    def calculate_importance_score(
+        self, file_info: Dict, path_flags: Optional[int] = None, now: Optional[float] = None
+    ) -> int:
+        """Calculate importance score (0-100, higher = more important)
+
+        path_flags is the _SCORE_MATCHER mask of the path, if already known;
+        now is an epoch timestamp and defaults to the current time.
+        """
         score = 50
 
         ext = file_info.get("extension", "")
@@ -125,9 +734,9 @@ class FileAnalyzer:
         elif ext in self.safe_extensions:
             score -= 20
 
-        now = datetime.now()
-        modified = file_info.get("modified", now)
-        days_old = (now - modified).days
+        if now is None:
+            now = time.time()
+        days_old = (now - file_info.get("modified", now)) // 86400
 
         if days_old > self.old_file_threshold:
             score -= 15
@@ -143,13 +752,11 @@ class FileAnalyzer:
         if file_info.get("is_hidden", False):
             score -= 5
 
-        path = file_info.get("path", "")
-        if any(system_dir in path for system_dir in ["/Library/", "/System/", "/usr/"]):
+        if path_flags is None:
+            path_flags = _SCORE_MATCHER.mask(file_info.get("path", ""))
+        if path_flags & _PATH_SYSTEM:
             score += 20
-
-        if any(
-            user_dir in path for user_dir in ["/Documents/", "/Desktop/", "/Downloads/"]
-        ):
+        if path_flags & _PATH_USER:
             score += 15
 
         return max(0, min(100, score))
@@ -168,11 +775,10 @@ class FileAnalyzer:
             return "safe"
         return "very_safe"
 
-    def get_recommendation(self, file_info: Dict) -> str:
+    def get_recommendation(self, file_info: Dict, path_flags: Optional[int] = None) -> str:
         """Get deletion recommendation"""
         safety = file_info.get("safety_level", "unknown")
         ext = file_info.get("extension", "")
-        path = file_info.get("path", "")
 
         if "error" in file_info:
             return "skip"
@@ -183,47 +789,74 @@ class FileAnalyzer:
             return "review"
         if ext in self.safe_extensions:
             return "delete"
-        if any(cache_dir in path for cache_dir in ["/Caches/", "/cache/", "/tmp/"]):
+        if path_flags is None:
+            path_flags = _SCORE_MATCHER.mask(file_info.get("path", ""))
+        if path_flags & _PATH_CACHE:
             return "delete"
         return "review"
 
     def scan_directory(
-        self, directory: str, max_depth: int = 3, max_files: int = 1000
+        self, directory: str, max_depth: int = 3, max_files: int = 1000, want_mime: bool = False
     ) -> List[Dict]:
-        """Scan directory and return detailed file analysis"""
-        files = []
-        files_scanned = 0
+        """Scan directory and return detailed file analysis
 
+        MIME types are only looked up with want_mime; analyze_file always
+        includes them.
+        """
         try:
-            for root, dirs, filenames in os.walk(directory):
-                current_depth = root[len(directory) :].count(os.sep)
-                if current_depth > max_depth:
-                    continue
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            return []
+
+        files = [entry for entry in entries if not _entry_is_dir(entry)][:max_files]
+        if max_depth is None or max_depth > 0:
+            subdirs = [entry.path for entry in entries if _entry_is_dir(entry) and not entry.is_symlink()]
+            if subdirs and len(files) < max_files:
+                sub_depth = None if max_depth is None else max_depth - 1
+                files.extend(self._walk_subtrees(subdirs, sub_depth, max_files - len(files)))
 
-                for filename in filenames:
-                    if files_scanned >= max_files:
-                        return files
+        return list(self._analyze_entries(files, want_mime=want_mime))
 
-                    file_path = os.path.join(root, filename)
-                    file_info = self.analyze_file(file_path)
-                    files.append(file_info)
-                    files_scanned += 1
+    def _walk_subtrees(self, subdirs: List[str], max_depth: Optional[int], limit: int) -> List[os.DirEntry]:
+        """First limit files below subdirs, in _scandir_walk order
 
-        except (OSError, PermissionError):
-            pass
+        Each subdirectory is walked on its own thread. Results are merged in
+        order, and walks that have not started are cancelled once the
+        earlier subtrees already provide limit files.
+        """
+        def walk(path: str) -> List[os.DirEntry]:
+            file_entries = (entry for entry in self._scandir_walk(path, max_depth) if not _entry_is_dir(entry))
+            return list(islice(file_entries, limit))
 
-        return files
+        if len(subdirs) == 1:
+            return walk(subdirs[0])
+
+        if self._walk_pool is None:
+            self._walk_pool = ThreadPoolExecutor(max_workers=_WALK_WORKERS, thread_name_prefix="walk")
+        futures = [self._walk_pool.submit(walk, path) for path in subdirs]
+
+        found: List[os.DirEntry] = []
+        for i, future in enumerate(futures):
+            found.extend(future.result())
+            if len(found) >= limit:
+                for pending in futures[i + 1:]:
+                    pending.cancel()
+                break
+        return found[:limit]
 
     def format_bytes(self, bytes_size) -> str:
         """Format bytes to human readable format"""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.2f} {unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.2f} PB"
+        if bytes_size < 1024:
+            return f"{bytes_size:.2f} B"
+        # Unit index from the bit length; dividing by a power of two is exact
+        index = min((int(bytes_size).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+        return f"{bytes_size / (1 << (10 * index)):.2f} {_BYTE_UNITS[index]}"
 
     def open_in_finder(self, path: str) -> bool:
         """Open file or directory in Finder"""
+        import subprocess
+
         try:
             if os.path.exists(path):
                 subprocess.run(["open", "-R", path], check=True)
@@ -238,6 +871,7 @@ class FileAnalyzer:
             return {"error": "Directory not found"}
 
         total_size = 0
+        deletable_size = 0
         file_count = 0
         dir_count = 0
         files_by_safety = {
@@ -249,23 +883,21 @@ class FileAnalyzer:
             "error": 0,
         }
 
-        try:
-            for root, dirs, filenames in os.walk(directory):
-                dir_count += len(dirs)
-
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    try:
-                        file_info = self.analyze_file(file_path)
-                        total_size += file_info.get("size", 0)
-                        file_count += 1
-                        safety = file_info.get("safety_level", "error")
-                        files_by_safety[safety] += 1
-                    except:
-                        files_by_safety["error"] += 1
-
-        except (OSError, PermissionError):
-            pass
+        def file_entries():
+            nonlocal dir_count
+            for entry in self._scandir_walk(directory):
+                if _entry_is_dir(entry):
+                    dir_count += 1
+                else:
+                    yield entry
+
+        for file_info in self._analyze_entries(file_entries()):
+            total_size += file_info.get("size", 0)
+            if file_info.get("recommendation") in ["delete", "review"]:
+                deletable_size += file_info.get("size", 0)
+            file_count += 1
+            safety = file_info.get("safety_level", "error")
+            files_by_safety[safety] += 1
 
         return {
             "path": directory,
@@ -274,54 +906,59 @@ class FileAnalyzer:
             "file_count": file_count,
             "directory_count": dir_count,
             "files_by_safety": files_by_safety,
-            "deletable_size": self.estimate_deletable_size(directory),
+            "deletable_size": deletable_size,
         }
 
     def estimate_deletable_size(self, directory: str) -> int:
         """Estimate how much space can be safely deleted"""
         deletable_size = 0
 
-        try:
-            for root, dirs, filenames in os.walk(directory):
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    try:
-                        file_info = self.analyze_file(file_path)
-                        if file_info.get("recommendation") in ["delete", "review"]:
-                            deletable_size += file_info.get("size", 0)
-                    except:
-                        continue
-        except (OSError, PermissionError):
-            pass
+        file_entries = (entry for entry in self._scandir_walk(directory) if not _entry_is_dir(entry))
+        for file_info in self._analyze_entries(file_entries):
+            if file_info.get("recommendation") in ["delete", "review"]:
+                deletable_size += file_info.get("size", 0)
 
         return deletable_size
 
-    def export_analysis(self, files: List[Dict], output_file: str) -> bool:
-        """Export analysis results to JSON file"""
+    def export_analysis(self, files: Iterable[Mapping], output_file: str, lines: bool = False) -> bool:
+        """Export analysis results to JSON file
+
+        With lines=True the results are streamed as NDJSON, one file per
+        line, so large exports never exist as a single document in memory.
+        """
         try:
-            with open(output_file, "w") as f:
-                json.dump(files, f, indent=2, default=str)
+            rows = map(_export_row, files)
+            with open(output_file, "wb") as f:
+                if lines:
+                    for row in rows:
+                        f.write(_dumps(row, line=True))
+                else:
+                    f.write(_dumps(list(rows)))
             return True
         except:
             return False
 
-    def get_top_space_consumers(self, directory: str, top_n: int = 20) -> List[Dict]:
-        """Get top N files consuming the most space"""
-        files = self.scan_directory(directory, max_files=1000)
-        return sorted(files, key=lambda x: x.get("size", 0), reverse=True)[:top_n]
+    def _iter_file_infos(
+        self,
+        directory: str,
+        max_depth: int = 3,
+        stat_filter: Optional[Callable[[os.stat_result], bool]] = None,
+    ) -> Iterator[Dict]:
+        """Lazily analyze every file below directory, without a file cap"""
+        file_entries = (
+            entry for entry in self._scandir_walk(directory, max_depth) if not _entry_is_dir(entry)
+        )
+        return self._analyze_entries(file_entries, stat_filter)
+
+    def find_largest_files(self, directory: str, top_n: int = 20) -> List[Dict]:
+        """Get the top N files below directory consuming the most space"""
+        return heapq.nlargest(top_n, self._iter_file_infos(directory), key=lambda x: x.get("size", 0))
 
     def get_old_files(self, directory: str, days_old: int = 30) -> List[Dict]:
         """Get files older than specified days"""
-        files = self.scan_directory(directory, max_files=1000)
-        cutoff_date = datetime.now() - timedelta(days=days_old)
-
-        old_files = []
-        for file_info in files:
-            modified = file_info.get("modified")
-            if modified and modified < cutoff_date:
-                old_files.append(file_info)
-
-        return sorted(old_files, key=lambda x: x.get("modified", datetime.now()))
+        cutoff = time.time() - days_old * 86400
+        old_files = self._iter_file_infos(directory, stat_filter=lambda st: st.st_mtime < cutoff)
+        return sorted(old_files, key=lambda x: x["modified"])
 
     def start_scan(self, scan_type: str = "full", categories: List[str] = None) -> Optional[int]:
         """Start a new scan and return scan ID"""
@@ -349,38 +986,64 @@ class FileAnalyzer:
             return None
             
         try:
-            # Calculate scan statistics
-            total_files = len(files_scanned)
-            total_size = sum(f.get("size", 0) for f in files_scanned)
             duration = (datetime.now() - self.scan_start_time).total_seconds() if self.scan_start_time else 0
             
-            # Categorize files
+            # Summary statistics, gathered while the file rows are written
+            total_files = len(files_scanned)
+            total_size = 0
+            deletable_size = 0
             categories = set()
+            safety_levels = Counter()
+            recommendations = Counter()
+            file_types = Counter()
+            
+            def file_rows() -> Iterator[Tuple]:
+                """FileRecord.to_row() tuples, updating the summary as they are consumed"""
+                nonlocal total_size, deletable_size
+                now = datetime.now().isoformat()
+                for file_info in files_scanned:
+                    path = file_info.get("path", "")
+                    size = file_info.get("size", 0)
+                    category = file_info.get("category") or self._categorize_file(path)
+                    recommendation = file_info.get("recommendation")
+                    
+                    total_size += size
+                    categories.add(category)
+                    safety_levels[file_info.get("safety_level", "unknown")] += 1
+                    recommendations[recommendation or "unknown"] += 1
+                    file_types[file_info.get("extension", "unknown")] += 1
+                    if recommendation in ("delete", "review"):
+                        deletable_size += size
+                    
+                    yield (
+                        self.current_scan_id,
+                        path,
+                        file_info.get("name", ""),
+                        size,
+                        _isoformat(file_info.get("modified"), now),
+                        _isoformat(file_info.get("created"), now),
+                        file_info.get("extension", ""),
+                        file_info.get("safety_level", "unknown"),
+                        file_info.get("importance_score", 50),
+                        recommendation or "review",
+                        category,
+                        False,
+                        None,
+                    )
+            
+            if total_files > self.bulk_load_threshold:
+                with self.db_manager.bulk_load_context():
+                    self.db_manager.save_file_rows(file_rows(), self.current_scan_id)
+            else:
+                self.db_manager.save_file_rows(file_rows(), self.current_scan_id)
+            
             scan_summary = {
-                "safety_levels": {},
-                "recommendations": {},
-                "file_types": {},
-                "total_deletable_size": 0
+                "safety_levels": dict(safety_levels),
+                "recommendations": dict(recommendations),
+                "file_types": dict(file_types),
+                "total_deletable_size": deletable_size
             }
             
-            for file_info in files_scanned:
-                # Determine category based on path
-                category = self._categorize_file(file_info.get("path", ""))
-                categories.add(category)
-                
-                # Update summary statistics
-                safety = file_info.get("safety_level", "unknown")
-                scan_summary["safety_levels"][safety] = scan_summary["safety_levels"].get(safety, 0) + 1
-                
-                recommendation = file_info.get("recommendation", "unknown")
-                scan_summary["recommendations"][recommendation] = scan_summary["recommendations"].get(recommendation, 0) + 1
-                
-                file_type = file_info.get("extension", "unknown")
-                scan_summary["file_types"][file_type] = scan_summary["file_types"].get(file_type, 0) + 1
-                
-                if recommendation in ["delete", "review"]:
-                    scan_summary["total_deletable_size"] += file_info.get("size", 0)
-            
             # Update scan record
             scan_record = ScanRecord(
                 id=self.current_scan_id,
@@ -400,27 +1063,6 @@ class FileAnalyzer:
             # Save updated scan record
             self.db_manager.save_scan_record(scan_record)
             
-            # Save file records
-            file_records = []
-            for file_info in files_scanned:
-                file_record = FileRecord(
-                    scan_id=self.current_scan_id,
-                    file_path=file_info.get("path", ""),
-                    file_name=file_info.get("name", ""),
-                    file_size=file_info.get("size", 0),
-                    modified_time=file_info.get("modified", datetime.now()),
-                    created_time=file_info.get("created", datetime.now()),
-                    file_type=file_info.get("extension", ""),
-                    safety_level=file_info.get("safety_level", "unknown"),
-                    importance_score=file_info.get("importance_score", 50),
-                    recommendation=file_info.get("recommendation", "review"),
-                    category=self._categorize_file(file_info.get("path", "")),
-                    was_deleted=False
-                )
-                file_records.append(file_record)
-            
-            self.db_manager.save_file_records(file_records, self.current_scan_id)
-            
             # Save system snapshot
             self._save_system_snapshot()
             
@@ -438,26 +1080,9 @@ class FileAnalyzer:
 
     def _categorize_file(self, file_path: str) -> str:
         """Categorize file based on its path"""
-        path_lower = file_path.lower()
-        
-        if any(cache_dir in path_lower for cache_dir in ["/cache/", "/caches/", "/tmp/"]):
-            return "cache"
-        elif any(log_dir in path_lower for log_dir in ["/log/", "/logs/"]):
-            return "logs"
-        elif "/trash/" in path_lower or ".trash" in path_lower:
-            return "trash"
-        elif any(browser_dir in path_lower for browser_dir in ["/chrome/", "/firefox/", "/safari/"]):
-            return "browser"
-        elif any(dev_dir in path_lower for dev_dir in ["/node_modules/", "/.git/", "/build/", "/dist/"]):
-            return "development"
-        elif any(media_dir in path_lower for media_dir in ["/movies/", "/music/", "/pictures/", "/photos/"]):
-            return "media"
-        elif any(doc_dir in path_lower for doc_dir in ["/documents/", "/desktop/", "/downloads/"]):
-            return "documents"
-        elif any(sys_dir in path_lower for sys_dir in ["/library/", "/system/", "/usr/"]):
-            return "system"
-        else:
-            return "other"
+        mask = _CATEGORY_MATCHER.mask(file_path.lower())
+        # The lowest set bit is the first category in _CATEGORY_FRAGMENTS
+        return _CATEGORY_BITS.get(mask & -mask, "other")
 
     def _save_system_snapshot(self) -> None:
         """Save current system snapshot to database"""
@@ -465,6 +1090,9 @@ class FileAnalyzer:
             return
             
         try:
+            import platform
+            import shutil
+            
             # Get disk usage
             disk_usage = shutil.disk_usage("/")
             
@@ -477,7 +1105,9 @@ class FileAnalyzer:
                 "processor": platform.processor()
             }
             
-            # Get memory info
+            # Get memory info; psutil is only needed when snapshots are saved
+            import psutil
+            
             memory = psutil.virtual_memory()
             memory_info = {
                 "total": memory.total,
@@ -539,4 +1169,4 @@ class FileAnalyzer:
             self.db_manager.mark_files_deleted(file_paths)
 
 
-__all__ = ["FileAnalyzer"]
+__all__ = ["FileAnalyzer", "FileInfo"]
@@ -7,11 +7,21 @@ Licensed under the MIT License
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox, scrolledtext
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib
+# Charts are rendered off-screen and shown as Tk images, never by pyplot, so
+# no interactive backend needs to be set up
+matplotlib.use('Agg')
+import matplotlib.style as mplstyle
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
+import numpy as np
 import json
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
@@ -24,6 +34,64 @@ sys.path.insert(0, str(ROOT))
 from src.mac_cleaner.file_analyzer import FileAnalyzer
 from src.mac_cleaner.core.database import DatabaseManager
 
+# Threads running dashboard queries; each worker keeps its own WAL
+# connection, so independent queries overlap
+_DB_WORKERS = 4
+
+# How often the Tk thread picks up finished queries
+_RESULT_POLL_MS = 50
+
+# Quiet period after a combobox selection before the data is reloaded
+_RELOAD_DELAY_MS = 200
+
+# Top consumers are fetched in pages of this many rows, the next one once
+# the tree is scrolled past this fraction of the rows already loaded. Each
+# page is its own LIMIT/OFFSET query, as consecutive pages may run on
+# different workers and so cannot share a cursor
+_CONSUMERS_PAGE_SIZE = 25
+_CONSUMERS_PREFETCH_AT = 0.9
+
+# Coarser path simplification and chunked Agg paths for the dashboard charts
+mplstyle.use('fast')
+
+# Named fonts, registered with Tk once and then referred to by name
+_FONTS = {
+    'SFTitle': {'family': 'SF Pro Display', 'size': 24, 'weight': 'bold'},
+    'SFSubtitle': {'family': 'SF Pro Text', 'size': 12},
+    'SFHeader': {'family': 'SF Pro Text', 'size': 14, 'weight': 'bold'},
+    'SFData': {'family': 'SF Pro Text', 'size': 11},
+    'SFBold': {'family': 'SF Pro Text', 'size': 11, 'weight': 'bold'},
+    'SFMono': {'family': 'SF Mono', 'size': 10},
+}
+
+# Leading "YYYY-MM-DD HH:MM" of an ISO timestamp, with either separator
+_ISO_MINUTE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+def format_minute(timestamp):
+    """Format an ISO timestamp as 'YYYY-MM-DD HH:MM'"""
+    # Slicing skips building a datetime for the usual ISO strings
+    if _ISO_MINUTE.match(timestamp):
+        return timestamp[:16].replace('T', ' ')
+    return datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def format_bytes(bytes_count):
+    """Format bytes into human readable string"""
+    if not bytes_count:
+        return "0 B"
+    return _format_nonzero_bytes(bytes_count)
+
+
+@lru_cache(maxsize=8192)
+def _format_nonzero_bytes(bytes_count):
+    # Dashboard sizes repeat a lot across the trees, cards and charts
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if bytes_count < 1024.0:
+            return f"{bytes_count:.1f} {unit}"
+        bytes_count /= 1024.0
+    return f"{bytes_count:.1f} PB"
+
 
 class AnalyticsGUI:
     def __init__(self):
@@ -36,25 +104,38 @@ class AnalyticsGUI:
         self.db_manager = DatabaseManager()
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         
+        # Queries run on worker threads, and only the Tk thread touches widgets
+        self._db_pool = ThreadPoolExecutor(max_workers=_DB_WORKERS, thread_name_prefix="db")
+        # The analytics figure is only ever touched by this single thread
+        self._render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._db_results = queue.Queue()
+        
+        # after() ids of debounced reloads, by key
+        self._pending = {}
+        
         # Setup GUI
         self.setup_styles()
         self.create_widgets()
         self.load_data()
+        self.root.after(_RESULT_POLL_MS, self._drain_db_results)
         
     def setup_styles(self):
         """Setup modern macOS-style GUI"""
         self.root.configure(bg='#f0f0f0')
         
+        # Tk drops a named font once its Font object is collected
+        self.fonts = {name: tkfont.Font(root=self.root, name=name, **options) for name, options in _FONTS.items()}
+        
         # Configure styles
         style = ttk.Style()
         style.theme_use('clam')
         
         # Configure colors
-        style.configure('Title.TLabel', background='#f0f0f0', foreground='#333333', font=('SF Pro Display', 24, 'bold'))
-        style.configure('Subtitle.TLabel', background='#f0f0f0', foreground='#666666', font=('SF Pro Text', 12))
+        style.configure('Title.TLabel', background='#f0f0f0', foreground='#333333', font='SFTitle')
+        style.configure('Subtitle.TLabel', background='#f0f0f0', foreground='#666666', font='SFSubtitle')
         style.configure('Card.TFrame', background='white', relief='raised', borderwidth=1)
-        style.configure('Header.TLabel', background='white', foreground='#333333', font=('SF Pro Text', 14, 'bold'))
-        style.configure('Data.TLabel', background='white', foreground='#666666', font=('SF Pro Text', 11))
+        style.configure('Header.TLabel', background='white', foreground='#333333', font='SFHeader')
+        style.configure('Data.TLabel', background='white', foreground='#666666', font='SFData')
         
     def create_widgets(self):
         """Create main GUI widgets"""
@@ -120,7 +201,7 @@ class AnalyticsGUI:
             frame.grid(row=i//2, column=i%2, sticky='w', padx=10, pady=5)
             
             ttk.Label(frame, text=label, style='Data.TLabel').pack(side='left')
-            value_label = ttk.Label(frame, text=default, style='Data.TLabel', font=('SF Pro Text', 11, 'bold'))
+            value_label = ttk.Label(frame, text=default, style='Data.TLabel', font='SFBold')
             value_label.pack(side='left', padx=(10, 0))
             self.db_stats_labels[key] = value_label
             
@@ -134,7 +215,7 @@ class AnalyticsGUI:
         header.pack(padx=15, pady=(15, 10))
         
         # Activity text
-        self.activity_text = scrolledtext.ScrolledText(card, height=8, wrap='word', font=('SF Mono', 10))
+        self.activity_text = scrolledtext.ScrolledText(card, height=8, wrap='word', font='SFMono')
         self.activity_text.pack(fill='x', padx=15, pady=(0, 15))
         
     def create_system_info_card(self, parent):
@@ -150,6 +231,30 @@ class AnalyticsGUI:
         self.system_info_container = ttk.Frame(card)
         self.system_info_container.pack(fill='x', padx=15, pady=(0, 15))
         
+        self.no_system_info_label = ttk.Label(self.system_info_container, text="No system data available",
+                                              style='Data.TLabel')
+        
+        # Value labels, updated in place on refresh
+        self.system_info_grid = ttk.Frame(self.system_info_container)
+        self.sys_info_labels = {}
+        info_items = [
+            ("Platform:", "platform"),
+            ("Release:", "release"),
+            ("Total Disk Space:", "total_disk_space"),
+            ("Used Space:", "used_space"),
+            ("Free Space:", "free_space"),
+            ("Memory Usage:", "memory_usage"),
+        ]
+        
+        for i, (label, key) in enumerate(info_items):
+            frame = ttk.Frame(self.system_info_grid)
+            frame.grid(row=i//2, column=i%2, sticky='w', padx=10, pady=5)
+            
+            ttk.Label(frame, text=label, style='Data.TLabel').pack(side='left')
+            value_label = ttk.Label(frame, style='Data.TLabel', font='SFBold')
+            value_label.pack(side='left', padx=(10, 0))
+            self.sys_info_labels[key] = value_label
+        
     def create_scan_history_tab(self):
         """Create scan history tab"""
         history_frame = ttk.Frame(self.notebook)
@@ -169,7 +274,7 @@ class AnalyticsGUI:
         limit_combo = ttk.Combobox(controls_frame, textvariable=self.history_limit_var, 
                                    values=["10", "25", "50", "100", "All"], width=10, state='readonly')
         limit_combo.pack(side='left', padx=(10, 20))
-        limit_combo.bind('<<ComboboxSelected>>', lambda e: self.load_scan_history())
+        limit_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce('history', self.load_scan_history))
         
         refresh_btn = ttk.Button(controls_frame, text="Refresh", command=self.load_scan_history)
         refresh_btn.pack(side='left')
@@ -231,7 +336,7 @@ class AnalyticsGUI:
         period_combo = ttk.Combobox(controls_frame, textvariable=self.analytics_period_var,
                                     values=["7", "30", "90", "365"], width=10, state='readonly')
         period_combo.pack(side='left', padx=(10, 20))
-        period_combo.bind('<<ComboboxSelected>>', lambda e: self.load_analytics())
+        period_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce('analytics', self.load_analytics))
         
         refresh_btn = ttk.Button(controls_frame, text="Refresh", command=self.load_analytics)
         refresh_btn.pack(side='left')
@@ -240,6 +345,34 @@ class AnalyticsGUI:
         self.charts_frame = ttk.Frame(container)
         self.charts_frame.pack(fill='both', expand=True)
         
+        # One figure for the tab, rendered off-screen by the render thread
+        # and redrawn in place on every refresh
+        self.fig = Figure(figsize=(12, 8), dpi=100)
+        self.fig.patch.set_facecolor('white')
+        self.daily_ax = self.fig.add_subplot(2, 2, 1)
+        self.category_ax = self.fig.add_subplot(2, 2, 2)
+        self.safety_ax = self.fig.add_subplot(2, 2, 3)
+        self.stats_ax = self.fig.add_subplot(2, 2, 4)
+        self.chart_canvas = FigureCanvasAgg(self.fig)
+        
+        # Charts drawn without the statistics text, for refreshes where only
+        # the statistics changed
+        self._stats_artist = None
+        self._chart_data = None
+        self._charts_background = None
+        
+        # The rendered pixels, shown as a photo image reused across refreshes
+        self.chart_image = tk.PhotoImage(master=self.root)
+        self.chart_label = tk.Label(self.charts_frame, image=self.chart_image, bg='white',
+                                    bd=0, highlightthickness=0)
+        self.chart_label.pack(fill='both', expand=True)
+        self._analytics = None
+        self._chart_size = None
+        self.charts_frame.bind('<Configure>', self._on_charts_configure)
+        
+        self.no_analytics_label = ttk.Label(self.charts_frame, text="No analytics data available",
+                                            style='Data.TLabel')
+        
     def create_top_consumers_tab(self):
         """Create top space consumers tab"""
         consumers_frame = ttk.Frame(self.notebook)
@@ -259,7 +392,7 @@ class AnalyticsGUI:
         period_combo = ttk.Combobox(controls_frame, textvariable=self.consumers_period_var,
                                     values=["7", "30", "90", "365"], width=10, state='readonly')
         period_combo.pack(side='left', padx=(10, 20))
-        period_combo.bind('<<ComboboxSelected>>', lambda e: self.load_top_consumers())
+        period_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce('consumers', self.load_top_consumers))
         
         ttk.Label(controls_frame, text="Limit:", style='Data.TLabel').pack(side='left', padx=(20, 10))
         
@@ -267,7 +400,7 @@ class AnalyticsGUI:
         limit_combo = ttk.Combobox(controls_frame, textvariable=self.consumers_limit_var,
                                    values=["10", "20", "50", "100"], width=10, state='readonly')
         limit_combo.pack(side='left', padx=(0, 20))
-        limit_combo.bind('<<ComboboxSelected>>', lambda e: self.load_top_consumers())
+        limit_combo.bind('<<ComboboxSelected>>', lambda e: self._debounce('consumers', self.load_top_consumers))
         
         refresh_btn = ttk.Button(controls_frame, text="Refresh", command=self.load_top_consumers)
         refresh_btn.pack(side='left')
@@ -291,7 +424,16 @@ class AnalyticsGUI:
         # Treeview
         columns = ('File Path', 'File Name', 'Size', 'Safety Level', 'Category', 'Recommendation', 'Modified')
         self.consumers_tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=20,
-                                          yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+                                          yscrollcommand=self._on_consumers_scroll,
+                                          xscrollcommand=x_scrollbar.set)
+        self.consumers_y_scrollbar = y_scrollbar
+        
+        # Paging state of the rows shown in the tree
+        self._consumers_query = None
+        self._consumers_generation = 0
+        self._consumers_loaded = 0
+        self._consumers_loading = False
+        self._consumers_done = True
         
         # Configure columns
         column_widths = {'File Path': 300, 'File Name': 200, 'Size': 100, 'Safety Level': 100,
@@ -308,270 +450,496 @@ class AnalyticsGUI:
         x_scrollbar.config(command=self.consumers_tree.xview)
         
     def load_data(self):
-        """Load all data"""
-        self.load_database_stats()
-        self.load_recent_activity()
-        self.load_system_info()
-        self.load_scan_history()
-        self.load_analytics()
-        self.load_top_consumers()
-        
-    def load_database_stats(self):
-        """Load database statistics"""
+        """Load all data in one database round trip"""
         try:
-            stats = self.db_manager.get_database_stats()
-            
-            self.db_stats_labels['total_scans'].config(text=str(stats['scan_records']))
-            self.db_stats_labels['total_files'].config(text=f"{stats['file_records']:,}")
-            self.db_stats_labels['db_size'].config(text=stats['database_size_human'])
-            
-            date_range = stats['date_range']
-            if date_range['earliest'] and date_range['latest']:
-                start = datetime.fromisoformat(date_range['earliest']).strftime('%Y-%m-%d')
-                end = datetime.fromisoformat(date_range['latest']).strftime('%Y-%m-%d')
-                self.db_stats_labels['date_range'].config(text=f"{start} to {end}")
-            else:
-                self.db_stats_labels['date_range'].config(text="No data")
+            analytics_days = int(self.analytics_period_var.get())
+            consumers_days = int(self.consumers_period_var.get())
+            consumers_limit = int(self.consumers_limit_var.get())
+        except ValueError as e:
+            self._dashboard_error(e)
+            return
+        history_limit = self._history_limit()
+        
+        self._start_consumers_load(consumers_days, consumers_limit)
+        generation = self._consumers_generation
+        count = min(_CONSUMERS_PAGE_SIZE, consumers_limit)
+        self._consumers_loading = True
+        
+        self._run_query(
+            lambda: self.db_manager.get_dashboard_bundle(
+                history_limit=history_limit,
+                analytics_days=analytics_days,
+                consumers_days=consumers_days,
+                consumers_limit=count,
+            ),
+            lambda bundle: self._show_dashboard(bundle, generation, count),
+            self._dashboard_error,
+        )
+        
+    def _show_dashboard(self, bundle, generation, consumers_requested):
+        """Hand each part of a dashboard bundle to the widgets showing it"""
+        parts = (
+            (self._show_database_stats, bundle['stats'], self._database_stats_error),
+            (self._show_recent_activity, bundle['activity'], self._recent_activity_error),
+            (self._show_system_info, bundle['snapshots'], self._system_info_error),
+            (self._show_scan_history, bundle['history'], self._scan_history_error),
+            (self._show_analytics, bundle['analytics'], self._analytics_error),
+            (lambda consumers: self._show_top_consumers(consumers, generation, consumers_requested),
+             bundle['consumers'], self._top_consumers_error),
+        )
+        for show, data, on_error in parts:
+            try:
+                show(data)
+            except Exception as e:
+                on_error(e)
                 
-        except Exception as e:
-            self.logger.error(f"Error loading database stats: {e}")
+    def _dashboard_error(self, e):
+        """Log a failed dashboard query"""
+        self._consumers_loading = False
+        self._consumers_done = True
+        self.logger.error(f"Error loading dashboard: {e}")
+        
+    def _debounce(self, key, load, delay=_RELOAD_DELAY_MS):
+        """Call load once no other call with the same key came in for delay ms"""
+        if key in self._pending:
+            self.root.after_cancel(self._pending[key])
             
+        def fire():
+            del self._pending[key]
+            load()
+            
+        self._pending[key] = self.root.after(delay, fire)
+        
+    def _run_query(self, query, apply, on_error, pool=None):
+        """Run query() on a database thread and apply(result) on the Tk thread
+        
+        on_error is called with the exception if either step fails. pool
+        picks another executor than the database threads.
+        """
+        future = (pool or self._db_pool).submit(query)
+        future.add_done_callback(lambda f: self._db_results.put((f, apply, on_error)))
+        
+    def _drain_db_results(self):
+        """Apply the results of finished background work to the widgets"""
+        while True:
+            try:
+                future, apply, on_error = self._db_results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                apply(future.result())
+            except Exception as e:
+                on_error(e)
+        self.root.after(_RESULT_POLL_MS, self._drain_db_results)
+        
+    def load_database_stats(self):
+        """Load database statistics"""
+        self._run_query(self.db_manager.get_database_stats, self._show_database_stats, self._database_stats_error)
+        
+    def _show_database_stats(self, stats):
+        """Fill in the database statistics card"""
+        self.db_stats_labels['total_scans'].config(text=str(stats['scan_records']))
+        self.db_stats_labels['total_files'].config(text=f"{stats['file_records']:,}")
+        self.db_stats_labels['db_size'].config(text=stats['database_size_human'])
+        
+        date_range = stats['date_range']
+        if date_range['earliest'] and date_range['latest']:
+            start = datetime.fromisoformat(date_range['earliest']).strftime('%Y-%m-%d')
+            end = datetime.fromisoformat(date_range['latest']).strftime('%Y-%m-%d')
+            self.db_stats_labels['date_range'].config(text=f"{start} to {end}")
+        else:
+            self.db_stats_labels['date_range'].config(text="No data")
+        
+    def _database_stats_error(self, e):
+        """Log a failed database statistics query"""
+        self.logger.error(f"Error loading database stats: {e}")
+        
     def load_recent_activity(self):
         """Load recent activity"""
-        try:
-            # Get recent scans
-            scans = self.db_manager.get_scan_history(limit=10)
+        # Get recent scans
+        self._run_query(
+            lambda: self.db_manager.get_scan_history(limit=10), self._show_recent_activity, self._recent_activity_error
+        )
+        
+    def _show_recent_activity(self, scans):
+        """Fill in the recent activity card"""
+        if not scans:
+            self._set_activity_text("No recent activity found.\n")
+            return
             
-            self.activity_text.delete(1.0, tk.END)
+        parts = []
+        for scan in scans:
+            date_str = format_minute(scan['timestamp'])
             
-            if not scans:
-                self.activity_text.insert(tk.END, "No recent activity found.\n")
-                return
-                
-            for scan in scans:
-                timestamp = datetime.fromisoformat(scan['timestamp'])
-                date_str = timestamp.strftime('%Y-%m-%d %H:%M')
-                
-                activity = f"[{date_str}] {scan['scan_type'].title()} scan completed\n"
-                activity += f"  Files: {scan['total_files_scanned']:,}, "
-                activity += f"Size: {self.format_bytes(scan['total_size_scanned'])}, "
-                activity += f"Duration: {scan['duration_seconds']:.1f}s\n"
-                
-                if scan['space_freed'] > 0:
-                    activity += f"  Space freed: {self.format_bytes(scan['space_freed'])}\n"
-                    
-                if scan['files_deleted'] > 0:
-                    activity += f"  Files deleted: {scan['files_deleted']:,}\n"
-                    
-                activity += f"  Status: {'✓ Success' if scan['success'] else '✗ Failed'}\n\n"
+            activity = f"[{date_str}] {scan['scan_type'].title()} scan completed\n"
+            activity += f"  Files: {scan['total_files_scanned']:,}, "
+            activity += f"Size: {format_bytes(scan['total_size_scanned'])}, "
+            activity += f"Duration: {scan['duration_seconds']:.1f}s\n"
+            
+            if scan['space_freed'] > 0:
+                activity += f"  Space freed: {format_bytes(scan['space_freed'])}\n"
                 
-                self.activity_text.insert(tk.END, activity)
+            if scan['files_deleted'] > 0:
+                activity += f"  Files deleted: {scan['files_deleted']:,}\n"
                 
-        except Exception as e:
-            self.logger.error(f"Error loading recent activity: {e}")
-            self.activity_text.delete(1.0, tk.END)
-            self.activity_text.insert(tk.END, f"Error loading activity: {e}")
+            activity += f"  Status: {'✓ Success' if scan['success'] else '✗ Failed'}\n\n"
+            
+            parts.append(activity)
             
+        self._set_activity_text(''.join(parts))
+        
+    def _set_activity_text(self, text):
+        """Replace the read-only activity text in one insert"""
+        self.activity_text.config(state='normal')
+        self.activity_text.delete(1.0, tk.END)
+        self.activity_text.insert(tk.END, text)
+        self.activity_text.config(state='disabled')
+        
+    def _recent_activity_error(self, e):
+        """Show a failed recent activity query"""
+        self.logger.error(f"Error loading recent activity: {e}")
+        self._set_activity_text(f"Error loading activity: {e}")
+        
     def load_system_info(self):
         """Load system information"""
-        try:
-            # Clear existing widgets
-            for widget in self.system_info_container.winfo_children():
-                widget.destroy()
-                
-            # Get latest system snapshot
-            snapshots = self.db_manager.get_system_snapshots(days=7)
+        # Get latest system snapshot
+        self._run_query(
+            lambda: self.db_manager.get_system_snapshots(days=7), self._show_system_info, self._system_info_error
+        )
+        
+    def _show_system_info(self, snapshots):
+        """Fill in the system information card"""
+        if not snapshots:
+            self.system_info_grid.pack_forget()
+            self.no_system_info_label.pack()
+            return
             
-            if not snapshots:
-                ttk.Label(self.system_info_container, text="No system data available", 
-                         style='Data.TLabel').pack()
-                return
-                
-            latest = snapshots[0]
-            
-            # Display system info
-            info_items = [
-                ("Platform:", latest['platform_info'].get('system', 'Unknown')),
-                ("Release:", latest['platform_info'].get('release', 'Unknown')),
-                ("Total Disk Space:", self.format_bytes(latest['total_disk_space'])),
-                ("Used Space:", self.format_bytes(latest['used_space'])),
-                ("Free Space:", self.format_bytes(latest['free_space'])),
-                ("Memory Usage:", f"{latest['memory_info'].get('percent', 0):.1f}%"),
-            ]
-            
-            for i, (label, value) in enumerate(info_items):
-                frame = ttk.Frame(self.system_info_container)
-                frame.grid(row=i//2, column=i%2, sticky='w', padx=10, pady=5)
-                
-                ttk.Label(frame, text=label, style='Data.TLabel').pack(side='left')
-                ttk.Label(frame, text=value, style='Data.TLabel', 
-                         font=('SF Pro Text', 11, 'bold')).pack(side='left', padx=(10, 0))
-                
-        except Exception as e:
-            self.logger.error(f"Error loading system info: {e}")
+        latest = snapshots[0]
+        
+        # Display system info
+        values = {
+            "platform": latest['platform_info'].get('system', 'Unknown'),
+            "release": latest['platform_info'].get('release', 'Unknown'),
+            "total_disk_space": format_bytes(latest['total_disk_space']),
+            "used_space": format_bytes(latest['used_space']),
+            "free_space": format_bytes(latest['free_space']),
+            "memory_usage": f"{latest['memory_info'].get('percent', 0):.1f}%",
+        }
+        for key, value in values.items():
+            self.sys_info_labels[key].config(text=value)
             
+        self.no_system_info_label.pack_forget()
+        self.system_info_grid.pack(fill='x')
+        
+    def _system_info_error(self, e):
+        """Log a failed system information query"""
+        self.logger.error(f"Error loading system info: {e}")
+        
     def load_scan_history(self):
         """Load scan history"""
-        try:
-            limit = self.history_limit_var.get()
-            limit = int(limit) if limit.isdigit() else 50
-            
-            scans = self.db_manager.get_scan_history(limit=limit)
-            
-            # Clear existing items
-            for item in self.history_tree.get_children():
-                self.history_tree.delete(item)
-                
-            # Add scans to tree
-            for scan in scans:
-                timestamp = datetime.fromisoformat(scan['timestamp'])
-                date_str = timestamp.strftime('%Y-%m-%d %H:%M')
-                
-                values = (
-                    date_str,
-                    scan['scan_type'].title(),
-                    f"{scan['total_files_scanned']:,}",
-                    self.format_bytes(scan['total_size_scanned']),
-                    f"{scan['duration_seconds']:.1f}s",
-                    self.format_bytes(scan['space_freed']),
-                    "✓ Success" if scan['success'] else "✗ Failed"
-                )
-                
-                self.history_tree.insert('', 'end', values=values, tags=(scan['id'],))
-                
-        except Exception as e:
-            self.logger.error(f"Error loading scan history: {e}")
-            messagebox.showerror("Error", f"Failed to load scan history: {e}")
-            
+        limit = self._history_limit()
+        
+        self._run_query(
+            lambda: self.db_manager.get_scan_history(limit=limit), self._show_scan_history, self._scan_history_error
+        )
+        
+    def _history_limit(self):
+        """Number of scans picked for the history tab"""
+        limit = self.history_limit_var.get()
+        return int(limit) if limit.isdigit() else 50
+        
+    def _show_scan_history(self, scans):
+        """Fill the scan history tree"""
+        rows = [(self._scan_history_row(scan), (scan['id'],)) for scan in scans]
+        self._fill_tree(self.history_tree, rows)
+        
+    def _scan_history_row(self, scan):
+        """Scan history tree values of a scan record"""
+        date_str = format_minute(scan['timestamp'])
+        
+        return (
+            date_str,
+            scan['scan_type'].title(),
+            f"{scan['total_files_scanned']:,}",
+            format_bytes(scan['total_size_scanned']),
+            f"{scan['duration_seconds']:.1f}s",
+            format_bytes(scan['space_freed']),
+            "✓ Success" if scan['success'] else "✗ Failed"
+        )
+        
+    def _fill_tree(self, tree, rows):
+        """Replace the items of a tree with (values, tags) rows
+        
+        The tree is unmapped while it fills, so Tk lays it out once.
+        """
+        tree.delete(*tree.get_children())
+        tree.pack_forget()
+        for values, tags in rows:
+            tree.insert('', 'end', values=values, tags=tags)
+        tree.pack(fill='both', expand=True)
+        
+    def _scan_history_error(self, e):
+        """Report a failed scan history query"""
+        self.logger.error(f"Error loading scan history: {e}")
+        messagebox.showerror("Error", f"Failed to load scan history: {e}")
+        
     def load_analytics(self):
         """Load analytics and create charts"""
         try:
             days = int(self.analytics_period_var.get())
-            analytics = self.db_manager.get_analytics_summary(days=days)
+        except ValueError as e:
+            self._analytics_error(e)
+            return
             
-            # Clear existing charts
-            for widget in self.charts_frame.winfo_children():
-                widget.destroy()
-                
-            if not analytics or 'scan_statistics' not in analytics:
-                ttk.Label(self.charts_frame, text="No analytics data available", 
-                         style='Data.TLabel').pack()
-                return
-                
-            # Create charts
-            self.create_analytics_charts(analytics)
+        self._run_query(
+            lambda: self.db_manager.get_analytics_summary(days=days), self._show_analytics, self._analytics_error
+        )
+        
+    def _show_analytics(self, analytics):
+        """Redraw the charts for freshly loaded analytics"""
+        if not analytics or 'scan_statistics' not in analytics:
+            self.chart_label.pack_forget()
+            self.no_analytics_label.pack()
+            return
             
-        except Exception as e:
-            self.logger.error(f"Error loading analytics: {e}")
+        self.no_analytics_label.pack_forget()
+        self.chart_label.pack(fill='both', expand=True)
+        
+        # Update charts
+        self._analytics = analytics
+        self._render_charts()
+        
+    def _render_charts(self):
+        """Render the current analytics on the render thread, then show them"""
+        analytics, size = self._analytics, self._chart_size
+        self._run_query(
+            lambda: self.create_analytics_charts(analytics, size),
+            self._show_chart_image,
+            self._analytics_error,
+            pool=self._render_pool,
+        )
+        
+    def _show_chart_image(self, ppm):
+        """Show freshly rendered charts"""
+        self.chart_image.configure(data=ppm, format='PPM')
+        
+    def _on_charts_configure(self, event):
+        """Re-render the charts at the size of the frame once resizing settles"""
+        self._debounce('chart_size', lambda: self._resize_charts(event.width, event.height))
+        
+    def _resize_charts(self, width, height):
+        """Render the charts at a new size"""
+        if (width, height) == self._chart_size or min(width, height) < 100:
+            return
+        self._chart_size = (width, height)
+        if self._analytics is not None:
+            self._render_charts()
+        
+    def _analytics_error(self, e):
+        """Log a failed analytics query"""
+        self.logger.error(f"Error loading analytics: {e}")
+        
+    def create_analytics_charts(self, analytics, size=None):
+        """Redraw the analytics charts on the persistent figure
+        
+        Runs on the render thread and returns the rendered charts as PPM
+        data. size is the (width, height) in pixels to render at, if it
+        should change.
+        """
+        if size is not None and size != self.chart_canvas.get_width_height():
+            self.fig.set_size_inches(size[0] / self.fig.dpi, size[1] / self.fig.dpi)
+            self._chart_data = None
             
-    def create_analytics_charts(self, analytics):
-        """Create analytics charts"""
-        # Create figure with subplots
-        fig = Figure(figsize=(12, 8), dpi=100)
-        fig.patch.set_facecolor('white')
+
+        stats = analytics['scan_statistics']
+        stats_text = f"""
+        Scan Statistics (Last {analytics['period_days']} days)
         
+        Total Scans: {stats['total_scans'] or 0}
+        Files Analyzed: {stats['total_files'] or 0:,}
+        Size Processed: {format_bytes(stats['total_size'] or 0)}
+        Space Freed: {format_bytes(stats['total_space_freed'] or 0)}
+        Files Deleted: {stats['total_files_deleted'] or 0:,}
+        Success Rate: {(stats['successful_scans'] or 0) / max(stats['total_scans'] or 1, 1) * 100:.1f}%
+        Avg Duration: {stats['avg_duration'] or 0:.1f}s
+        """
+        
+        chart_data = (
+            (analytics.get('daily_scans') or [])[:10],
+            (analytics.get('category_breakdown') or [])[:8],
+            analytics.get('safety_breakdown') or [],
+        )
+        if chart_data == self._chart_data and self._charts_background is not None:
+            # Only the statistics changed: draw the new text over the cached charts
+            self._stats_artist.set_text(stats_text)
+            self.chart_canvas.restore_region(self._charts_background)
+            self.stats_ax.draw_artist(self._stats_artist)
+            return self._chart_ppm()
+        self._chart_data = chart_data
+        
+        for ax in (self.daily_ax, self.category_ax, self.safety_ax, self.stats_ax):
+            ax.cla()
+            
         # Daily scans chart
+        self.daily_ax.set_visible(bool(analytics.get('daily_scans')))
         if analytics.get('daily_scans'):
-            ax1 = fig.add_subplot(2, 2, 1)
+            ax1 = self.daily_ax
             daily_data = analytics['daily_scans']
             dates = [d['date'] for d in daily_data[:10]]  # Last 10 days
-            counts = [d['scans'] for d in daily_data[:10]]
+            counts = np.fromiter((d['scans'] for d in daily_data[:10]), dtype=np.int64, count=len(dates))
+            positions = np.arange(len(dates))
             
-            ax1.bar(range(len(dates)), counts, color='#007AFF', alpha=0.7)
+            ax1.bar(positions, counts, color='#007AFF', alpha=0.7)
             ax1.set_title('Daily Scans (Last 10 days)', fontweight='bold')
             ax1.set_xlabel('Date')
             ax1.set_ylabel('Number of Scans')
-            ax1.set_xticks(range(len(dates)))
+            ax1.set_xticks(positions)
             ax1.set_xticklabels([d[-5:] for d in dates], rotation=45)
             
         # Category breakdown chart
+        self.category_ax.set_visible(bool(analytics.get('category_breakdown')))
         if analytics.get('category_breakdown'):
-            ax2 = fig.add_subplot(2, 2, 2)
+            ax2 = self.category_ax
             category_data = analytics['category_breakdown'][:8]  # Top 8 categories
             
             categories = [c['category'] for c in category_data]
-            sizes = [c['total_size'] for c in category_data]
+            sizes = np.fromiter((c['total_size'] for c in category_data), dtype=np.int64, count=len(category_data))
             
             ax2.pie(sizes, labels=categories, autopct='%1.1f%%', startangle=90)
             ax2.set_title('Space by Category', fontweight='bold')
             
         # Safety level chart
+        self.safety_ax.set_visible(bool(analytics.get('safety_breakdown')))
         if analytics.get('safety_breakdown'):
-            ax3 = fig.add_subplot(2, 2, 3)
+            ax3 = self.safety_ax
             safety_data = analytics['safety_breakdown']
             
             safety_levels = [s['safety_level'] for s in safety_data]
-            counts = [s['count'] for s in safety_data]
+            counts = np.fromiter((s['count'] for s in safety_data), dtype=np.int64, count=len(safety_data))
+            positions = np.arange(len(safety_levels))
             
             colors = {'critical': '#FF3B30', 'important': '#FF9500', 'moderate': '#FFCC00',
                      'safe': '#34C759', 'very_safe': '#30D158'}
             bar_colors = [colors.get(level, '#8E8E93') for level in safety_levels]
             
-            ax3.bar(safety_levels, counts, color=bar_colors, alpha=0.7)
+            ax3.bar(positions, counts, color=bar_colors, alpha=0.7)
+            ax3.set_xticks(positions)
+            ax3.set_xticklabels(safety_levels)
             ax3.set_title('Files by Safety Level', fontweight='bold')
             ax3.set_xlabel('Safety Level')
             ax3.set_ylabel('Number of Files')
             ax3.tick_params(axis='x', rotation=45)
             
         # Statistics text
-        ax4 = fig.add_subplot(2, 2, 4)
+        ax4 = self.stats_ax
         ax4.axis('off')
         
-        stats = analytics['scan_statistics']
-        stats_text = f"""
-        Scan Statistics (Last {analytics['period_days']} days)
-        
-        Total Scans: {stats['total_scans'] or 0}
-        Files Analyzed: {stats['total_files'] or 0:,}
-        Size Processed: {self.format_bytes(stats['total_size'] or 0)}
-        Space Freed: {self.format_bytes(stats['total_space_freed'] or 0)}
-        Files Deleted: {stats['total_files_deleted'] or 0:,}
-        Success Rate: {(stats['successful_scans'] or 0) / max(stats['total_scans'] or 1, 1) * 100:.1f}%
-        Avg Duration: {stats['avg_duration'] or 0:.1f}s
-        """
+        # Animated, so full draws leave it out of the cached background
+        self._stats_artist = ax4.text(0.1, 0.9, stats_text, transform=ax4.transAxes, fontsize=10,
+                                      verticalalignment='top', fontfamily='monospace', animated=True)
         
-        ax4.text(0.1, 0.9, stats_text, transform=ax4.transAxes, fontsize=10,
-                 verticalalignment='top', fontfamily='monospace')
+        self.fig.tight_layout()
         
-        fig.tight_layout()
+        # Cache the charts, then draw the statistics text over them
+        self.chart_canvas.draw()
+        self._charts_background = self.chart_canvas.copy_from_bbox(self.fig.bbox)
+        self.stats_ax.draw_artist(self._stats_artist)
+        return self._chart_ppm()
         
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=self.charts_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def _chart_ppm(self):
+        """The rendered figure as binary PPM data, which Tk photo images read"""
+        width, height = self.chart_canvas.get_width_height()
+        rgba = np.asarray(self.chart_canvas.buffer_rgba())
+        return f"P6 {width} {height} 255 ".encode() + rgba[..., :3].tobytes()
         
     def load_top_consumers(self):
         """Load top space consumers"""
         try:
             days = int(self.consumers_period_var.get())
             limit = int(self.consumers_limit_var.get())
+        except ValueError as e:
+            self._top_consumers_error(e)
+            return
             
-            consumers = self.db_manager.get_top_space_consumers(days=days, limit=limit)
+        self._start_consumers_load(days, limit)
+        self._load_consumers_page()
+        
+    def _start_consumers_load(self, days, limit):
+        """Reset the consumers paging for a new query"""
+        # Pages still on their way for an earlier load are dropped
+        self._consumers_generation += 1
+        self._consumers_query = (days, limit)
+        self._consumers_loaded = 0
+        self._consumers_loading = False
+        self._consumers_done = False
+        
+    def _load_consumers_page(self):
+        """Fetch the next page of top consumers, unless one is on its way"""
+        if self._consumers_loading or self._consumers_done:
+            return
             
-            # Clear existing items
-            for item in self.consumers_tree.get_children():
-                self.consumers_tree.delete(item)
-                
-            # Add consumers to tree
-            for consumer in consumers:
-                modified = datetime.fromisoformat(consumer['modified_time']).strftime('%Y-%m-%d %H:%M')
-                
-                values = (
-                    consumer['file_path'],
-                    consumer['file_name'],
-                    self.format_bytes(consumer['file_size']),
-                    consumer['safety_level'].title(),
-                    consumer['category'],
-                    consumer['recommendation'].title(),
-                    modified
-                )
-                
-                self.consumers_tree.insert('', 'end', values=values)
-                
-        except Exception as e:
-            self.logger.error(f"Error loading top consumers: {e}")
-            messagebox.showerror("Error", f"Failed to load top consumers: {e}")
+        days, limit = self._consumers_query
+        offset = self._consumers_loaded
+        count = min(_CONSUMERS_PAGE_SIZE, limit - offset)
+        generation = self._consumers_generation
+        
+        self._consumers_loading = True
+        self._run_query(
+            lambda: self.db_manager.get_top_space_consumers(days=days, limit=count, offset=offset),
+            lambda consumers: self._show_top_consumers(consumers, generation, count),
+            self._top_consumers_error,
+        )
+        
+    def _on_consumers_scroll(self, first, last):
+        """Move the scrollbar, and fetch more rows once the end comes into view
+        
+        Tk also reports the view after inserts and resizes, so pages keep
+        coming until the tree is full.
+        """
+        self.consumers_y_scrollbar.set(first, last)
+        if float(last) >= _CONSUMERS_PREFETCH_AT:
+            self._load_consumers_page()
+            
+    def _show_top_consumers(self, consumers, generation, requested):
+        """Add a page of top consumers to the tree"""
+        if generation != self._consumers_generation:
+            return
             
+        offset = self._consumers_loaded
+        self._consumers_loaded += len(consumers)
+        self._consumers_loading = False
+        self._consumers_done = (
+            len(consumers) < requested or self._consumers_loaded >= self._consumers_query[1]
+        )
+        
+        rows = [(self._consumer_row(consumer), ()) for consumer in consumers]
+        if offset == 0:
+            self._fill_tree(self.consumers_tree, rows)
+        else:
+            for values, tags in rows:
+                self.consumers_tree.insert('', 'end', values=values, tags=tags)
+                
+    def _consumer_row(self, consumer):
+        """Top consumers tree values of a file record"""
+        modified = format_minute(consumer['modified_time'])
+        
+        return (
+            consumer['file_path'],
+            consumer['file_name'],
+            format_bytes(consumer['file_size']),
+            consumer['safety_level'].title(),
+            consumer['category'],
+            consumer['recommendation'].title(),
+            modified
+        )
+        
+    def _top_consumers_error(self, e):
+        """Report a failed top consumers query"""
+        self._consumers_loading = False
+        self._consumers_done = True
+        self.logger.error(f"Error loading top consumers: {e}")
+        messagebox.showerror("Error", f"Failed to load top consumers: {e}")
+        
     def show_scan_details(self, event):
         """Show detailed scan information"""
         selection = self.history_tree.selection()
@@ -614,7 +982,7 @@ class AnalyticsGUI:
         summary_frame = ttk.Frame(notebook)
         notebook.add(summary_frame, text="Summary")
         
-        summary_text = scrolledtext.ScrolledText(summary_frame, wrap='word', font=('SF Mono', 10))
+        summary_text = scrolledtext.ScrolledText(summary_frame, wrap='word', font='SFMono')
         summary_text.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Format summary
@@ -625,9 +993,9 @@ Scan Type: {details['scan_type']}
 Success: {'Yes' if details['success'] else 'No'}
 
 Files Scanned: {details['total_files_scanned']:,}
-Total Size: {self.format_bytes(details['total_size_scanned'])}
+Total Size: {format_bytes(details['total_size_scanned'])}
 Duration: {details['duration_seconds']:.1f} seconds
-Space Freed: {self.format_bytes(details['space_freed'])}
+Space Freed: {format_bytes(details['space_freed'])}
 Files Deleted: {details['files_deleted']:,}
 Errors: {details['errors_count']}
 
@@ -660,7 +1028,7 @@ Scan Summary:
             values = (
                 file_record['file_path'],
                 file_record['file_name'],
-                self.format_bytes(file_record['file_size']),
+                format_bytes(file_record['file_size']),
                 file_record['safety_level'],
                 file_record['category'],
                 file_record['recommendation']
@@ -671,18 +1039,16 @@ Scan Summary:
         
     def format_bytes(self, bytes_count):
         """Format bytes into human readable string"""
-        if not bytes_count:
-            return "0 B"
-            
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if bytes_count < 1024.0:
-                return f"{bytes_count:.1f} {unit}"
-            bytes_count /= 1024.0
-        return f"{bytes_count:.1f} PB"
+        return format_bytes(bytes_count)
         
     def run(self):
         """Run the GUI"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._db_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self.db_manager.close()
 
 
 def main():
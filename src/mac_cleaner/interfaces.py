@@ -423,6 +423,14 @@ class PluginManager:
         self.categories: Dict[str, List[CleanerPlugin]] = {}
         self.plugin_registry: Dict[str, Dict[str, Any]] = {}
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        # Bumped on every registry change, so callers can tell cached
+        # lookups over the plugins are stale
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever plugins are registered, removed, enabled or disabled"""
+        return self._version
 
     def register_plugin(self, plugin: CleanerPlugin) -> bool:
         """Register a plugin with validation"""
@@ -452,6 +460,7 @@ class PluginManager:
                 "priority": plugin.priority,
                 "registered_at": self._get_timestamp()
             }
+            self._version += 1
 
             self.logger.info(f"Successfully registered plugin: {plugin.name}")
             return True
@@ -475,6 +484,7 @@ class PluginManager:
 
         if name in self.plugin_registry:
             del self.plugin_registry[name]
+        self._version += 1
 
         self.logger.info(f"Successfully unregistered plugin: {name}")
         return True
@@ -511,6 +521,7 @@ class PluginManager:
         """Enable a plugin"""
         if name in self.plugins:
             # Note: This would need to be implemented in the plugin class
+            self._version += 1
             self.logger.info(f"Plugin {name} enable requested")
             return True
         return False
@@ -519,6 +530,7 @@ class PluginManager:
         """Disable a plugin"""
         if name in self.plugins:
             # Note: This would need to be implemented in the plugin class
+            self._version += 1
             self.logger.info(f"Plugin {name} disable requested")
             return True
         return False
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite database manager.
+
+Copyright (c) 2026 macOS Cleaner contributors
+Licensed under the MIT License
+"""
+
+import pytest
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from mac_cleaner.core.database import DatabaseManager, ScanRecord, FileRecord
+
+
+@pytest.fixture
+def db_manager():
+    """Create a DatabaseManager backed by a temporary database file."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield DatabaseManager(str(Path(tmp_dir) / "test.db"))
+
+
+@pytest.fixture
+def scan_id(db_manager):
+    """Create a scan with a few file records."""
+    scan_id = db_manager.save_scan_record(ScanRecord(total_files_scanned=3))
+    db_manager.save_file_records(
+        [
+            FileRecord(file_path="/tmp/a.log", file_name="a.log", file_size=10, category="logs"),
+            FileRecord(file_path="/tmp/b.tmp", file_name="b.tmp", file_size=30, category="cache"),
+            FileRecord(file_path="/tmp/c.tmp", file_name="c.tmp", file_size=20, category="cache"),
+        ],
+        scan_id,
+    )
+    return scan_id
+
+
+class TestDatabaseManager:
+    """Test cases for DatabaseManager class."""
+
+    def test_get_scan_details(self, db_manager, scan_id):
+        """Test that scan details include file records ordered by size."""
+        details = db_manager.get_scan_details(scan_id)
+
+        assert details["id"] == scan_id
+        assert isinstance(details["file_records"], list)
+        assert [r["file_size"] for r in details["file_records"]] == [30, 20, 10]
+
+    def test_get_scan_details_stream(self, db_manager, scan_id):
+        """Test that streamed scan details yield the same records lazily."""
+        details = db_manager.get_scan_details(scan_id, stream=True)
+
+        assert not isinstance(details["file_records"], list)
+        assert [r["file_name"] for r in details["file_records"]] == ["b.tmp", "c.tmp", "a.log"]
+
+    def test_get_scan_details_missing(self, db_manager):
+        """Test requesting an unknown scan."""
+        assert "error" in db_manager.get_scan_details(12345)
+
+    def test_get_analytics_summary(self, db_manager, scan_id):
+        """Test analytics aggregation over recent scans."""
+        summary = db_manager.get_analytics_summary(days=30)
+
+        assert summary["scan_statistics"]["total_scans"] == 1
+        assert summary["category_breakdown"] == [
+            {"category": "cache", "count": 2, "total_size": 50},
+            {"category": "logs", "count": 1, "total_size": 10},
+        ]
+        assert summary["safety_breakdown"][0]["count"] == 3
+        assert summary["daily_scans"][0]["scans"] == 1
+
+    def test_get_top_space_consumers(self, db_manager, scan_id):
+        """Test top consumers are returned as dicts, largest first."""
+        consumers = db_manager.get_top_space_consumers(limit=2)
+
+        assert [c["file_name"] for c in consumers] == ["b.tmp", "c.tmp"]
+        assert consumers[0]["category"] == "cache"
+
+    def test_get_top_space_consumers_pages(self, db_manager, scan_id):
+        """Test fetching top consumers a page at a time."""
+        pages = [db_manager.get_top_space_consumers(limit=2, offset=offset) for offset in (0, 2, 4)]
+
+        assert [[c["file_name"] for c in page] for page in pages] == [["b.tmp", "c.tmp"], ["a.log"], []]
+
+    def test_cleanup_old_records(self, db_manager, scan_id):
+        """Test that stale scans are removed together with their file records."""
+        old_id = db_manager.save_scan_record(ScanRecord(timestamp=datetime.now() - timedelta(days=200)))
+        db_manager.save_file_records([FileRecord(file_path="/tmp/old", file_size=5)], old_id)
+
+        db_manager.cleanup_old_records(days_to_keep=90)
+
+        stats = db_manager.get_database_stats()
+        assert stats["scan_records"] == 1
+        assert stats["file_records"] == 3
+        assert "error" in db_manager.get_scan_details(old_id)
+        assert len(db_manager.get_scan_details(scan_id)["file_records"]) == 3
+
+    def test_get_database_stats_counters(self, db_manager, scan_id):
+        """Test that trigger-maintained counters track inserts and deletes."""
+        stats = db_manager.get_database_stats()
+        assert stats["scan_records"] == 1
+        assert stats["file_records"] == 3
+        assert stats["system_snapshots"] == 0
+        assert stats["date_range"]["earliest"] == stats["date_range"]["latest"]
+
+        db_manager.cleanup_old_records(days_to_keep=-1)
+
+        stats = db_manager.get_database_stats()
+        assert stats["scan_records"] == 0
+        assert stats["file_records"] == 0
+
+    def test_counters_seeded_for_existing_database(self, db_manager, scan_id):
+        """Test that reopening a database keeps the counters consistent."""
+        reopened = DatabaseManager(str(db_manager.db_path))
+
+        assert reopened.get_database_stats()["file_records"] == 3
+
+    def test_mark_files_deleted(self, db_manager, scan_id):
+        """Test that deleted files drop out of the top consumers."""
+        db_manager.mark_files_deleted(["/tmp/b.tmp", "/tmp/c.tmp"])
+
+        consumers = db_manager.get_top_space_consumers()
+        assert [c["file_name"] for c in consumers] == ["a.log"]
+
+    def test_save_file_records_bulk_json(self, db_manager, monkeypatch):
+        """Test that large batches inserted through json_each round-trip."""
+        monkeypatch.setattr("mac_cleaner.core.database._JSON_BULK_THRESHOLD", 1)
+        scan_id = db_manager.save_scan_record(ScanRecord())
+        db_manager.save_file_records(
+            [
+                FileRecord(file_path="/tmp/x", file_name="x", file_size=7, category="cache"),
+                FileRecord(file_path="/tmp/y", file_name="y", file_size=9, was_deleted=True),
+            ],
+            scan_id,
+        )
+
+        records = db_manager.get_scan_details(scan_id)["file_records"]
+        assert [(r["file_name"], r["file_size"], r["was_deleted"]) for r in records] == [
+            ("y", 9, 1),
+            ("x", 7, 0),
+        ]
+        assert records[1]["deletion_timestamp"] is None
+        assert db_manager.get_database_stats()["file_records"] == 2
+
+    def test_save_file_rows(self, db_manager):
+        """Test inserting raw FileRecord.to_row() tuples in WAL mode."""
+        scan_id = db_manager.save_scan_record(ScanRecord())
+        rows = (FileRecord(file_path=f"/tmp/{i}", file_size=i, scan_id=scan_id).to_row() for i in range(3))
+
+        assert db_manager.save_file_rows(rows, scan_id) == 3
+
+        assert [r["file_size"] for r in db_manager.get_scan_details(scan_id)["file_records"]] == [2, 1, 0]
+        with db_manager.get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_file_record_row_timestamps(self):
+        """Test that to_row() carries the timestamps formatted at construction."""
+        modified = datetime(2026, 1, 2, 3, 4, 5)
+        deleted = modified + timedelta(days=1)
+        row = FileRecord(modified_time=modified, deletion_timestamp=deleted).to_row()
+
+        assert row[4] == modified.isoformat()
+        assert row[12] == deleted.isoformat()
+
+        defaulted = FileRecord().to_row()
+        assert defaulted[4] == defaulted[5]
+
+    def test_get_dashboard_bundle(self, db_manager, scan_id):
+        """Test that the dashboard bundle matches the individual queries."""
+        bundle = db_manager.get_dashboard_bundle(history_limit=5, activity_limit=1, consumers_limit=2)
+
+        assert bundle["stats"] == db_manager.get_database_stats()
+        assert bundle["history"] == db_manager.get_scan_history(limit=5)
+        assert bundle["activity"] == bundle["history"][:1]
+        assert bundle["snapshots"] == []
+        assert bundle["analytics"] == db_manager.get_analytics_summary(days=30)
+        assert bundle["consumers"] == db_manager.get_top_space_consumers(limit=2)
+
+    def test_connection_reused_per_thread(self, db_manager, scan_id):
+        """Test that a thread keeps one tuned connection and uncommitted writes are dropped."""
+        with db_manager.get_connection() as conn:
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+            conn.execute("DELETE FROM file_records")
+
+        with db_manager.get_connection(row_factory=None) as again:
+            assert again is conn
+            assert again.execute("SELECT COUNT(*) FROM file_records").fetchone()[0] == 3
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db_manager.get_top_space_consumers(limit=1)))
+        thread.start()
+        thread.join()
+        assert [c["file_name"] for c in other[0]] == ["b.tmp"]
+
+    def test_close_gathers_planner_statistics(self, db_manager, scan_id):
+        """Test that closing analyzes tables filled after the database was created."""
+        db_manager.get_scan_details(scan_id)
+        db_manager.close()
+
+        with db_manager.get_connection(row_factory=None) as conn:
+            tables = {row[0] for row in conn.execute("SELECT tbl FROM sqlite_stat1")}
+        assert "file_records" in tables
+
+    def test_get_analytics_summary_empty(self, db_manager):
+        """Test analytics on a database without scans."""
+        summary = db_manager.get_analytics_summary(days=7)
+
+        assert summary["scan_statistics"]["total_scans"] == 0
+        assert summary["category_breakdown"] == []
+        assert summary["safety_breakdown"] == []
+        assert summary["daily_scans"] == []
+
+    def test_save_file_records_bulk(self, db_manager, monkeypatch):
+        """Test streaming records from a generator in several chunks."""
+        monkeypatch.setattr("mac_cleaner.core.database._JSON_BULK_CHUNK_SIZE", 2)
+        scan_id = db_manager.save_scan_record(ScanRecord())
+        records = (FileRecord(file_path=f"/tmp/{i}", file_size=i) for i in range(5))
+
+        assert db_manager.save_file_records_bulk(records, scan_id) == 5
+
+        details = db_manager.get_scan_details(scan_id)
+        assert [r["file_size"] for r in details["file_records"]] == [4, 3, 2, 1, 0]
+        assert {r["scan_id"] for r in details["file_records"]} == {scan_id}
+
+    def test_bulk_load_context_rebuilds_indexes(self, db_manager):
+        """Test that file record indexes are dropped during a bulk load and rebuilt after."""
+        def index_names():
+            with db_manager.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'file_records'"
+                ).fetchall()
+            return {row["name"] for row in rows if not row["name"].startswith("sqlite_")}
+
+        before = index_names()
+        scan_id = db_manager.save_scan_record(ScanRecord())
+        with db_manager.bulk_load_context():
+            assert index_names() == set()
+            db_manager.save_file_records([FileRecord(file_path="/tmp/z", file_size=1)], scan_id)
+
+        assert index_names() == before
+        assert len(db_manager.get_scan_details(scan_id)["file_records"]) == 1
+
+    def test_get_files_by_safety_level(self, db_manager, scan_id):
+        """Test filtering on the enum-coded safety level."""
+        db_manager.save_file_records(
+            [FileRecord(file_path="/tmp/d", file_size=40, safety_level="safe", category="cache")],
+            scan_id,
+        )
+
+        files = db_manager.get_files_by_safety_level("safe")
+        assert [(f["file_path"], f["category"]) for f in files] == [("/tmp/d", "cache")]
+        assert db_manager.get_files_by_safety_level("missing") == []
+
+    def test_migrates_text_columns_to_enum_codes(self, tmp_path):
+        """Test that a database with the original TEXT columns is converted."""
+        db_path = tmp_path / "old.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE scan_records (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp DATETIME, "
+            "scan_type TEXT, total_files_scanned INTEGER, total_size_scanned INTEGER, "
+            "duration_seconds REAL, categories_scanned TEXT, scan_summary TEXT, space_freed INTEGER, "
+            "files_deleted INTEGER, errors_count INTEGER, success BOOLEAN)"
+        )
+        conn.execute(
+            "CREATE TABLE file_records (id INTEGER PRIMARY KEY AUTOINCREMENT, scan_id INTEGER, "
+            "file_path TEXT, file_name TEXT, file_size INTEGER, modified_time DATETIME, "
+            "created_time DATETIME, file_type TEXT, safety_level TEXT, importance_score INTEGER, "
+            "recommendation TEXT, category TEXT, was_deleted BOOLEAN, deletion_timestamp DATETIME)"
+        )
+        now = datetime.now().isoformat()
+        conn.execute(
+            "INSERT INTO scan_records VALUES (1, ?, 'full', 1, 5, 0.0, '[]', '{}', 0, 0, 0, 1)", (now,)
+        )
+        conn.execute(
+            "INSERT INTO file_records VALUES (1, 1, '/tmp/old.log', 'old.log', 5, ?, ?, '.log', "
+            "'safe', 50, 'delete', 'logs', 0, NULL)",
+            (now, now),
+        )
+        conn.commit()
+        conn.close()
+
+        db_manager = DatabaseManager(str(db_path))
+
+        (record,) = db_manager.get_scan_details(1)["file_records"]
+        assert (record["file_type"], record["safety_level"]) == (".log", "safe")
+        assert (record["recommendation"], record["category"]) == ("delete", "logs")
+        assert db_manager.get_database_stats()["file_records"] == 1
+        with db_manager.get_connection() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+            assert conn.execute("SELECT typeof(category) FROM file_records").fetchone()[0] == "integer"
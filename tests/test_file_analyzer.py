@@ -9,6 +9,7 @@ Licensed under the MIT License
 import pytest
 import tempfile
 import os
+import json
 from pathlib import Path
 from datetime import datetime, timedelta
 from mac_cleaner.file_analyzer import FileAnalyzer
@@ -155,3 +156,248 @@ class TestFileAnalyzer:
         content = json_file.read_text()
         assert "test.txt" in content
         assert "importance_score" in content
+
+    def test_times_are_epoch_seconds_until_export(self, analyzer, temp_dir):
+        """Test that file times stay raw timestamps and are exported as datetimes."""
+        path = temp_dir / "test.txt"
+        path.write_text("test content")
+        (result,) = analyzer.scan_directory(str(temp_dir))
+
+        assert result["modified"] == path.stat().st_mtime
+
+        json_file = temp_dir / "analysis.json"
+        assert analyzer.export_analysis([result], str(json_file))
+        exported = json.loads(json_file.read_text())[0]
+        assert exported["modified"] == str(datetime.fromtimestamp(result["modified"]))
+
+        assert analyzer.export_analysis(iter([result, result]), str(json_file), lines=True)
+        lines = json_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1]) == exported
+
+    def test_scan_respects_max_depth(self, analyzer, temp_dir):
+        """Test that files below max_depth are not scanned."""
+        deep = temp_dir / "a" / "b"
+        deep.mkdir(parents=True)
+        (temp_dir / "top.txt").write_text("top")
+        (temp_dir / "a" / "mid.txt").write_text("mid")
+        (deep / "deep.txt").write_text("deep")
+
+        results = analyzer.scan_directory(str(temp_dir), max_depth=1)
+
+        assert sorted(r["name"] for r in results) == ["mid.txt", "top.txt"]
+
+    def test_parallel_subtree_scan_keeps_walk_order(self, analyzer, temp_dir):
+        """Test that subdirectories walked concurrently merge in walk order."""
+        (temp_dir / "top.txt").write_text("x")
+        for d in range(4):
+            for f in range(3):
+                path = temp_dir / f"dir{d}" / "inner" / f"file{f}.txt"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text("x")
+
+        walked = [
+            entry.path for entry in analyzer._scandir_walk(str(temp_dir), 3) if not entry.is_dir()
+        ]
+        results = analyzer.scan_directory(str(temp_dir), max_files=8)
+
+        assert len(walked) == 13
+        assert [r["path"] for r in results] == walked[:8]
+        assert analyzer._walk_pool is not None
+
+    def test_directory_summary(self, analyzer, temp_dir):
+        """Test directory summary totals and symlinks to directories."""
+        nested = temp_dir / "nested"
+        nested.mkdir()
+        (temp_dir / "cache.tmp").write_text("x" * 10)
+        (nested / "other.tmp").write_text("x" * 20)
+        (temp_dir / "link").symlink_to(nested, target_is_directory=True)
+
+        summary = analyzer.get_directory_summary(str(temp_dir))
+
+        assert summary["file_count"] == 2
+        assert summary["directory_count"] == 2
+        assert summary["total_size"] == 30
+        assert summary["deletable_size"] == 30
+        assert all(r["is_readable"] and r["is_file"] for r in analyzer.scan_directory(str(temp_dir)))
+
+    def test_batched_parallel_stat(self, analyzer, temp_dir, monkeypatch):
+        """Test that files stat'ed in parallel batches keep the walk order."""
+        monkeypatch.setattr("mac_cleaner.file_analyzer._STAT_BATCH_SIZE", 3)
+        monkeypatch.setattr("mac_cleaner.file_analyzer._PARALLEL_STAT_MIN", 2)
+        for i in range(7):
+            (temp_dir / f"file{i}.txt").write_text("x" * i)
+
+        results = analyzer.scan_directory(str(temp_dir), max_files=5)
+
+        assert len(results) == 5
+        assert all(r["size"] == int(r["name"][4]) for r in results)
+        assert analyzer._stat_pool is not None
+
+    def test_path_fragment_matching(self, analyzer):
+        """Test category precedence and the path fragments used for scoring."""
+        assert analyzer._categorize_file("/Users/me/Library/Caches/app/x.db") == "cache"
+        assert analyzer._categorize_file("/Users/me/.Trash/old.zip") == "trash"
+        assert analyzer._categorize_file("/Users/me/Documents/build/out.o") == "development"
+        assert analyzer._categorize_file("/opt/data.bin") == "other"
+
+        base = {"extension": ".bin", "modified": (datetime.now() - timedelta(days=10)).timestamp(), "size": 4096}
+        plain = analyzer.calculate_importance_score({**base, "path": "/opt/data.bin"})
+        system = analyzer.calculate_importance_score({**base, "path": "/Library/Documents/data.bin"})
+        assert system == plain + 35
+        assert analyzer.get_recommendation({"safety_level": "safe", "path": "/var/tmp/x.bin"}) == "delete"
+        assert analyzer.get_recommendation({"safety_level": "safe", "path": "/var/Tmp/x.bin"}) == "review"
+
+    def test_vectorized_scoring_matches_per_file(self, analyzer, temp_dir, monkeypatch):
+        """Test that NumPy batch scoring agrees with the per-file methods."""
+        pytest.importorskip("numpy")
+        names = ["a.tmp", "b.plist", "c.log", "d.txt", "e.pdf", "f.bin"]
+        for i, name in enumerate(names):
+            path = temp_dir / "Library" / name if i % 2 else temp_dir / "tmp" / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"x" * (i * 400))
+            old = (datetime.now() - timedelta(days=i * 10)).timestamp()
+            os.utime(path, (old, old))
+
+        monkeypatch.setattr("mac_cleaner.file_analyzer.NUMPY_AVAILABLE", False)
+        expected = analyzer.scan_directory(str(temp_dir))
+        monkeypatch.setattr("mac_cleaner.file_analyzer.NUMPY_AVAILABLE", True)
+        monkeypatch.setattr("mac_cleaner.file_analyzer._VECTOR_SCORE_MIN", 1)
+
+        fields = ("path", "importance_score", "safety_level", "recommendation")
+        for numba in (False, True):
+            if numba:
+                pytest.importorskip("numba")
+            monkeypatch.setattr("mac_cleaner.file_analyzer.NUMBA_AVAILABLE", numba)
+            results = analyzer.scan_directory(str(temp_dir))
+
+            assert len(results) == len(names)
+            assert [tuple(r[f] for f in fields) for r in results] == [tuple(r[f] for f in fields) for r in expected]
+            assert all(type(r["importance_score"]) is int for r in results)
+
+    def test_mime_type_cached_per_suffix(self):
+        """Test that cached MIME lookups agree with mimetypes.guess_type."""
+        import mimetypes
+        from mac_cleaner.file_analyzer import _guess_mime
+
+        for name in ["a.TXT", "backup.tar.gz", "plain.gz", "Makefile", "photo.jpg"]:
+            assert _guess_mime(name) == mimetypes.guess_type(name)[0]
+
+    def test_scan_looks_up_mime_types_on_request(self, analyzer, temp_dir):
+        """Test that scans only fill in mime_type with want_mime."""
+        path = temp_dir / "photo.jpg"
+        path.write_bytes(b"")
+
+        assert analyzer.scan_directory(str(temp_dir))[0]["mime_type"] is None
+        assert analyzer.scan_directory(str(temp_dir), want_mime=True)[0]["mime_type"] == "image/jpeg"
+        assert analyzer.analyze_file(str(path))["mime_type"] == "image/jpeg"
+
+    def test_finish_scan_saves_file_rows(self, temp_dir):
+        """Test that finishing a scan stores one row per scanned file."""
+        from mac_cleaner.core.database import DatabaseManager
+
+        analyzer = FileAnalyzer(enable_db_logging=False)
+        analyzer.db_manager = DatabaseManager(str(temp_dir / "scans.db"))
+        scanned = temp_dir / "scanned"
+        (scanned / "tmp").mkdir(parents=True)
+        (scanned / "tmp" / "cache.tmp").write_text("cache data")
+        (scanned / "notes.txt").write_text("notes")
+
+        analyzer.start_scan()
+        scan_id = analyzer.current_scan_id
+        files = analyzer.scan_directory(str(scanned))
+        assert analyzer.finish_scan(files) == scan_id
+
+        records = analyzer.db_manager.get_scan_details(scan_id)["file_records"]
+        by_name = {r["file_name"]: r for r in records}
+        assert set(by_name) == {"cache.tmp", "notes.txt"}
+        assert by_name["cache.tmp"]["category"] == "cache"
+        assert all(f["category"] == "cache" for f in files)
+        assert by_name["notes.txt"]["modified_time"] == datetime.fromtimestamp(
+            (scanned / "notes.txt").stat().st_mtime
+        ).isoformat()
+
+        latest = analyzer.db_manager.get_scan_history(limit=1)[0]
+        assert latest["total_files_scanned"] == 2
+        assert latest["total_size_scanned"] == 15
+        assert sum(latest["scan_summary"]["safety_levels"].values()) == 2
+        assert latest["scan_summary"]["file_types"] == {".tmp": 1, ".txt": 1}
+        assert latest["categories_scanned"] == ["cache"]
+
+    def test_get_old_files(self, analyzer, temp_dir):
+        """Test that only files older than the cutoff are analyzed, oldest first."""
+        for name, days in [("new.txt", 1), ("old.txt", 40), ("older.txt", 90)]:
+            path = temp_dir / "sub" / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("x")
+            stamp = (datetime.now() - timedelta(days=days)).timestamp()
+            os.utime(path, (stamp, stamp))
+
+        old_files = analyzer.get_old_files(str(temp_dir), days_old=30)
+
+        assert [f["name"] for f in old_files] == ["older.txt", "old.txt"]
+
+    def test_format_bytes_boundaries(self, analyzer):
+        """Test unit selection around powers of 1024."""
+        assert analyzer.format_bytes(0) == "0.00 B"
+        assert analyzer.format_bytes(1023) == "1023.00 B"
+        assert analyzer.format_bytes(1024) == "1.00 KB"
+        assert analyzer.format_bytes(1536 * 1024) == "1.50 MB"
+        assert analyzer.format_bytes(2048 * 1024**5) == "2048.00 PB"
+
+    def test_file_info_reads_like_a_dict(self, analyzer, temp_dir):
+        """Test that the slotted FileInfo supports the mapping access callers use."""
+        path = temp_dir / "test.txt"
+        path.write_text("test content")
+
+        info = analyzer.analyze_file(str(path))
+
+        assert info["size"] == info.size == 12
+        assert info.get("error") is None and "error" not in info
+        assert dict(info)["name"] == "test.txt"
+        info["recommendation"] = "keep"
+        assert info.recommendation == "keep"
+        with pytest.raises(KeyError):
+            info["unknown"] = 1
+
+    def test_analysis_cache_reuses_scores_of_unchanged_files(self, temp_dir):
+        """Test that cached scores are reused until the file changes."""
+        from mac_cleaner.core.database import DatabaseManager
+
+        analyzer = FileAnalyzer(enable_db_logging=False, cache_analysis=True)
+        analyzer.db_manager = DatabaseManager(str(temp_dir / "cache.db"))
+        scanned = temp_dir / "scanned"
+        scanned.mkdir()
+        path = scanned / "notes.txt"
+        path.write_text("notes")
+
+        (first,) = analyzer.scan_directory(str(scanned))
+        with analyzer.db_manager.get_connection() as conn:
+            conn.execute("UPDATE analysis_cache SET importance_score = 99")
+            conn.commit()
+
+        (cached,) = analyzer.scan_directory(str(scanned))
+        assert cached["importance_score"] == 99
+
+        stamp = path.stat().st_mtime - 3600
+        os.utime(path, (stamp, stamp))
+        (rescored,) = analyzer.scan_directory(str(scanned))
+        assert rescored["importance_score"] == first["importance_score"]
+
+    def test_score_valid_until_next_age_bracket(self, analyzer):
+        """Test when a cached score expires as the file ages."""
+        now = 100 * 86400.0
+        assert analyzer._score_valid_until(now - 86400, now) == now + 6 * 86400
+        assert analyzer._score_valid_until(now - 10 * 86400, now) == now + 21 * 86400
+        assert analyzer._score_valid_until(now - 40 * 86400, now) is None
+
+    def test_find_largest_files(self, analyzer, temp_dir):
+        """Test that the largest files below a directory come first."""
+        for name, size in [("small.bin", 10), ("big.bin", 300), ("mid.bin", 100)]:
+            path = temp_dir / "sub" / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"x" * size)
+
+        largest = analyzer.find_largest_files(str(temp_dir), top_n=2)
+
+        assert [f["name"] for f in largest] == ["big.bin", "mid.bin"]
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Tests for the notification system.
+
+Copyright (c) 2026 macOS Cleaner contributors
+Licensed under the MIT License
+"""
+
+import pytest
+import gc
+import json
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+from mac_cleaner.core import notifications as notifications_module
+from mac_cleaner.core.notifications import (
+    NotificationManager,
+    SmartNotificationManager,
+    NotificationMessage,
+    NotificationConfig,
+    NotificationChannel,
+    NotificationType,
+    Priority,
+    _LazyStr,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Path of the notification log file."""
+    return tmp_path / "notifications.log"
+
+
+@pytest.fixture
+def manager(log_file):
+    """Create a NotificationManager with the log and console channels."""
+    manager = NotificationManager(
+        NotificationConfig(
+            enabled_channels=[NotificationChannel.LOG, NotificationChannel.CONSOLE],
+            log_file=str(log_file),
+        )
+    )
+    yield manager
+    manager.close()
+
+
+def make_message(channels, priority="normal"):
+    """Build a test notification message."""
+    return NotificationMessage(
+        title="Test",
+        message="Something happened",
+        notification_type=NotificationType.SYSTEM_WARNING,
+        channels=channels,
+        priority=priority,
+    )
+
+
+class TestNotificationManager:
+    """Test cases for NotificationManager class."""
+
+    def test_send_to_several_channels(self, manager, log_file):
+        """Test that every enabled channel receives the message."""
+        message = make_message([NotificationChannel.LOG, NotificationChannel.CONSOLE])
+
+        assert manager.send_notification(message) is True
+        manager.close()
+
+        entry = json.loads(log_file.read_text().splitlines()[0])
+        assert entry["title"] == "Test"
+        assert entry["priority"] == "normal"
+        assert datetime.fromisoformat(entry["timestamp"])
+
+    def test_disabled_channels_are_skipped(self, manager, log_file):
+        """Test that channels missing from the config are ignored."""
+        message = make_message([NotificationChannel.WEBHOOK, NotificationChannel.CONSOLE])
+
+        assert manager.send_notification(message) is True
+        manager.close()
+        assert log_file.read_text() == ""
+
+    def test_dropped_manager_is_collected(self, log_file):
+        """Test that an unclosed manager can be collected and still flushes its log."""
+        manager = NotificationManager(
+            NotificationConfig(enabled_channels=[NotificationChannel.LOG], log_file=str(log_file))
+        )
+        manager.send_notification(make_message([NotificationChannel.LOG]))
+        ref = weakref.ref(manager)
+
+        del manager
+        gc.collect()
+        assert ref() is None
+        assert json.loads(log_file.read_text())["title"] == "Test"
+
+    def test_failed_channel_fails_the_send(self, manager, monkeypatch):
+        """Test that one failing channel makes the overall result False."""
+        def fail(message):
+            raise RuntimeError("boom")
+
+        monkeypatch.setitem(manager._dispatch_table, NotificationChannel.CONSOLE, fail)
+        message = make_message([NotificationChannel.LOG, NotificationChannel.CONSOLE])
+
+        assert manager.send_notification(message) is False
+
+    def test_priority_threshold(self, log_file):
+        """Test that channels below their configured priority are skipped."""
+        manager = NotificationManager(
+            NotificationConfig(enabled_channels=[], min_priority_for_email="critical")
+        )
+
+        assert manager._check_priority_threshold(NotificationChannel.EMAIL, Priority.CRITICAL)
+        assert not manager._check_priority_threshold(NotificationChannel.EMAIL, Priority.HIGH)
+        assert manager._check_priority_threshold(NotificationChannel.LOG, Priority.LOW)
+
+    def test_low_priority_skips_all_channels(self, monkeypatch):
+        """Test that a message below every enabled threshold is dropped up front."""
+        manager = NotificationManager(
+            NotificationConfig(
+                enabled_channels=[NotificationChannel.SYSTEM, NotificationChannel.WEBHOOK],
+                min_priority_for_system="high",
+                min_priority_for_webhook="high",
+            )
+        )
+        monkeypatch.setattr(manager, "_dispatch", pytest.fail)
+
+        assert manager.send_notification(
+            make_message([NotificationChannel.SYSTEM, NotificationChannel.WEBHOOK], "normal")
+        )
+
+    def test_config_changes_apply_to_thresholds(self, monkeypatch):
+        """Test that thresholds follow changes to the config after construction."""
+        config = NotificationConfig(enabled_channels=[NotificationChannel.SYSTEM], min_priority_for_system="high")
+        manager = NotificationManager(config)
+        sent = []
+        monkeypatch.setattr(manager, "_dispatch", lambda channel, message: sent.append(channel) or True)
+        message = make_message([NotificationChannel.SYSTEM, NotificationChannel.CONSOLE], "normal")
+
+        manager.send_notification(message)
+        assert sent == []
+
+        config.min_priority_for_system = "normal"
+        config.enabled_channels.append(NotificationChannel.CONSOLE)
+        manager.send_notification(message)
+        assert set(sent) == {NotificationChannel.SYSTEM, NotificationChannel.CONSOLE}
+        assert manager._check_priority_threshold(NotificationChannel.SYSTEM, Priority.NORMAL)
+
+    def test_message_accepts_priority_names(self):
+        """Test that string priorities are converted to Priority members."""
+        assert make_message([], "critical").priority is Priority.CRITICAL
+        assert make_message([], "bogus").priority is Priority.NORMAL
+
+    @pytest.fixture
+    def webhook_session(self, manager, monkeypatch):
+        """Install a recording HTTP session on the manager."""
+        class FakeSession:
+            def __init__(self):
+                self.calls = []
+
+            def post(self, url, data, timeout):
+                self.calls.append((url, json.loads(data)))
+                if "broken" in url:
+                    raise ConnectionError(url)
+                return self
+
+            def raise_for_status(self):
+                pass
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr("mac_cleaner.core.notifications.REQUESTS_AVAILABLE", True)
+        manager._http = FakeSession()
+        return manager._http
+
+    def test_webhook_uses_shared_session(self, manager, webhook_session):
+        """Test that webhooks post a pre-encoded body through the manager session."""
+        manager.config.webhook_url = "https://example.com/hook"
+
+        for _ in range(2):
+            assert manager._send_webhook_notification(make_message([], "high"))
+
+        assert [url for url, _ in webhook_session.calls] == ["https://example.com/hook"] * 2
+        assert webhook_session.calls[0][1]["priority"] == "high"
+
+    def test_webhook_fan_out(self, manager, webhook_session):
+        """Test that every webhook target receives the payload."""
+        manager.config.webhook_url = "https://a.example.com"
+        manager.config.webhook_urls = ["https://b.example.com", "https://a.example.com"]
+
+        assert manager._send_webhook_notification(make_message([]))
+        assert sorted(url for url, _ in webhook_session.calls) == [
+            "https://a.example.com",
+            "https://b.example.com",
+        ]
+
+        manager.config.webhook_urls = ["https://broken.example.com"]
+        assert manager._send_webhook_notification(make_message([])) is False
+
+    def test_system_notification_uses_native_notifier(self, manager, monkeypatch):
+        """Test that system notifications go to the in-process notifier when available."""
+        delivered = []
+
+        class FakeNotifier:
+            def notify(self, title, text, sound):
+                delivered.append((title, text, sound))
+
+        monkeypatch.setattr(
+            "mac_cleaner.core.notifications._MacNotifier.get", staticmethod(FakeNotifier)
+        )
+
+        assert manager._send_system_notification(make_message([], "critical"))
+        assert delivered == [("Test", "Something happened", "Basso")]
+
+    def test_console_level_follows_priority(self, manager, caplog):
+        """Test that console notifications log at the level of their priority."""
+        with caplog.at_level("INFO", logger="mac_cleaner.core.notifications"):
+            manager._send_console_notification(make_message([], "critical"))
+            manager._send_console_notification(make_message([], "low"))
+
+        assert [record.levelname for record in caplog.records] == ["ERROR", "INFO"]
+        assert caplog.records[0].getMessage() == "🚨 [SYSTEM_WARNING] Test: Something happened"
+
+    def test_json_fallback_matches_orjson(self, monkeypatch):
+        """Test that the stdlib encoder writes timestamps the same way as orjson."""
+        from mac_cleaner.core import notifications
+
+        payload = {"timestamp": datetime(2026, 1, 2, 3, 4, 5, 678), "priority": Priority.HIGH}
+        encoded = notifications._dumps(payload, newline=True)
+        monkeypatch.setattr(notifications, "ORJSON_AVAILABLE", False)
+
+        assert json.loads(notifications._dumps(payload, newline=True)) == json.loads(encoded)
+        assert encoded.endswith(b"\n")
+        assert json.loads(encoded)["timestamp"] == "2026-01-02T03:04:05.000678"
+
+    def test_format_bytes(self):
+        """Test human readable sizes at unit boundaries."""
+        assert NotificationManager._format_bytes(0) == "0.0 B"
+        assert NotificationManager._format_bytes(1023) == "1023.0 B"
+        assert NotificationManager._format_bytes(1536) == "1.5 KB"
+        assert NotificationManager._format_bytes(3 * 1024 ** 3) == "3.0 GB"
+        assert NotificationManager._format_bytes(2048 * 1024 ** 5) == "2048.0 PB"
+
+    def test_lazy_message_is_rendered_once(self):
+        """Test that a lazy message body is built on first use only."""
+        calls = []
+        body = _LazyStr(lambda: calls.append(1) or "rendered")
+
+        assert calls == []
+        assert (str(body), f"{body}") == ("rendered", "rendered")
+        assert calls == [1]
+
+    def test_lazy_message_written_to_log(self, manager, log_file):
+        """Test that helper-built lazy messages reach the log as text."""
+        assert manager.notify_schedule_change("cleanup", "daily at 3am")
+        manager.close()
+
+        entry = json.loads(log_file.read_text())
+        assert entry["message"] == (
+            "Schedule for task 'cleanup' has been updated.\nChange: daily at 3am"
+        )
+
+    def test_log_entry_flushed_without_further_writes(self, log_file, monkeypatch):
+        """Test that a lone log entry reaches disk within the flush interval."""
+        monkeypatch.setattr(notifications_module, "_LOG_FLUSH_INTERVAL", 0.05)
+        manager = NotificationManager(
+            NotificationConfig(enabled_channels=[NotificationChannel.LOG], log_file=str(log_file))
+        )
+        manager.send_notification(make_message([NotificationChannel.LOG]))
+
+        deadline = time.monotonic() + 5
+        while not log_file.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert json.loads(log_file.read_text())["title"] == "Test"
+        manager.close()
+
+    def test_log_entries_are_buffered(self, manager, log_file):
+        """Test that log entries are appended in order and flushed on close."""
+        for priority in ("low", "high"):
+            manager.send_notification(make_message([NotificationChannel.LOG], priority))
+        manager.close()
+
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert [entry["priority"] for entry in entries] == ["low", "high"]
+        assert manager.send_notification(make_message([NotificationChannel.LOG])) is False
+
+
+@pytest.fixture
+def smart_manager(manager):
+    """Create a SmartNotificationManager that counts forwarded messages."""
+    smart = SmartNotificationManager(manager)
+    smart.update_preferences(
+        {
+            "quiet_hours": {"start": 0, "end": 0},
+            "learning_enabled": False,
+            "consolidate_similar": False,
+            "debounce_seconds": 0,
+        }
+    )
+    smart.sent = []
+    manager.send_notification = lambda message: smart.sent.append(message) or True
+    return smart
+
+
+class TestSmartNotificationManager:
+    """Test cases for SmartNotificationManager class."""
+
+    def test_rate_limit(self, smart_manager):
+        """Test that notifications beyond the hourly limit are dropped."""
+        smart_manager.update_preferences({"max_notifications_per_hour": 2})
+
+        for _ in range(3):
+            assert smart_manager.send_smart_notification(make_message([NotificationChannel.LOG]))
+
+        assert len(smart_manager.sent) == 2
+
+    def test_rate_limit_window_expires(self, smart_manager):
+        """Test that sends older than an hour no longer count."""
+        smart_manager.update_preferences({"max_notifications_per_hour": 1})
+        smart_manager.recent_notifications.append(time.monotonic() - 7200)
+
+        smart_manager.send_smart_notification(make_message([NotificationChannel.LOG]))
+
+        assert len(smart_manager.sent) == 1
+        assert len(smart_manager.recent_notifications) == 1
+
+    def test_history_is_capped(self, smart_manager):
+        """Test that the notification history keeps only the newest records."""
+        message = make_message([NotificationChannel.LOG])
+        for _ in range(1005):
+            smart_manager._track_notification(message, True, datetime.now(), time.monotonic())
+
+        assert len(smart_manager.notification_history) == 1000
+        stats = smart_manager.get_notification_stats()
+        assert stats["total"] == stats["recent_24h"] == 1000
+        assert stats["by_type"] == {"system_warning": 1000}
+
+    def test_notification_stats(self, smart_manager):
+        """Test that stats count tracked notifications by type and priority."""
+        smart_manager.send_smart_notification(make_message([NotificationChannel.LOG], "high"))
+        smart_manager.send_smart_notification(make_message([NotificationChannel.LOG], "low"))
+
+        stats = smart_manager.get_notification_stats()
+        assert stats["total"] == 2
+        assert stats["recent_24h"] == 2
+        assert stats["by_type"] == {"system_warning": 2}
+        assert stats["by_priority"] == {"high": 1, "low": 1}
+
+    def test_similar_notifications_are_consolidated(self, smart_manager):
+        """Test that a repeat of a recent notification only bumps its count."""
+        smart_manager.update_preferences({"consolidate_similar": True})
+        message = make_message([NotificationChannel.LOG])
+
+        for _ in range(3):
+            smart_manager.send_smart_notification(message)
+
+        assert len(smart_manager.sent) == 1
+        assert smart_manager.notification_history[-1].count == 3
+
+    def test_old_notifications_are_not_consolidated(self, smart_manager):
+        """Test that consolidation ignores notifications older than five minutes."""
+        smart_manager.update_preferences({"consolidate_similar": True})
+        message = make_message([NotificationChannel.LOG])
+        smart_manager.send_smart_notification(message)
+        smart_manager.notification_history[-1].timestamp -= timedelta(minutes=10)
+
+        smart_manager.send_smart_notification(message)
+
+        assert len(smart_manager.sent) == 2
+
+    def test_concurrent_tracking(self, smart_manager):
+        """Test that tracking from several threads keeps history and stats consistent."""
+        smart_manager.update_preferences({"max_notifications_per_hour": 10_000})
+
+        def send_many(worker):
+            for i in range(100):
+                message = make_message([NotificationChannel.LOG])
+                message.title = f"{worker}-{i}"
+                smart_manager.send_smart_notification(message)
+
+        threads = [threading.Thread(target=send_many, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = smart_manager.get_notification_stats()
+        assert len(smart_manager.sent) == 800
+        assert stats["total"] == 800
+        assert stats["by_type"] == {"system_warning": 800}
+
+    def test_debounced_burst_is_merged(self, smart_manager):
+        """Test that a burst of one type is delivered as a single message on flush."""
+        smart_manager.update_preferences({"debounce_seconds": 60})
+        for title in ("First", "Second", "Third"):
+            message = make_message([NotificationChannel.LOG])
+            message.title = title
+            message.data = {"task_name": title, "size_freed": 100, "free_space_gb": len(title)}
+            smart_manager.send_smart_notification(message)
+
+        assert smart_manager.sent == []
+        assert smart_manager.flush()
+
+        (merged,) = smart_manager.sent
+        assert merged.title == "First (+2 more)"
+        assert merged.data == {
+            "task_name": "First, Second, Third",
+            "size_freed": 300,
+            "free_space_gb": 5,
+            "count": 3,
+        }
+        assert str(merged.message).count("Something happened") == 3
+        assert smart_manager.get_notification_stats()["total"] == 1
+
+    def test_failed_timed_flush_is_logged(self, smart_manager, caplog):
+        """Test that a delivery failure on the debounce timer is logged."""
+        smart_manager.base_manager.send_notification = lambda message: False
+        smart_manager.update_preferences({"debounce_seconds": 60})
+        smart_manager.send_smart_notification(make_message([NotificationChannel.LOG]))
+
+        with caplog.at_level("WARNING", logger="mac_cleaner.core.notifications"):
+            smart_manager._timed_flush()
+
+        assert "Failed to deliver debounced notifications" in caplog.text
+
+    def test_critical_notifications_skip_debounce(self, smart_manager):
+        """Test that critical notifications are delivered immediately."""
+        smart_manager.update_preferences({"debounce_seconds": 60})
+
+        smart_manager.send_smart_notification(make_message([NotificationChannel.LOG], "critical"))
+
+        assert len(smart_manager.sent) == 1
@@ -12,7 +12,8 @@ import os
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from mac_cleaner.interfaces import CleanerPlugin, PluginManager
+from mac_cleaner.core.enhanced_cleaner import EnhancedCleaner
+from mac_cleaner.interfaces import CleanerPlugin, PluginManager, SafetyLevel
 from mac_cleaner.plugins import (
     BrowserCacheCleaner,
     SystemCacheCleaner,
@@ -76,6 +77,39 @@ class TestPluginManager:
         assert len(categories) == 2
 
 
+    def test_safety_info_follows_plugin_manager_changes(self):
+        """Test that plugins changed through the manager reach the cleaner's lookups"""
+        cleaner = EnhancedCleaner()
+        path = "/opt/custom-plugin/data.bin"
+        assert cleaner.get_safety_info(path) == SafetyLevel.SAFE
+
+        class CustomPlugin(CleanerPlugin):
+            @property
+            def name(self) -> str:
+                return "Custom Plugin"
+
+            @property
+            def category(self) -> str:
+                return "custom"
+
+            @property
+            def description(self) -> str:
+                return "Test plugin"
+
+            def get_cleanable_paths(self) -> list:
+                return ["/opt/custom-plugin"]
+
+            def is_safe_to_clean(self, path: str) -> bool:
+                return False
+
+        plugin = CustomPlugin()
+        cleaner.plugin_manager.register_plugin(plugin)
+        assert cleaner.get_safety_info(path) == SafetyLevel.CRITICAL
+
+        cleaner.plugin_manager.unregister_plugin("Custom Plugin")
+        assert cleaner.get_safety_info(path) == SafetyLevel.SAFE
+
+
 class TestBrowserCacheCleaner:
     """Test browser cache cleaner plugin"""
 
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Tests for the smart scheduler.
+
+Copyright (c) 2026 macOS Cleaner contributors
+Licensed under the MIT License
+"""
+
+import pytest
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+from datetime import datetime, timedelta, time as dt_time
+from mac_cleaner.core import scheduler as scheduler_module
+from mac_cleaner.core.scheduler import (
+    SmartScheduler,
+    ScheduledTask,
+    ScheduleType,
+    TaskExecutionResult,
+)
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    """Create a SmartScheduler storing its state in a temporary directory."""
+    return SmartScheduler(data_dir=str(tmp_path))
+
+
+def make_task(task_id="daily", **kwargs):
+    """Build a test task."""
+    kwargs.setdefault("categories", ["cache"])
+    return ScheduledTask(
+        id=task_id,
+        name=f"Task {task_id}",
+        schedule_type=ScheduleType.DAILY,
+        specific_time=dt_time(3, 30),
+        **kwargs,
+    )
+
+
+def make_result(task_id="daily", success=True, execution_time=None):
+    """Build a test execution result."""
+    return TaskExecutionResult(
+        task_id=task_id,
+        task_name=f"Task {task_id}",
+        execution_time=execution_time or datetime.now(),
+        success=success,
+        duration_seconds=1.5,
+        paths_processed=3,
+        size_freed=1024,
+    )
+
+
+class TestSchedulerPersistence:
+    """Test cases for saving and loading scheduler state."""
+
+    def test_tasks_round_trip(self, scheduler, tmp_path):
+        """Test that tasks are restored with their enum, datetime and time fields."""
+        task = make_task(last_run=datetime(2026, 1, 2, 3, 4, 5))
+        assert scheduler.add_task(task)
+
+        reloaded = SmartScheduler(data_dir=str(tmp_path)).get_task("daily")
+
+        assert reloaded == task
+        assert reloaded.schedule_type is ScheduleType.DAILY
+
+    def test_history_round_trip(self, scheduler, tmp_path):
+        """Test that execution results are restored from disk."""
+        result = make_result(execution_time=datetime(2026, 1, 2, 3, 4, 5))
+        scheduler._record_result(result)
+
+        assert list(SmartScheduler(data_dir=str(tmp_path)).get_execution_history()) == [result]
+        assert len(scheduler.history_file.read_bytes().splitlines()) == 1
+
+    def test_stdlib_json_fallback(self, scheduler, tmp_path, monkeypatch):
+        """Test that files written without orjson use the same format."""
+        monkeypatch.setattr(scheduler_module, "ORJSON_AVAILABLE", False)
+        scheduler.add_task(make_task())
+
+        with open(scheduler.tasks_file) as f:
+            (task_data,) = json.load(f)
+        assert task_data["schedule_type"] == "daily"
+        assert task_data["specific_time"] == "03:30:00"
+        assert SmartScheduler(data_dir=str(tmp_path)).get_task("daily") == scheduler.get_task("daily")
+
+    def test_unknown_task_keys_are_ignored(self, scheduler, tmp_path):
+        """Test that keys from another scheduler version do not break loading."""
+        scheduler.add_task(make_task())
+        data = json.loads(scheduler.tasks_file.read_text())
+        data[0]["retired_option"] = True
+        scheduler.tasks_file.write_text(json.dumps(data))
+
+        assert SmartScheduler(data_dir=str(tmp_path)).get_task("daily") == scheduler.get_task("daily")
+
+    def test_unchanged_tasks_are_not_rewritten(self, tmp_path, monkeypatch):
+        """Test that saving identical task state skips the write."""
+        SmartScheduler(data_dir=str(tmp_path)).add_task(make_task())
+        writes = []
+        write = scheduler_module._atomic_write_bytes
+        monkeypatch.setattr(
+            scheduler_module, "_atomic_write_bytes", lambda path, data: writes.append(path) or write(path, data)
+        )
+
+        scheduler = SmartScheduler(data_dir=str(tmp_path))
+        scheduler.enable_task("daily")
+        scheduler.flush()
+        assert writes == []
+
+        scheduler.disable_task("daily")
+        scheduler.flush()
+        assert writes == [scheduler.tasks_file]
+
+    def test_saves_are_coalesced(self, scheduler, tmp_path):
+        """Test that saves in quick succession are written once on flush."""
+        scheduler.add_task(make_task("first"))
+        scheduler.add_task(make_task("second"))
+
+        assert SmartScheduler(data_dir=str(tmp_path)).get_task("second") is None
+
+        scheduler.flush()
+        assert SmartScheduler(data_dir=str(tmp_path)).get_task("second") is not None
+        assert scheduler._flush_timer is None
+
+    def test_failed_write_keeps_previous_file(self, scheduler, monkeypatch):
+        """Test that a failing write leaves the saved tasks and no temp file behind."""
+        scheduler.add_task(make_task())
+        saved = scheduler.tasks_file.read_bytes()
+
+        def fail_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(scheduler_module.os, "fsync", fail_fsync)
+        scheduler.add_task(make_task("other"))
+        scheduler.flush()
+
+        assert scheduler.tasks_file.read_bytes() == saved
+        assert list(scheduler.data_dir.glob("*.tmp")) == []
+
+        monkeypatch.undo()
+        scheduler.flush()
+        assert SmartScheduler(data_dir=str(scheduler.data_dir)).get_task("other") is not None
+
+    def test_coalesced_saves_are_written_at_exit(self, tmp_path):
+        """Test that saves still waiting on the coalescing timer reach disk at exit."""
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path[:0] = {sys.path!r}
+            from datetime import time
+            from mac_cleaner.core.scheduler import SmartScheduler, ScheduledTask, ScheduleType
+            scheduler = SmartScheduler(data_dir={str(tmp_path)!r})
+            for task_id in ("a", "b"):
+                scheduler.add_task(ScheduledTask(
+                    id=task_id, name=task_id, schedule_type=ScheduleType.DAILY,
+                    specific_time=time(3, 30), categories=["cache"],
+                ))
+        """)
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=60)
+
+        tasks = json.loads((tmp_path / "scheduled_tasks.json").read_text())
+        assert [task["id"] for task in tasks] == ["a", "b"]
+
+    def test_failed_history_write_is_retried(self, scheduler, tmp_path):
+        """Test that history lines from a failed append are kept for the next flush."""
+        history_file = scheduler.history_file
+        scheduler.history_file = tmp_path / "unwritable"
+        scheduler.history_file.mkdir()
+        scheduler._record_result(make_result(task_id="first"))
+        scheduler.flush()
+        assert scheduler._history_dirty
+
+        scheduler._record_result(make_result(task_id="second"))
+        scheduler.history_file = history_file
+        scheduler.flush()
+
+        lines = history_file.read_bytes().splitlines()
+        assert [json.loads(line)["task_id"] for line in lines] == ["first", "second"]
+        assert not scheduler._history_dirty
+
+    def test_history_log_is_compacted(self, tmp_path, monkeypatch):
+        """Test that the history log is cut back to the in-memory tail once it doubles."""
+        monkeypatch.setattr(scheduler_module, "_HISTORY_LIMIT", 3)
+        scheduler = SmartScheduler(data_dir=str(tmp_path))
+        for i in range(7):
+            scheduler._record_result(make_result(task_id=str(i)))
+            scheduler.flush()
+
+        lines = scheduler.history_file.read_bytes().splitlines()
+        assert len(lines) == 3
+        reloaded = SmartScheduler(data_dir=str(tmp_path)).get_execution_history()
+        assert [r.task_id for r in reloaded] == ["4", "5", "6"]
+
+    def test_legacy_history_is_converted(self, tmp_path):
+        """Test that the old single-document history file is migrated."""
+        legacy = tmp_path / "execution_history.json"
+        legacy.write_text(json.dumps([{
+            "task_id": "old",
+            "task_name": "Old task",
+            "execution_time": "2026-01-02T03:04:05",
+            "success": True,
+            "duration_seconds": 1.0,
+            "paths_processed": 1,
+            "size_freed": 10,
+        }]))
+
+        scheduler = SmartScheduler(data_dir=str(tmp_path))
+
+        assert [r.task_id for r in scheduler.get_execution_history()] == ["old"]
+        assert not legacy.exists()
+        assert scheduler.history_file.exists()
+
+    def test_history_is_bounded(self, tmp_path, monkeypatch):
+        """Test that old results are evicted and recent ones are returned in order."""
+        monkeypatch.setattr(scheduler_module, "_HISTORY_LIMIT", 3)
+        scheduler = SmartScheduler(data_dir=str(tmp_path))
+        for i in range(5):
+            scheduler._record_result(make_result(task_id=str(i)))
+
+        assert [r.task_id for r in scheduler.get_execution_history()] == ["2", "3", "4"]
+        assert [r.task_id for r in scheduler.get_execution_history(limit=2)] == ["3", "4"]
+        assert scheduler.get_scheduler_status()["executions"]["last_week"] == 3
+
+    def test_history_loaded_on_first_use(self, scheduler, tmp_path):
+        """Test that the history file is only read once results are needed."""
+        scheduler._record_result(make_result())
+
+        reloaded = SmartScheduler(data_dir=str(tmp_path))
+        assert not reloaded._history_loaded
+
+        reloaded._record_result(make_result(task_id="next"))
+        assert [r.task_id for r in reloaded.get_execution_history()] == ["daily", "next"]
+
+
+class TestSchedulerStatus:
+    """Test cases for SmartScheduler.get_scheduler_status."""
+
+    def test_task_counts(self, scheduler):
+        """Test that enabled/disabled counts follow task changes."""
+        scheduler.add_task(make_task("a"))
+        scheduler.add_task(make_task("b"))
+        scheduler.add_task(make_task("c", enabled=False))
+        scheduler.disable_task("a")
+        scheduler.enable_task("c")
+        scheduler.enable_task("c")
+        scheduler.remove_task("b")
+
+        assert scheduler.get_scheduler_status()["tasks"] == {"total": 2, "enabled": 1, "disabled": 1}
+
+    def test_recent_executions(self, scheduler, tmp_path):
+        """Test that only results from the last week count toward the success rate."""
+        scheduler._record_result(make_result(execution_time=datetime.now() - timedelta(days=8)))
+        scheduler._record_result(make_result(success=False))
+        scheduler._record_result(make_result())
+
+        executions = scheduler.get_scheduler_status()["executions"]
+        assert executions == {"total": 3, "last_week": 2, "recent_success_rate": 0.5}
+
+        scheduler.flush()
+        reloaded = SmartScheduler(data_dir=str(tmp_path))
+        assert reloaded.get_scheduler_status()["executions"] == executions
+
+    def test_next_task_eta_skips_stale_entries(self, scheduler):
+        """Test that moved or removed jobs are skipped in the next-run lookahead."""
+        class Job:
+            def __init__(self, job_id, next_run_time):
+                self.id = job_id
+                self.next_run_time = next_run_time
+
+        class FakeScheduler:
+            jobs = {}
+
+            def get_job(self, job_id):
+                return self.jobs.get(job_id)
+
+        now = datetime.now()
+        scheduler.scheduler = FakeScheduler()
+        for job in [Job("moved", now), Job("removed", now), Job("next", now + timedelta(hours=1))]:
+            scheduler._track_next_run(job)
+        FakeScheduler.jobs = {
+            "moved": Job("moved", now + timedelta(hours=2)),
+            "next": Job("next", now + timedelta(hours=1)),
+        }
+
+        assert scheduler.next_task_eta() == ("next", now + timedelta(hours=1))
+        assert scheduler.get_scheduler_status()["next_run"]["task_id"] == "next"
+        scheduler.scheduler = None
+
+
+class TestFastIso:
+    """Test cases for the stored timestamp parser."""
+
+    def test_matches_fromisoformat(self):
+        """Test that the fast path and the fallback agree with datetime.fromisoformat."""
+        for value in [
+            "2026-01-02T03:04:05",
+            "2026-01-02T03:04:05.120",
+            "2026-01-02T03:04:05.123456",
+            "2026-01-02 03:04:05",
+            "2026-01-02T03:04:05+02:00",
+        ]:
+            assert scheduler_module._fast_iso(value) == datetime.fromisoformat(value)
+
+
+class TestScheduledExecution:
+    """Test cases for the event loop scheduled runs execute on."""
+
+    def test_stop_loop_waits_for_runs(self, scheduler):
+        """Test that stopping the loop lets runs in progress finish on the loop thread."""
+        ran = []
+
+        async def run():
+            await asyncio.sleep(0.01)
+            ran.append(threading.current_thread().name)
+
+        scheduler._start_loop()
+        asyncio.run_coroutine_threadsafe(run(), scheduler._loop)
+        scheduler._stop_loop()
+
+        assert ran == ["SmartSchedulerLoop"]
+        assert scheduler._loop is None
+
+    def test_stop_loop_cancels_hung_runs(self, scheduler, monkeypatch):
+        """Test that runs still going after the stop timeout are cancelled."""
+        monkeypatch.setattr(scheduler_module, "_STOP_TIMEOUT", 0.05)
+        cancelled = []
+
+        async def hang():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        scheduler._start_loop()
+        thread = scheduler._loop_thread
+        asyncio.run_coroutine_threadsafe(hang(), scheduler._loop)
+        scheduler._stop_loop()
+
+        assert cancelled == [True]
+        assert not thread.is_alive()
+
+    def test_stop_loop_from_loop_thread(self, scheduler):
+        """Test that a run stopping the loop it runs on does not deadlock."""
+        scheduler._start_loop()
+        thread = scheduler._loop_thread
+
+        async def stop():
+            scheduler._stop_loop()
+
+        asyncio.run_coroutine_threadsafe(stop(), scheduler._loop).result(timeout=5)
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert scheduler._loop is None
+
+    def test_space_snapshots_are_recorded_once_per_ttl(self, scheduler):
+        """Test that back-to-back runs record a single disk space snapshot."""
+        pytest.importorskip("psutil")
+
+        asyncio.run(scheduler._record_space_snapshot())
+        asyncio.run(scheduler._record_space_snapshot())
+
+        assert len(scheduler.analytics.snapshots) == 1
+        assert scheduler.analytics.snapshots[0].total_disk_space > 0
+
+    def test_callbacks_run_off_the_task_thread(self, scheduler):
+        """Test that callbacks run on the callback threads and failures are contained."""
+        seen = []
+
+        def failing(result):
+            raise RuntimeError("callback bug")
+
+        scheduler.add_task_callback(failing)
+        scheduler.add_task_callback(lambda result: seen.append(threading.current_thread().name))
+        scheduler._notify_callbacks(make_result())
+        scheduler.stop()
+
+        assert len(seen) == 1
+        assert seen[0].startswith("sched-cb")
+
+
+class TestRunTaskNow:
+    """Test cases for SmartScheduler.run_task_now."""
+
+    def test_successful_run(self, scheduler, monkeypatch):
+        """Test that a successful run updates the task, history and analytics."""
+        async def fake_execution(**kwargs):
+            return {"summary": {
+                "overall_duration_ms": 2500,
+                "total_paths_processed": 4,
+                "total_size_processed": 2048,
+            }}
+
+        monkeypatch.setattr("mac_cleaner.plugins.get_plugins_by_categories", lambda categories: ["plugin"])
+        monkeypatch.setattr(scheduler.smart_plugin_scheduler, "schedule_optimal_execution", fake_execution)
+        monkeypatch.setattr(scheduler, "_record_space_snapshot", lambda: asyncio.sleep(0))
+        scheduler.add_task(make_task())
+
+        result = asyncio.run(scheduler.run_task_now("daily"))
+
+        assert (result.success, result.duration_seconds, result.size_freed) == (True, 2.5, 2048)
+        task = scheduler.get_task("daily")
+        assert (task.run_count, task.success_count, task.error_count) == (1, 1, 0)
+        assert scheduler.get_execution_history() == [result]
+        assert scheduler.analytics.events[-1].success
+
+    def test_failed_run(self, scheduler):
+        """Test that a run without plugins is recorded as a failure."""
+        scheduler.add_task(make_task(categories=[]))
+
+        result = asyncio.run(scheduler.run_task_now("daily"))
+
+        assert not result.success
+        assert result.error_message == "No plugins available for this task"
+        task = scheduler.get_task("daily")
+        assert (task.run_count, task.error_count, task.last_error) == (1, 1, result.error_message)
+        assert scheduler.get_execution_history() == [result]